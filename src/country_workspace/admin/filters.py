@@ -3,6 +3,8 @@ from django.db.models import Model, QuerySet
 from django.http import HttpRequest
 from django.utils.translation import gettext as _
 
+from country_workspace.models.base import Validable
+
 
 class FailedFilter(SimpleListFilter):
     title = "Status"
@@ -41,6 +43,11 @@ class FailedFilter(SimpleListFilter):
 class IsValidFilter(SimpleListFilter):
     title = "Valid"
     parameter_name = "valid"
+    STATUSES = {
+        "v": Validable.ValidationStatus.VALID,
+        "i": Validable.ValidationStatus.INVALID,
+        "u": Validable.ValidationStatus.UNCHECKED,
+    }
 
     def lookups(self, request: HttpRequest, model_admin: ModelAdmin) -> tuple[tuple[str, str], ...]:
         return (
@@ -53,12 +60,8 @@ class IsValidFilter(SimpleListFilter):
         return self.title
 
     def queryset(self, request: HttpRequest, queryset: QuerySet[Model]) -> QuerySet[Model]:
-        if self.value() == "v":
-            return queryset.filter(last_checked__isnull=False).filter(errors__iexact="{}")
-        if self.value() == "i":
-            return queryset.filter(last_checked__isnull=False).exclude(errors__iexact="{}")
-        if self.value() == "u":
-            return queryset.filter(last_checked__isnull=True)
+        if status := self.STATUSES.get(self.value() or ""):
+            return queryset.filter(validation_status=status)
         return queryset
 
     def has_output(self) -> bool:
@@ -1,11 +1,14 @@
 from typing import Any
 
 from django.db.models import Model
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from hope_flex_fields.models import DataChecker, DataCheckerFieldset, FieldDefinition, Fieldset, FlexField
+
 from ..models import AsyncJob, Batch, Household, Individual, Program
 from ..workspaces.models import CountryAsyncJob, CountryBatch, CountryHousehold, CountryIndividual, CountryProgram
+from ..utils.flex_fields import checker_registry
 from .manager import cache_manager
 
 
@@ -19,4 +22,15 @@ def update_cache(sender: "type[Model]", instance: Model, **kwargs: Any) -> None:
     elif isinstance(instance, (AsyncJob | CountryAsyncJob | Batch | CountryBatch)):
         program = instance.program
     if program:
-        cache_manager.incr_cache_version(program=program)
+        cache_manager.incr_cache_version(program=program, namespace=cache_manager.get_namespace(sender))
+
+
+@receiver([post_save, post_delete], sender=DataChecker)
+@receiver([post_save, post_delete], sender=DataCheckerFieldset)
+@receiver([post_save, post_delete], sender=Fieldset)
+@receiver([post_save, post_delete], sender=FlexField)
+@receiver([post_save, post_delete], sender=FieldDefinition)
+@receiver(m2m_changed, sender=DataChecker.fieldsets.through)
+def update_checkers(sender: "type[Model]", instance: Model, **kwargs: Any) -> None:
+    """Invalidate the forms compiled by `checker_registry` in all the processes."""
+    cache_manager.incr_cache_version(namespace=checker_registry.namespace)
@@ -1,9 +1,14 @@
+import contextlib
 import logging
-from typing import TYPE_CHECKING, Any
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
 from constance import config
 from django.core.cache import caches
 from django.core.cache.backends.redis import RedisCacheClient
+from django.db import connection, transaction
 from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.text import slugify
@@ -15,16 +20,37 @@ from country_workspace import VERSION
 from country_workspace.state import state
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django.db.models import Model
+
     from ..models import Office, Program
 logger = logging.getLogger(__name__)
 
 
 class CacheManager:
+    # per-model cache namespaces. Programs (and unknown models) invalidate all of them
+    NAMESPACES = ("households", "individuals", "batches", "jobs")
+    MODEL_NAMESPACES = {
+        "household": "households",
+        "individual": "individuals",
+        "batch": "batches",
+        "asyncjob": "jobs",
+    }
+    # pub/sub channel used to invalidate the process-local copies of version keys and flags
+    channel = "country_workspace:cache:invalidate"
+
     def __init__(self, prefix: str = "cache") -> None:
         self.prefix = prefix
         self.cw_version = "-"
         self.cache_timeout = 86400
         self.cache_by_version = False
+        self.local_ttl = 0
+        self._local: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._listener_pid: int | None = None
+        # version keys collected by `deferred_invalidation()`, per thread
+        self._deferred = threading.local()
 
     def get_redis_client(self) -> RedisCacheClient:
         return self.cache.client.get_client()
@@ -39,12 +65,52 @@ class CacheManager:
         try:
             self.cache_timeout = config.CACHE_TIMEOUT
             self.cache_by_version = config.CACHE_BY_VERSION
+            self.local_ttl = config.CACHE_LOCAL_TTL
             if self.cache_by_version:
                 self.cw_version = VERSION
         except Exception as e:
             logger.exception(e)
             capture_exception(e)
 
+    def _start_listener(self) -> bool:
+        """Subscribe (once per process) to the invalidation channel. Return False if it is not possible."""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return True
+        with self._lock:
+            if self._listener_pid != pid:
+                self._local.clear()
+                try:
+                    pubsub = self.get_redis_client().pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(**{self.channel: self._on_message})
+                    pubsub.run_in_thread(sleep_time=1, daemon=True)
+                except Exception as e:  # noqa: BLE001
+                    logger.exception(e)
+                    capture_exception(e)
+                    self.local_ttl = 0
+                    return False
+                self._listener_pid = pid
+        return True
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        self._local.pop(message["data"].decode(), None)
+
+    def _get_local(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return `key` from the process-local cache, calling `loader` if missing or expired."""
+        if not self.local_ttl or not self._start_listener():
+            return loader()
+        expires, value = self._local.get(key, (0, None))
+        if expires < time.monotonic():
+            value = loader()
+            self._local[key] = (time.monotonic() + self.local_ttl, value)
+        return value
+
+    def _invalidate_local(self, key: str) -> None:
+        """Drop `key` from the process-local cache of all the processes."""
+        if self.local_ttl:
+            self._local.pop(key, None)
+            self.get_redis_client().publish(self.channel, key)
+
     def invalidate(self, key: str) -> None:
         cache_invalidate.send(CacheManager, key=key)
 
@@ -61,48 +127,134 @@ class CacheManager:
             timeout = 1
         self.cache.set(key, value, timeout=timeout or self.cache_timeout, **kwargs)
 
-    def _get_version_key(self, office: "Office | None" = None, program: "Program | None" = None) -> str:
+    def get_namespace(self, model: "type[Model]") -> str | None:
+        """Return the cache namespace of `model`, None for models that invalidate the whole program."""
+        return self.MODEL_NAMESPACES.get(model._meta.concrete_model._meta.model_name or "")
+
+    def get_dependencies(self, model: "type[Model] | None") -> tuple[str, ...]:
+        """Return the namespaces the views of `model` depend on (all of them for unknown models)."""
+        namespace = self.get_namespace(model) if model else None
+        if namespace in ("households", "individuals"):
+            return "households", "individuals"
+        if namespace:
+            return (namespace,)
+        return self.NAMESPACES
+
+    def _get_version_key(
+        self, office: "Office | None" = None, program: "Program | None" = None, namespace: str | None = None
+    ) -> str:
         if program:
             office = program.country_office
         elif office:
             program = None
 
         parts = [self.prefix, "key", office.slug if office else "-", str(program.pk) if program else "-"]
+        if namespace:
+            parts.append(namespace)
         return ":".join(parts)
 
-    def reset_cache_version(self, *, office: "Office | None" = None, program: "Program | None" = None) -> None:
-        key = self._get_version_key(office, program)
+    def reset_cache_version(
+        self, *, office: "Office | None" = None, program: "Program | None" = None, namespace: str | None = None
+    ) -> None:
+        key = self._get_version_key(office, program, namespace)
         self.cache.delete(key)
+        self._invalidate_local(key)
 
-    def get_cache_version(self, *, office: "Office | None" = None, program: "Program | None" = None) -> None:
-        key = self._get_version_key(office, program)
+    def _load_version(self, key: str) -> int:
         version = self.cache.get(key)
         if not version:
             version = 1
             self.cache.set(key, version, timeout=self.cache_timeout)
         return version
 
-    def incr_cache_version(self, *, office: "Office | None" = None, program: "Program | None" = None) -> int:
+    def get_cache_version(
+        self, *, office: "Office | None" = None, program: "Program | None" = None, namespace: str | None = None
+    ) -> int:
+        key = self._get_version_key(office, program, namespace)
+        return self._get_local(key, lambda: self._load_version(key))
+
+    def get_cache_versions(
+        self,
+        *,
+        office: "Office | None" = None,
+        program: "Program | None" = None,
+        namespaces: "Iterable[str] | None" = None,
+    ) -> str:
+        """Return the program (or office) version followed by the version of each of `namespaces` (default: all)."""
+        versions = [self.get_cache_version(office=office, program=program)]
+        versions.extend(
+            self.get_cache_version(office=office, program=program, namespace=namespace)
+            for namespace in (self.NAMESPACES if namespaces is None else namespaces)
+        )
+        return ".".join(map(str, versions))
+
+    def incr_cache_version(
+        self, *, office: "Office | None" = None, program: "Program | None" = None, namespace: str | None = None
+    ) -> int:
+        """Invalidate the entries depending on `namespace`, or all the entries if not `namespace`.
+
+        Return the new version, or 0 inside `deferred_invalidation()`.
+        """
         if office and program:
             raise ValueError("Cannot use both office and program")
-        key = self._get_version_key(office, program)
+        key = self._get_version_key(office, program, namespace)
+        if (pending := getattr(self._deferred, "keys", None)) is not None:
+            pending.add(key)
+            return 0
+        return self._incr_version(key)
+
+    def _incr_version(self, key: str) -> int:
         try:
             return self.cache.incr(key)
         except ValueError:
             return self.cache.set(key, 2)
+        finally:
+            self._invalidate_local(key)
+
+    def _incr_versions(self, keys: "Iterable[str]") -> None:
+        for key in keys:
+            self._incr_version(key)
+
+    @contextlib.contextmanager
+    def deferred_invalidation(self) -> "Iterator[None]":
+        """Collect the version bumps requested in the block and apply each of them once at the end.
+
+        Inside a transaction they are applied again on commit, so that entries cached by other
+        processes before the commit are invalidated too. Nested blocks are merged into the outermost one.
+        Can be used as decorator.
+        """
+        if getattr(self._deferred, "keys", None) is not None:
+            yield
+            return
+        self._deferred.keys = keys = set()
+        try:
+            yield
+        finally:
+            self._deferred.keys = None
+            if keys:
+                self._incr_versions(keys)
+                if connection.in_atomic_block:
+                    transaction.on_commit(lambda: self._incr_versions(keys))
 
     @property
     def active(self) -> bool:
-        return not bool(self.cache.get(f"{self.prefix}:cache_disabled"))
+        key = f"{self.prefix}:cache_disabled"
+        return self._get_local(key, lambda: not bool(self.cache.get(key)))
 
     @active.setter
     def active(self, value: bool) -> None:
+        key = f"{self.prefix}:cache_disabled"
         if not value:
-            self.cache.set(f"{self.prefix}:cache_disabled", True)
+            self.cache.set(key, True)
         else:
-            self.cache.delete(f"{self.prefix}:cache_disabled")
+            self.cache.delete(key)
+        self._invalidate_local(key)
 
-    def build_key(self, prefix: str, *parts: list[str]) -> str:
+    def build_key(self, prefix: str, *parts: str, namespaces: "Iterable[str] | None" = None) -> str:
+        """Build a key that is invalidated when the program (or office) or any of `namespaces` change.
+
+        If `namespaces` is None the key depends on all of them.
+        """
         tenant = "t"
         version = "v"
         program = "p"
@@ -113,20 +265,22 @@ class CacheManager:
         if state.tenant and state.program:
             tenant = state.tenant.slug
             program = str(state.program.pk)
-            version = str(self.get_cache_version(program=state.program))
+            version = self.get_cache_versions(program=state.program, namespaces=namespaces)
         elif state.tenant:
             tenant = state.tenant.slug
-            version = str(self.get_cache_version(office=state.tenant))
+            version = self.get_cache_versions(office=state.tenant, namespaces=namespaces)
 
-        parts = [self.prefix, "entry", prefix, self.cw_version, ts, version, tenant, program, *parts]
-        return ":".join(parts)
+        return ":".join([self.prefix, "entry", prefix, self.cw_version, ts, version, tenant, program, *parts])
 
-    def build_key_from_request(self, request: HttpRequest, prefix: str = "view", *args: list[str]) -> str:
+    def build_key_from_request(
+        self, request: HttpRequest, prefix: str = "view", *args: Any, namespaces: "Iterable[str] | None" = None
+    ) -> str:
         return self.build_key(
             prefix,
             slugify(request.path),
             slugify(str(sorted(request.GET.items()))),
             *[str(e) for e in args],
+            namespaces=namespaces,
         )
 
 
@@ -2,12 +2,23 @@ from typing import Callable
 
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
+from django.urls import Resolver404, resolve
 from django.utils.cache import patch_response_headers
 from django.utils.deprecation import MiddlewareMixin
 
 from country_workspace.cache.manager import cache_manager
 
 
+def get_request_namespaces(request: HttpRequest) -> tuple[str, ...]:
+    """Return the cache namespaces the view serving `request` depends on, based on its ModelAdmin."""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return cache_manager.NAMESPACES
+    model_admin = getattr(match.func, "model_admin", None)
+    return cache_manager.get_dependencies(model_admin.model if model_admin else None)
+
+
 class UpdateCacheMiddleware(MiddlewareMixin):
     def __init__(self, get_response: Callable) -> None:
         super().__init__(get_response)
@@ -36,7 +47,9 @@ class UpdateCacheMiddleware(MiddlewareMixin):
         timeout = self.page_timeout
         patch_response_headers(response, timeout)
         if response.status_code == 200:
-            cache_key = self.manager.build_key_from_request(request, "view", getattr(request.user, "pk", ""))
+            cache_key = self.manager.build_key_from_request(
+                request, "view", getattr(request.user, "pk", ""), namespaces=get_request_namespaces(request)
+            )
             response.headers["Etag"] = cache_key
             if hasattr(response, "render") and callable(response.render):
                 response.add_post_render_callback(lambda r: self.manager.store(cache_key, r))
@@ -56,7 +69,9 @@ class FetchFromCacheMiddleware(MiddlewareMixin):
             return None  # Don't bother checking the cache.
 
         # try and get the cached GET response
-        cache_key = self.manager.build_key_from_request(request, "view", getattr(request.user, "pk", ""))
+        cache_key = self.manager.build_key_from_request(
+            request, "view", getattr(request.user, "pk", ""), namespaces=get_request_namespaces(request)
+        )
         if cache_key is None:
             request._cache_update_cache = True
             return None  # No cache information available, need to rebuild.
@@ -48,13 +48,27 @@ CONSTANCE_CONFIG = {
     "HOPE_API_URL": (HOPE_API_URL, "HOPE API Server address", str),
     "KOBO_API_TOKEN": ("", "Kobo API Access Token", "write_only_input"),
     "KOBO_API_URL": ("", "Kobo API Server address", str),
+    "REMOTE_API_RETRIES": (3, "Number of retries on Remote API connection errors and 429/5xx responses", int),
+    "REMOTE_API_BACKOFF": (0.5, "Remote API retries backoff factor (seconds)", float),
     "CACHE_TIMEOUT": (86400, "Cache Redis TTL", int),
     "CACHE_BY_VERSION": (False, "Invalidate Cache on CW version change", bool),
+    "CACHE_LOCAL_TTL": (5, "TTL (seconds) of the in-process copy of cache versions and flags. 0 to disable", int),
+    "VALIDATION_PARALLEL": (
+        False,
+        "Validate records in concurrent background tasks. Requires more than one Celery worker process",
+        bool,
+    ),
+    "VALIDATION_FAST_PATH": (
+        True,
+        "Check common field types column by column and use the checker forms only for the records with errors",
+        bool,
+    ),
 }
 
 CONSTANCE_CONFIG_FIELDSETS = {
     "New User Options": ("NEW_USER_IS_STAFF", "NEW_USER_DEFAULT_GROUP"),
-    "Cache": ("CACHE_TIMEOUT", "CACHE_BY_VERSION"),
+    "Cache": ("CACHE_TIMEOUT", "CACHE_BY_VERSION", "CACHE_LOCAL_TTL"),
+    "Validation": ("VALIDATION_PARALLEL", "VALIDATION_FAST_PATH"),
     "Remote System Tokens": (
         "AURORA_API_TOKEN",
         "AURORA_API_URL",
@@ -62,5 +76,7 @@ CONSTANCE_CONFIG_FIELDSETS = {
         "HOPE_API_URL",
         "KOBO_API_TOKEN",
         "KOBO_API_URL",
+        "REMOTE_API_RETRIES",
+        "REMOTE_API_BACKOFF",
     ),
 }
@@ -3,3 +3,4 @@ from typing import Final
 from django.utils import timezone
 
 BATCH_NAME_DEFAULT: Final[str] = f"Batch {timezone.now()}"
+CHUNK_SIZE_DEFAULT: Final[int] = 1000
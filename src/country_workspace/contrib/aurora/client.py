@@ -1,11 +1,12 @@
 from json import JSONDecodeError
-from typing import Any, Generator
+from typing import Any, Generator, Iterator
 from urllib.parse import urljoin
 
 import requests
 from constance import config
 
 from country_workspace.exceptions import RemoteError
+from country_workspace.utils.http import get_session, prefetch
 
 
 class AuroraClient:
@@ -16,16 +17,20 @@ class AuroraClient:
     Handles pagination automatically for large datasets.
     """
 
-    def __init__(self, token: str | None = None) -> None:
+    def __init__(self, token: str | None = None, prefetch: bool = False) -> None:
         """
         Initialize the AuroraClient.
 
         Args:
             token (str | None): An optional API token for authentication. If not provided,
                 the token is retrieved from the Constance configuration (config.AURORA_API_TOKEN).
+            prefetch (bool): If True, the next page is fetched in background while
+                the current one is processed.
 
         """
         self.token = token or config.AURORA_API_TOKEN
+        self.prefetch = prefetch
+        self.session = get_session(config.REMOTE_API_RETRIES, config.REMOTE_API_BACKOFF)
 
     def _get_url(self, path: str) -> str:
         """
@@ -43,15 +48,19 @@ class AuroraClient:
             url = url + "/"
         return url
 
-    def get(self, path: str) -> Generator[dict[str, Any], None, None]:
+    def get_pages(
+        self, path: str, url: str | None = None
+    ) -> Generator[tuple[list[dict[str, Any]], str | None], None, None]:
         """
-        Fetch records from the Aurora API with automatic pagination.
+        Fetch pages from the Aurora API.
 
         Args:
             path (str): The relative API path to fetch data from.
+            url (str | None): An optional absolute URL to start from (ie. the `next` link
+                of a previously fetched page). If not provided, starts from the first page.
 
         Yields:
-            dict[str, Any]: Individual records from the API.
+            tuple[list[dict[str, Any]], str | None]: The records of each page and the URL of the next one.
 
         Raises:
             RemoteError: If the API response has a non-200 status code,
@@ -59,10 +68,13 @@ class AuroraClient:
                          or if the response contains invalid JSON.
 
         """
-        url = self._get_url(path)
+        pages = self._follow(url or self._get_url(path))
+        yield from prefetch(pages) if self.prefetch else pages
+
+    def _follow(self, url: str | None) -> Iterator[tuple[list[dict[str, Any]], str | None]]:
         while url:
             try:
-                ret = requests.get(url, headers={"Authorization": f"Token {self.token}"}, timeout=10)
+                ret = self.session.get(url, headers={"Authorization": f"Token {self.token}"}, timeout=10)
                 if ret.status_code != 200:
                     raise RemoteError(f"Error {ret.status_code} fetching {url}")
             except requests.RequestException:
@@ -73,5 +85,24 @@ class AuroraClient:
             except JSONDecodeError:
                 raise RemoteError(f"Wrong JSON response fetching {url}")
 
-            yield from data["results"]
             url = data.get("next")
+            yield data["results"], url
+
+    def get(self, path: str) -> Generator[dict[str, Any], None, None]:
+        """
+        Fetch records from the Aurora API with automatic pagination.
+
+        Args:
+            path (str): The relative API path to fetch data from.
+
+        Yields:
+            dict[str, Any]: Individual records from the API.
+
+        Raises:
+            RemoteError: If the API response has a non-200 status code,
+                         if there's an issue with the network request,
+                         or if the response contains invalid JSON.
+
+        """
+        for records, __ in self.get_pages(path):
+            yield from records
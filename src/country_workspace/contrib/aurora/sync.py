@@ -2,13 +2,20 @@ from typing import Any
 
 from django.db.transaction import atomic
 
+from country_workspace.cache.manager import cache_manager
 from country_workspace.contrib.aurora.client import AuroraClient
-from country_workspace.models import AsyncJob, Batch, Household, Individual
+from country_workspace.models import AsyncJob, Batch, BatchStatistics, Household, Individual
 from country_workspace.utils.fields import clean_field_name
 
 
+@cache_manager.deferred_invalidation()
 def sync_aurora_job(job: AsyncJob) -> dict[str, int]:
-    """Synchronize data from the Aurora system into the database for the given job within an atomic transaction.
+    """Synchronize data from the Aurora system into the database for the given job.
+
+    Records are streamed page by page and each page is stored in its own transaction.
+    After each page the URL of the next one is stored in `job.config["cursor"]`, so that
+    a failed synchronization can be resumed (re-queuing the job) where it stopped; after the
+    last page the cursor is None, so a job that fails after it does not import anything again.
 
     Args:
         job (AsyncJob): The job instance containing configuration and context for synchronization.
@@ -17,48 +24,95 @@ def sync_aurora_job(job: AsyncJob) -> dict[str, int]:
         dict[str, int]: A dictionary with counts of households and individuals created.
 
     """
-    batch_name = job.config["batch_name"]
-    batch = Batch.objects.create(
-        name=batch_name,
-        program=job.program,
-        country_office=job.program.country_office,
-        imported_by=job.owner,
-        source=Batch.BatchSource.RDI,
-    )
-    total_hh = total_ind = 0
-    client = AuroraClient()
-    with atomic():
-        for record in client.get("record"):
-            for f_name, f_value in record["fields"].items():
-                if f_name == "household":
-                    hh = _create_household(batch, f_value[0])
-                    total_hh += 1
-                elif f_name == "individuals":
-                    total_ind += len(_create_individuals(hh, f_value, job.config.get("household_name_column", None)))
-
-    return {"households": total_hh, "individuals": total_ind}
-
-
-def _create_household(batch: Batch, fields: dict[str, Any]) -> Household:
-    """Create a household entity associated with the given job and batch.
+    client = AuroraClient(prefetch=True)
+    if "cursor" in job.config and job.batch:
+        batch = job.batch
+    else:
+        batch = Batch.objects.create(
+            name=job.config["batch_name"],
+            program=job.program,
+            country_office=job.program.country_office,
+            imported_by=job.owner,
+            source=Batch.BatchSource.RDI,
+        )
+        job.batch = batch
+        job.config["cursor"] = client._get_url("record")
+        job.config["totals"] = {"households": 0, "individuals": 0}
+        _save_progress(job)
+
+    totals = job.config["totals"]
+    if job.config["cursor"] is not None:
+        for records, next_url in client.get_pages("record", url=job.config["cursor"]):
+            with atomic():
+                total_hh, total_ind = _import_page(batch, records, job.config.get("household_name_column", None))
+                totals["households"] += total_hh
+                totals["individuals"] += total_ind
+                job.config["cursor"] = next_url
+                _save_progress(job)
+
+    del job.config["cursor"]
+    _save_progress(job)
+    BatchStatistics.objects.refresh([batch.pk])
+    cache_manager.incr_cache_version(program=job.program)
+    return {"households": totals["households"], "individuals": totals["individuals"]}
+
+
+def _save_progress(job: AsyncJob) -> None:
+    """Store the synchronization status without touching the job version.
+
+    Args:
+        job (AsyncJob): The job to update.
+
+    """
+    AsyncJob.objects.filter(pk=job.pk).update(batch=job.batch, config=job.config)
+
+
+def _import_page(batch: Batch, records: list[dict[str, Any]], household_name_column: str) -> tuple[int, int]:
+    """Bulk create the households and the individuals contained in one page of records.
+
+    Args:
+        batch (Batch): The batch the records belong to.
+        records (list[dict[str, Any]]): The records of the page.
+        household_name_column (str): The name of the column in household that contains the name of the individuals.
+
+    Returns:
+        tuple[int, int]: The number of households and individuals created.
+
+    """
+    households = []
+    individuals = []
+    for record in records:
+        for f_name, f_value in record["fields"].items():
+            if f_name == "household":
+                hh = _build_household(batch, f_value[0])
+                households.append(hh)
+            elif f_name == "individuals":
+                individuals.extend(_build_individuals(hh, f_value, household_name_column))
+    batch.program.households.bulk_create(households)
+    batch.program.individuals.bulk_create(individuals)
+    return len(households), len(individuals)
+
+
+def _build_household(batch: Batch, fields: dict[str, Any]) -> Household:
+    """Build (without saving) a household entity associated with the given batch.
 
     Args:
-        batch (Batch): The job instance containing context for household creation.
+        batch (Batch): The batch the household belongs to.
         fields (dict[str, Any]): A dictionary containing household data fields.
 
     Returns:
-        Household: The newly created household instance.
+        Household: The new household instance.
 
     """
-    return batch.program.households.create(batch=batch, flex_fields={clean_field_name(k): v for k, v in fields.items()})
+    return Household(batch=batch, flex_fields={clean_field_name(k): v for k, v in fields.items()})
 
 
-def _create_individuals(
+def _build_individuals(
     household: Household,
     data: list[dict[str, Any]],
     household_name_column: str,
 ) -> list[Individual]:
-    """Create individuals associated with a household and updates the household name if necessary.
+    """Build (without saving) the individuals of a household and set the household name if necessary.
 
     Args:
         household (Household): The household to associate with the individuals.
@@ -66,7 +120,7 @@ def _create_individuals(
         household_name_column (str): The name of the column in household that contains the name of the individuals.
 
     Returns:
-        list[Individual]: The list of newly created individual instances.
+        list[Individual]: The list of new individual instances.
 
     """
     individuals = []
@@ -79,13 +133,13 @@ def _create_individuals(
         individuals.append(
             Individual(
                 batch=household.batch,
-                household_id=household.pk,
+                household=household,
                 name=individual.get(fullname, ""),
                 flex_fields={clean_field_name(k): v for k, v in individual.items()},
             ),
         )
 
-    return household.program.individuals.bulk_create(individuals)
+    return individuals
 
 
 def _update_household_name_from_individual(
@@ -96,7 +150,7 @@ def _update_household_name_from_individual(
     """Update the household name based on an individual's relationship and name field.
 
     This method checks if the individual is marked as the head of the household
-    and updates the household name accordingly.
+    and updates the household name accordingly. The household is not saved.
 
     Args:
         household (Household): The household to update.
@@ -104,13 +158,12 @@ def _update_household_name_from_individual(
         household_name_column (str): The name of the column in household that contains the name of the individuals.
 
     Returns:
-        None
+        bool: True if the household name has been updated.
 
     """
     if any(individual.get(k) == "head" for k in individual if k.startswith("relationship")):
         for k, v in individual.items():
             if clean_field_name(k) == household_name_column:
                 household.name = v
-                household.save()
                 return True
     return False
@@ -1,19 +1,21 @@
 import hashlib
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Any, Generator
+from typing import TYPE_CHECKING, Any, Generator, Iterator
 
-import requests
 from constance import config
 from requests.exceptions import RequestException
 
 from .signals import hope_request_end, hope_request_start
 from country_workspace.exceptions import RemoteError
+from country_workspace.utils.http import get_remaining_page_urls, get_session, prefetch
 
 if TYPE_CHECKING:
     JsonType = None | int | str | bool | list["JsonType"] | dict[str, "JsonType"]
     FlatJsonType = dict[str, str | int | bool]
+    PageStats = dict[str, str | int | float]
 
 
 def sanitize_url(url: str) -> str:
@@ -21,8 +23,11 @@ def sanitize_url(url: str) -> str:
 
 
 class HopeClient:
-    def __init__(self, token: str | None = None) -> None:
+    def __init__(self, token: str | None = None, prefetch: bool = False, max_workers: int = 4) -> None:
         self.token = token or config.HOPE_API_TOKEN
+        self.prefetch = prefetch
+        self.max_workers = max_workers
+        self.session = get_session(config.REMOTE_API_RETRIES, config.REMOTE_API_BACKOFF)
 
     def get_url(self, path: str) -> str:
         url = sanitize_url(f"{config.HOPE_API_URL}/{path}")
@@ -32,34 +37,71 @@ class HopeClient:
 
     def get_lookup(self, path: str) -> "FlatJsonType":
         url = self.get_url(path)
-        ret = requests.get(url, headers={"Authorization": f"Token {self.token}"}, timeout=60)  # nosec
+        ret = self.session.get(url, headers={"Authorization": f"Token {self.token}"}, timeout=60)  # nosec
         if ret.status_code != 200:
             raise RemoteError(f"Error {ret.status_code} fetching {url}")
         return ret.json()
 
+    def _fetch(self, url: str, params: dict[str, Any] | None) -> "tuple[dict[str, Any], PageStats]":
+        start = time.perf_counter()
+        try:
+            ret = self.session.get(url, params=params, headers={"Authorization": f"Token {self.token}"}, timeout=10)  # nosec
+            if ret.status_code != 200:
+                raise RemoteError(f"Error {ret.status_code} fetching {url}")
+        except RequestException:
+            raise RemoteError(f"Remote Error fetching {url}")
+
+        try:
+            data = ret.json()
+        except JSONDecodeError:
+            raise RemoteError(f"Wrong JSON response fetching {url}")
+        if not isinstance(data, dict):
+            raise RemoteError(f"Malformed JSON fetching {url}")
+        return data, {"url": url, "bytes": len(ret.content), "time": time.perf_counter() - start}
+
+    def _follow(self, url: "str | None", params: dict[str, Any] | None) -> "Iterator[tuple[dict[str, Any], PageStats]]":
+        while url:
+            data, stats = self._fetch(url, params)
+            yield data, stats
+            url = data.get("next", None)
+
+    def get_pages(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> "Iterator[tuple[dict[str, Any], PageStats]]":
+        """Yield each page of `path` with its transfer statistics.
+
+        In prefetch mode, pages are fetched concurrently: all at once when the API exposes
+        the total `count` (page/offset pagination), otherwise one page ahead of the caller.
+        """
+        data, stats = self._fetch(self.get_url(path), params)
+        yield data, stats
+        if not (next_url := data.get("next", None)):
+            return
+        if not self.prefetch:
+            yield from self._follow(next_url, params)
+        elif urls := get_remaining_page_urls(next_url, data.get("count") or 0, len(data.get("results") or [])):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                yield from executor.map(lambda u: self._fetch(u, params), urls)
+        else:
+            yield from prefetch(self._follow(next_url, params))
+
     def get(self, path: str, params: dict[str, Any] | None = None) -> "Generator[FlatJsonType, None, None]":
-        url: "str|None" = self.get_url(path)
+        url = self.get_url(path)
         signature = hashlib.sha256(f"{url}{params}{time.perf_counter_ns()}".encode()).hexdigest()
-        pages = 0
+        pages: list[PageStats] = []
         hope_request_start.send(self.__class__, url=url, params=params, signature=signature)
-        while True:
-            if not url:
-                break
-            try:
-                ret = requests.get(url, params=params, headers={"Authorization": f"Token {self.token}"}, timeout=10)  # nosec
-                if ret.status_code != 200:
-                    raise RemoteError(f"Error {ret.status_code} fetching {url}")
-                pages += 1
-            except RequestException:
-                raise RemoteError(f"Remote Error fetching {url}")
-
-            try:
-                data = ret.json()
-            except JSONDecodeError:
-                raise RemoteError(f"Wrong JSON response fetching {url}")
+        for data, stats in self.get_pages(path, params):
+            pages.append(stats)
             try:
                 yield from data["results"]
-                url = data.get("next", None)
             except TypeError:
-                raise RemoteError(f"Malformed JSON fetching {url}")
-        hope_request_end.send(self.__class__, url=url, params=params, pages=pages, signature=signature)
+                raise RemoteError(f"Malformed JSON fetching {stats['url']}")
+        hope_request_end.send(
+            self.__class__,
+            url=url,
+            params=params,
+            pages=len(pages),
+            bytes=sum(p["bytes"] for p in pages),
+            timing=pages,
+            signature=signature,
+        )
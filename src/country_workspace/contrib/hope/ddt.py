@@ -15,6 +15,9 @@ class ApiCall:
         self.url = data["url"]
         self.params = data["params"]
         self.signature = data["signature"]
+        self.pages = 0
+        self.bytes = 0
+        self.page_timing = []
 
     def timing(self) -> Any:
         return self.panel.timing.get(self.signature)
@@ -42,6 +45,11 @@ class WSHopePanel(Panel):
             s = self.timing[kwargs["signature"]]
             e = time.perf_counter()
             self.timing[kwargs["signature"]] = f"{1000 * (e - s):.3f}ms"
+            for call in self.calls:
+                if call.signature == kwargs["signature"]:
+                    call.pages = kwargs.get("pages", 0)
+                    call.bytes = kwargs.get("bytes", 0)
+                    call.page_timing = [f"{1000 * p['time']:.3f}ms" for p in kwargs.get("timing", [])]
 
     def process_request(self, request: HttpRequest) -> HttpResponse:
         self.calls = []
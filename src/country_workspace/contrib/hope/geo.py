@@ -28,7 +28,7 @@ class DynamicChoiceField(ChildFieldMixin, forms.ChoiceField):
         key = slugify(f"{parent_value}-{self.level}")
         ret = []
         if not (data := cache_manager.retrieve(key)):
-            client = HopeClient()
+            client = HopeClient(prefetch=True)
             try:
                 data = list(
                     client.get("areas", params={"area_type_area_level": self.level, "country_iso_code3": parent_value}),
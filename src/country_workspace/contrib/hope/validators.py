@@ -1,35 +1,115 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
-from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.fields.json import KT
 
 from country_workspace.validators.base import BeneficiaryGroupValidator
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
     from country_workspace.models import Household
 
 
+def get_roles_errors(heads: int, primary: int, alternate: int) -> list[str]:
+    errs = []
+    if not heads:
+        errs.append("This Household does not have Head")
+    elif heads > 1:
+        errs.append("This Household has multiple heads")
+    if not primary:
+        errs.append("This Household does not have Primary Collector")
+    elif primary > 1:
+        errs.append("This Household has multiple Primary Collectors")
+    if alternate > 1:
+        errs.append("This Household has multiple Alternate Collectors")
+    return errs
+
+
 class FullHouseholdValidator(BeneficiaryGroupValidator):
-    def validate(self, hh: "Household") -> list:
-        errs = []
-        try:
-            hh.heads().get()
-        except ObjectDoesNotExist:
-            errs.append("This Household does not have Head")
-        except MultipleObjectsReturned:
-            errs.append("This Household has multiple heads")
-
-        try:
-            hh.collectors_primary().get()
-        except ObjectDoesNotExist:
-            errs.append("This Household does not have Primary Collector")
-        except MultipleObjectsReturned:
-            errs.append("This Household has multiple Primary Collectors")
-
-        try:
-            hh.collectors_alternate().get()
-        except ObjectDoesNotExist:
-            pass
-        except MultipleObjectsReturned:
-            errs.append("This Household has multiple Alternate Collectors")
-
-        return errs
+    def validate(self, hh: "Household") -> list[str]:
+        return get_roles_errors(hh.heads().count(), hh.collectors_primary().count(), hh.collectors_alternate().count())
+
+    def validate_households(
+        self, households: "QuerySet[Household]", program_errors: dict[int, list[str]] | None = None
+    ) -> dict[int, list[str]]:
+        """Count heads and collectors of all the `households` with one GROUP BY."""
+        counts = (
+            households.annotate(
+                heads=Count("members", filter=Q(members__flex_fields__relationship="HEAD")),
+                primary=Count(
+                    "members", filter=Q(members__flex_fields__primary_collector_id=F("flex_fields__household_id"))
+                ),
+                alternate=Count(
+                    "members", filter=Q(members__flex_fields__alternate_collector_id=F("flex_fields__household_id"))
+                ),
+            )
+            .values_list("pk", "heads", "primary", "alternate")
+            .order_by()
+        )
+        return {pk: errs for pk, *roles in counts if (errs := get_roles_errors(*roles))}
+
+
+class ProgramHouseholdValidator(FullHouseholdValidator):
+    """`FullHouseholdValidator` plus the rules that involve all the households of the programme.
+
+    - national ID numbers must be unique in the programme
+    - collector ids must refer to households of the programme
+    """
+
+    def validate(self, hh: "Household") -> list[str]:
+        households = cast("QuerySet[Household]", type(hh).objects.filter(pk=hh.pk))
+        return self.validate_households(households).get(hh.pk, [])
+
+    def get_program_errors(self, households: "QuerySet[Household] | None" = None) -> dict[int, list[str]]:
+        """Find duplicated national IDs and unknown collector households with one query for each rule."""
+        from country_workspace.models import Household, Individual
+
+        ret: dict[int, list[str]] = {}
+        individuals = Individual.objects.filter(program=self.program)
+        members = individuals if households is None else individuals.filter(household__in=households)
+        duplicated = (
+            individuals.annotate(value=KT("flex_fields__national_id_no"))
+            .exclude(Q(value__isnull=True) | Q(value=""))
+            .values("value")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .values("value")
+        )
+        for pk, value in (
+            members.annotate(value=KT("flex_fields__national_id_no"))
+            .filter(value__in=duplicated)
+            .values_list("household", "value")
+            .order_by("household", "value")
+            .distinct()
+        ):
+            ret.setdefault(pk, []).append(f"National ID {value} is not unique in the Programme")
+
+        program_households = Household.objects.filter(program=self.program).annotate(
+            household_id=KT("flex_fields__household_id")
+        )
+        for role, label in (("primary", "Primary"), ("alternate", "Alternate")):
+            key = f"flex_fields__{role}_collector_id"
+            for pk, value in (
+                members.annotate(value=KT(key))
+                .exclude(Q(value__isnull=True) | Q(value=""))
+                .exclude(Exists(program_households.filter(household_id=OuterRef("value"))))
+                .values_list("household", "value")
+                .order_by("household", "value")
+                .distinct()
+            ):
+                ret.setdefault(pk, []).append(f"{label} Collector for unknown Household {value}")
+        return ret
+
+    def validate_households(
+        self, households: "QuerySet[Household]", program_errors: dict[int, list[str]] | None = None
+    ) -> dict[int, list[str]]:
+        ret = super().validate_households(households)
+        if program_errors is None:
+            program_errors = self.get_program_errors(households)
+        elif program_errors:
+            pks = set(households.values_list("pk", flat=True))
+            program_errors = {pk: errors for pk, errors in program_errors.items() if pk in pks}
+        for pk, errors in program_errors.items():
+            ret.setdefault(pk, []).extend(errors)
+        return ret
@@ -1,60 +1,98 @@
 import io
+from itertools import batched
+from typing import Any, Iterable
 
 from django.db.transaction import atomic
 
 from hope_smart_import.readers import open_xls_multi
 
-from country_workspace.models import AsyncJob, Batch, Household
+from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
+from country_workspace.models import AsyncJob, Batch, BatchStatistics, Household, Individual
 from country_workspace.utils.fields import clean_field_name
 
 RDI = str | io.BytesIO
 
+Row = tuple[int, dict[str, Any], dict[str, Any]]
 
+
+def _read_sheet(sheet_generator: Iterable[dict[str, Any]], household_pk_col: str) -> Iterable[Row]:
+    for line, raw_record in enumerate(sheet_generator, 1):
+        record = {}
+        for k, v in raw_record.items():
+            record[clean_field_name(k)] = v
+        if record[household_pk_col]:
+            yield line, raw_record, record
+
+
+def _create_households(job: AsyncJob, batch: Batch, rows: Iterable[Row], hh_ids: dict[str, int]) -> int:
+    household_pk_col = job.config["household_pk_col"]
+    master_column_label = job.config["master_column_label"]
+    households = []
+    for line, raw_record, record in rows:
+        try:
+            households.append(Household(batch=batch, name=raw_record[master_column_label], flex_fields=record))
+        except Exception as e:  # noqa: BLE001
+            raise Exception("Error processing sheet 1 line %s: %s" % (line, e))
+    created = job.program.households.bulk_create(households)
+    for hh in created:
+        hh_ids[hh.flex_fields[household_pk_col]] = hh.pk
+    return len(created)
+
+
+def _create_individuals(job: AsyncJob, batch: Batch, rows: Iterable[Row], hh_ids: dict[str, int]) -> int:
+    household_pk_col = job.config["household_pk_col"]
+    detail_column_label = job.config["detail_column_label"]
+    individuals = []
+    for line, __, record in rows:
+        try:
+            try:
+                name = record[detail_column_label]
+            except KeyError:
+                raise Exception("Error in configuration. '%s' is not a valid column name" % detail_column_label)
+            individuals.append(
+                Individual(
+                    batch=batch,
+                    name=name,
+                    household_id=hh_ids[record[household_pk_col]],
+                    flex_fields=record,
+                ),
+            )
+        except Exception as e:  # noqa: BLE001
+            raise Exception("Error processing sheet 2 line %s: %s" % (line, e))
+    return len(job.program.individuals.bulk_create(individuals))
+
+
+@cache_manager.deferred_invalidation()
 def import_from_rdi(job: AsyncJob) -> dict[str, int]:
+    """Import Households (sheet 1) and Individuals (sheet 2) from an RDI file.
+
+    Rows are streamed from the file and stored in chunks of `chunk_size` records,
+    each chunk in its own transaction. If any chunk fails the whole batch is removed.
+    """
     ret = {"household": 0, "individual": 0}
-    hh_ids = {}
-    with atomic():
-        batch_name = job.config["batch_name"]
-        household_pk_col = job.config["household_pk_col"]
-        master_column_label = job.config["master_column_label"]
-        detail_column_label = job.config["detail_column_label"]
-        rdi = job.file
-        batch = Batch.objects.create(
-            name=batch_name,
-            program=job.program,
-            country_office=job.program.country_office,
-            imported_by=job.owner,
-            source=Batch.BatchSource.RDI,
-        )
-        for sheet_index, sheet_generator in open_xls_multi(rdi, sheets=[0, 1]):
-            for line, raw_record in enumerate(sheet_generator, 1):
-                record = {}
-                for k, v in raw_record.items():
-                    record[clean_field_name(k)] = v
-                if record[household_pk_col]:
-                    try:
-                        if sheet_index == 0:
-                            hh: "Household" = job.program.households.create(
-                                batch=batch,
-                                name=raw_record[master_column_label],
-                                flex_fields=record,
-                            )
-                            hh_ids[record[household_pk_col]] = hh.pk
-                            ret["household"] += 1
-                        elif sheet_index == 1:
-                            try:
-                                name = record[detail_column_label]
-                            except KeyError:
-                                raise Exception(
-                                    "Error in configuration. '%s' is not a valid column name" % detail_column_label,
-                                )
-                            job.program.individuals.create(
-                                batch=batch,
-                                name=name,
-                                household_id=hh_ids[record[household_pk_col]],
-                                flex_fields=record,
-                            )
-                            ret["individual"] += 1
-                    except Exception as e:  # noqa: BLE001
-                        raise Exception("Error processing sheet %s line %s: %s" % (1 + sheet_index, line, e))
-        return ret
+    hh_ids: dict[str, int] = {}
+    household_pk_col = job.config["household_pk_col"]
+    chunk_size = job.config.get("chunk_size", CHUNK_SIZE_DEFAULT)
+    batch = Batch(
+        name=job.config["batch_name"],
+        program=job.program,
+        country_office=job.program.country_office,
+        imported_by=job.owner,
+        source=Batch.BatchSource.RDI,
+    )
+    batch.save()
+    try:
+        for sheet_index, sheet_generator in open_xls_multi(job.file, sheets=[0, 1]):
+            for rows in batched(_read_sheet(sheet_generator, household_pk_col), chunk_size):
+                with atomic():
+                    if sheet_index == 0:
+                        ret["household"] += _create_households(job, batch, rows, hh_ids)
+                    elif sheet_index == 1:
+                        ret["individual"] += _create_individuals(job, batch, rows, hh_ids)
+    except Exception:
+        batch.delete()
+        raise
+    BatchStatistics.objects.refresh([batch.pk])
+    cache_manager.incr_cache_version(program=job.program)
+    return ret
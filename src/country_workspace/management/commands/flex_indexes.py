@@ -0,0 +1,46 @@
+import logging
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from country_workspace.utils.indexes import sync_flex_field_indexes
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Create the database indexes for the flex-field columns configured in the programs"
+    requires_migrations_checks = False
+    requires_system_checks = []
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--program",
+            action="append",
+            dest="programs",
+            default=[],
+            help="Only create the indexes of this program (can be repeated)",
+        )
+        parser.add_argument(
+            "--drop-unused",
+            action="store_true",
+            dest="drop_unused",
+            default=False,
+            help="Drop the indexes not needed by any program",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from country_workspace.models import Program
+
+        programs = Program.objects.select_related("country_office")
+        if options["programs"]:
+            if options["drop_unused"]:
+                self.stderr.write("--drop-unused cannot be used together with --program")
+                return
+            programs = programs.filter(pk__in=options["programs"])
+        ret = sync_flex_field_indexes(programs, drop_unused=options["drop_unused"])
+        for name in ret["created"]:
+            self.stdout.write(f"Created {name}")
+        for name in ret["dropped"]:
+            self.stdout.write(f"Dropped {name}")
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("country_workspace", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="household",
+            name="checker_version",
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name="household",
+            name="validated_checksum",
+            field=models.CharField(blank=True, editable=False, max_length=300, null=True),
+        ),
+        migrations.AddField(
+            model_name="individual",
+            name="checker_version",
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name="individual",
+            name="validated_checksum",
+            field=models.CharField(blank=True, editable=False, max_length=300, null=True),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:02
+
+import django.contrib.postgres.indexes
+from django.db import DatabaseError, migrations, models, transaction
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+TRIGRAM_INDEXES = {
+    "household_name_trgm": "country_workspace_household",
+    "individual_name_trgm": "country_workspace_individual",
+    "batch_name_trgm": "country_workspace_batch",
+}
+
+
+def create_trigram_indexes(apps: StateApps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Trigram indexes for `name__icontains` searches, only where pg_trgm can be installed."""
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return
+    for name, table in TRIGRAM_INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (name gin_trgm_ops)")
+
+
+def drop_trigram_indexes(apps: StateApps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("country_workspace", "0002_validation_checksum"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="program",
+            name="household_search",
+            field=models.TextField(
+                default="name",
+                help_text="Fields to use for searches, one per line (ie. 'name' or 'flex_fields__phone_no')",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="program",
+            name="individual_search",
+            field=models.TextField(
+                default="name",
+                help_text="Fields to use for searches, one per line (ie. 'name' or 'flex_fields__phone_no')",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="household",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["flex_fields"], name="household_flex_fields_gin", opclasses=["jsonb_path_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="individual",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["flex_fields"], name="individual_flex_fields_gin", opclasses=["jsonb_path_ops"]
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.3 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+VALIDATION_STATUS_CHOICES = [("UNCHECKED", "Not Verified"), ("VALID", "Valid"), ("INVALID", "Invalid")]
+
+BACKFILL = """
+UPDATE {table} SET
+    validation_status = CASE
+        WHEN last_checked IS NULL THEN 'UNCHECKED'
+        WHEN errors = '{{}}'::jsonb THEN 'VALID'
+        ELSE 'INVALID'
+    END,
+    error_count = (
+        SELECT COALESCE(SUM(CASE jsonb_typeof(value) WHEN 'array' THEN jsonb_array_length(value) ELSE 1 END), 0)
+        FROM jsonb_each(errors)
+    )
+WHERE last_checked IS NOT NULL
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("country_workspace", "0003_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="household",
+            name="error_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="household",
+            name="validation_status",
+            field=models.CharField(
+                choices=VALIDATION_STATUS_CHOICES, default="UNCHECKED", editable=False, max_length=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="individual",
+            name="error_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="individual",
+            name="validation_status",
+            field=models.CharField(
+                choices=VALIDATION_STATUS_CHOICES, default="UNCHECKED", editable=False, max_length=10
+            ),
+        ),
+        migrations.RunSQL(BACKFILL.format(table="country_workspace_household"), migrations.RunSQL.noop),
+        migrations.RunSQL(BACKFILL.format(table="country_workspace_individual"), migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="household",
+            index=models.Index(fields=["batch", "validation_status"], name="household_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="individual",
+            index=models.Index(fields=["batch", "validation_status"], name="individual_status_idx"),
+        ),
+    ]
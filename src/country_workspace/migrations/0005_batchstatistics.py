@@ -0,0 +1,67 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL = """
+INSERT INTO country_workspace_batchstatistics (batch_id, program_id, target, validation_status, count, last_update)
+SELECT r.batch_id, b.program_id, '{target}', r.validation_status, COUNT(*), NOW()
+FROM {table} r JOIN country_workspace_batch b ON b.id = r.batch_id
+GROUP BY r.batch_id, b.program_id, r.validation_status
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("country_workspace", "0004_validation_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BatchStatistics",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("household", "Households"), ("individual", "Individuals")], max_length=10
+                    ),
+                ),
+                (
+                    "validation_status",
+                    models.CharField(
+                        choices=[("UNCHECKED", "Not Verified"), ("VALID", "Valid"), ("INVALID", "Invalid")],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("last_update", models.DateTimeField(auto_now=True)),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics",
+                        to="country_workspace.batch",
+                    ),
+                ),
+                (
+                    "program",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics",
+                        to="country_workspace.program",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Batch statistics",
+                "unique_together": {("batch", "target", "validation_status")},
+            },
+        ),
+        migrations.RunSQL(
+            BACKFILL.format(target="household", table="country_workspace_household"), migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            BACKFILL.format(target="individual", table="country_workspace_individual"), migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# constraints are checked immediately, otherwise the following ALTER TABLE fails with pending trigger events
+BACKFILL = """
+SET CONSTRAINTS ALL IMMEDIATE;
+UPDATE {table} r SET program_id = b.program_id, country_office_id = b.country_office_id
+FROM country_workspace_batch b WHERE b.id = r.batch_id
+"""
+
+
+def add_fields(model_name: str) -> list[migrations.operations.base.Operation]:
+    table = f"country_workspace_{model_name}"
+    return [
+        migrations.AddField(
+            model_name=model_name,
+            name="country_office",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="country_workspace.office",
+            ),
+        ),
+        migrations.AddField(
+            model_name=model_name,
+            name="program",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="country_workspace.program",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL.format(table=table), migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name=model_name,
+            name="country_office",
+            field=models.ForeignKey(
+                editable=False, on_delete=django.db.models.deletion.CASCADE, to="country_workspace.office"
+            ),
+        ),
+        migrations.AlterField(
+            model_name=model_name,
+            name="program",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="country_workspace.program",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name=model_name,
+            index=models.Index(fields=["program", "name"], name=f"{model_name}_program_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name=model_name,
+            index=models.Index(fields=["program", "checksum"], name=f"{model_name}_program_chk_idx"),
+        ),
+        migrations.AddIndex(
+            model_name=model_name,
+            index=models.Index(fields=["program", "last_checked"], name=f"{model_name}_program_lc_idx"),
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("country_workspace", "0005_batchstatistics"),
+    ]
+
+    operations = [
+        *add_fields("household"),
+        *add_fields("individual"),
+    ]
@@ -7,5 +7,6 @@ from .office import Office  # noqa
 from .program import Program  # noqa
 from .rdi import Rdi  # noqa
 from .role import UserRole  # noqa
+from .statistics import BatchStatistics  # noqa
 from .sync import SyncLog  # noqa
 from .user import User  # noqa
@@ -1,23 +1,28 @@
-from typing import TYPE_CHECKING, Any
+from itertools import batched
+from typing import TYPE_CHECKING, Any, cast
 
 import dictdiffer
 import reversion
 from concurrency.fields import IntegerVersionField
-from django.db import models
+from django.db import connections, models
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
 from country_workspace.state import state
-from country_workspace.utils.flex_fields import get_obj_checksum
+from country_workspace.utils.flex_fields import checker_registry, get_checker_version, get_obj_checksum
 
 if TYPE_CHECKING:
-    from django.db.models import QuerySet
+    from collections.abc import Iterable, Sequence
+    from datetime import datetime
+
+    from django.db.models import Expression, QuerySet
 
     from hope_flex_fields.models import DataChecker
 
-    from country_workspace.models import Office, Program
+    from country_workspace.models import Batch, Program
 
 
 class BaseQuerySet(models.QuerySet["models.Model"]):
@@ -38,29 +43,174 @@ class ValidableQuerySet(BaseQuerySet["Validable"]):
     def all(self) -> "QuerySet[Validable]":
         return super().all().defer("flex_files")
 
+    def _load_flex_files(self, objs: "list[Validable]") -> None:
+        deferred = {obj.pk: obj for obj in objs if obj.pk and "flex_files" in obj.get_deferred_fields()}
+        if deferred:
+            for pk, flex_files in self.model._base_manager.filter(pk__in=deferred).values_list("pk", "flex_files"):
+                deferred[pk].flex_files = flex_files
+
+    def bulk_create(  # type: ignore[override]
+        self, objs: "Iterable[Validable]", *args: Any, **kwargs: Any
+    ) -> "list[Validable]":
+        """Bulk version of `Validable.save()` for new records.
+
+        Checksums are computed in memory, program and country office are copied from
+        the batch and all the created records are stored in one single revision.
+        """
+        objs = list(objs)
+        batches: dict[int, Batch] = {}
+        for obj in objs:
+            obj.checksum = obj._checksum = get_obj_checksum(obj)
+            if obj.program_id is None and obj.batch_id:
+                if obj.batch_id not in batches:
+                    batches[obj.batch_id] = obj.batch
+                obj.set_program(batches[obj.batch_id])
+        with reversion.create_revision(manage_manually=True):
+            super().bulk_create(objs, *args, **kwargs)
+            for obj in objs:
+                if obj.pk:
+                    reversion.add_to_revision(obj)
+            if state.request:
+                reversion.set_user(state.request.user)
+        return objs
+
+    def bulk_update(  # type: ignore[override]
+        self, objs: "Iterable[Validable]", fields: "Iterable[str]", *args: Any, **kwargs: Any
+    ) -> int:
+        """Bulk version of `Validable.save()` for existing records.
+
+        When `flex_fields` or `checksum` are updated, checksums are recomputed in
+        memory and only records whose checksum changed are added to the (single) revision.
+        """
+        objs = list(objs)
+        fields = list(fields)
+        if "flex_fields" not in fields and "checksum" not in fields:
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        self._load_flex_files(objs)
+        changed = []
+        for obj in objs:
+            checksum = get_obj_checksum(obj)
+            if checksum != obj._checksum:
+                changed.append(obj)
+            obj.checksum = obj._checksum = checksum
+        if "checksum" not in fields:
+            fields.append("checksum")
+        with reversion.create_revision(manage_manually=True):
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            for obj in changed:
+                reversion.add_to_revision(obj)
+            if state.request:
+                reversion.set_user(state.request.user)
+        return updated
+
+    def update_checksums(self, chunk_size: int = CHUNK_SIZE_DEFAULT) -> int:
+        """Recompute the checksum of the records after a set-based update of `flex_fields`.
+
+        Records are processed in chunks, changed records are stored in one revision per chunk.
+        """
+        updated = 0
+        for chunk in batched(self.order_by("pk").iterator(chunk_size=chunk_size), chunk_size):
+            updated += self.model.objects.bulk_update(chunk, ["checksum"])
+        return updated
+
+    def update_flex_fields(self, flex_fields: "Expression", chunk_size: int = CHUNK_SIZE_DEFAULT) -> int:
+        """Set-based update of `flex_fields`, followed by the recompute of the checksums.
+
+        The primary keys of each chunk of `chunk_size` records are selected before its UPDATE,
+        so that only the updated records are processed again, even when their new values do
+        not match the filters of the queryset anymore.
+        """
+        updated = 0
+        for pks in batched(self.order_by("pk").values_list("pk", flat=True).iterator(chunk_size), chunk_size):
+            records = self.model.objects.filter(pk__in=pks)
+            updated += records.update(flex_fields=flex_fields)
+            records.update_checksums(chunk_size)
+        return updated
+
+    def get_error_report(self, samples: int = 5) -> list[dict[str, Any]]:
+        """Return the number of records failing each field with each message, most frequent first.
+
+        Computed with one query that expands `errors` with `jsonb_each()`; each row has
+        "field", "message", "count" and the primary keys of up to `samples` records as "samples".
+        """
+        sql, params = self.order_by().values("pk", "errors").query.sql_with_params()
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT e.key, m.message, COUNT(DISTINCT r.id), (array_agg(DISTINCT r.id))[1:%s] "  # noqa: S608
+                f"FROM ({sql}) r(id, errors) "
+                "CROSS JOIN LATERAL jsonb_each(r.errors) e "
+                "CROSS JOIN LATERAL jsonb_array_elements_text("
+                "CASE jsonb_typeof(e.value) WHEN 'array' THEN e.value ELSE jsonb_build_array(e.value) END"
+                ") m(message) "
+                "WHERE jsonb_typeof(r.errors) = 'object' "
+                "GROUP BY e.key, m.message "
+                "ORDER BY 3 DESC, 1, 2",
+                (samples, *params),
+            )
+            return [
+                {"field": field, "message": message, "count": count, "samples": pks}
+                for field, message, count, pks in cursor.fetchall()
+            ]
+
+    def get_program_ids(self) -> list[int]:
+        """Return the primary keys of the programs of the records."""
+        return list(self.order_by().values_list("program", flat=True).distinct())
+
+    def incr_cache_version(self, programs: "Iterable[int] | None" = None) -> None:
+        """Invalidate the cache namespace of the records in all the programs they belong to.
+
+        Bulk operations do not send `post_save`, so they must call this once at the end.
+        Operations that can change the records matched by the queryset must collect
+        `get_program_ids()` before they start and pass them as `programs`.
+        """
+        from country_workspace.models import Program
+
+        namespace = cache_manager.get_namespace(self.model)
+        if programs is None:
+            programs = self.get_program_ids()
+        queryset = Program.objects.filter(pk__in=programs).select_related("country_office")
+        for program in cast("QuerySet[Program]", queryset):
+            cache_manager.incr_cache_version(program=program, namespace=namespace)
+
 
 class ValidableManager(models.Manager["Validable"]):
     _queryset_class = ValidableQuerySet
 
 
 class Cachable:
-    def country_office(self) -> "Office":
-        raise NotImplementedError
-
-    def program(self) -> "Program":
-        raise NotImplementedError
-
-    def get_object_key(self, suffix: str = "") -> str:
-        version = str(cache_manager.get_cache_version(program=self.program))
+    def get_object_key(self: "Validable", suffix: str = "") -> str:
+        namespace = cache_manager.get_namespace(cast("type[models.Model]", type(self)))
+        version = cache_manager.get_cache_versions(program=self.program, namespaces=[namespace] if namespace else [])
 
         parts = [self.__class__.__name__, version, self.country_office.slug, str(self.program.pk), str(self.pk), suffix]
         return ":".join(parts)
 
 
+def count_errors(errors: dict[str, Any]) -> int:
+    """Return the number of errors in a `Validable.errors` dict (fields can have a list of errors)."""
+    return sum(len(e) if isinstance(e, list) else 1 for e in errors.values())
+
+
 class Validable(Cachable, models.Model):
+    class ValidationStatus(models.TextChoices):
+        UNCHECKED = "UNCHECKED", _("Not Verified")
+        VALID = "VALID", _("Valid")
+        INVALID = "INVALID", _("Invalid")
+
     batch = models.ForeignKey("Batch", on_delete=models.CASCADE)
+    # copied from `batch` by `save()` and `bulk_create()`, so that programme-wide queries need no join.
+    # `program` is indexed by the (program, ...) composite indexes of the concrete models
+    program = models.ForeignKey("Program", on_delete=models.CASCADE, editable=False, db_index=False)
+    country_office = models.ForeignKey("Office", on_delete=models.CASCADE, editable=False)
     last_checked = models.DateTimeField(default=None, null=True, blank=True)
     errors = models.JSONField(default=dict, blank=True, editable=False)
+    # denormalized from `errors` by `set_validation_errors()`, so that filters and counts can use indexes
+    validation_status = models.CharField(
+        max_length=10, choices=ValidationStatus.choices, default=ValidationStatus.UNCHECKED, editable=False
+    )
+    error_count = models.PositiveIntegerField(default=0, editable=False)
+    validated_checksum = models.CharField(max_length=300, blank=True, null=True, editable=False)
+    checker_version = models.CharField(max_length=32, blank=True, null=True, editable=False)
     flex_fields = models.JSONField(default=dict, blank=True)
     flex_files = models.BinaryField(null=True, blank=True)
 
@@ -69,6 +219,16 @@ class Validable(Cachable, models.Model):
     checksum = models.CharField(_("checksum"), max_length=300, blank=True, null=True, db_index=True)
 
     objects = ValidableManager()
+    # lookup path of the record checker, ie. "program__household_checker"
+    checker_path: str
+    VALIDATION_FIELDS = [
+        "errors",
+        "last_checked",
+        "validated_checksum",
+        "checker_version",
+        "validation_status",
+        "error_count",
+    ]
 
     class Meta:
         abstract = True
@@ -85,6 +245,9 @@ class Validable(Cachable, models.Model):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self._checksum = self.checksum
+        self._batch_id = self.__dict__.get("batch_id")
+        if kwargs.get("batch") and not (kwargs.get("program") or kwargs.get("program_id")):
+            self.set_program(kwargs["batch"])
 
     def save(
         self,
@@ -95,6 +258,10 @@ class Validable(Cachable, models.Model):
         update_fields: list[str] | None = None,
     ) -> None:
         checksum = get_obj_checksum(self)
+        if self.batch_id and (self.program_id is None or self.batch_id != self._batch_id):
+            self.set_program(self.batch)
+            if update_fields is not None:
+                update_fields = [*update_fields, "program", "country_office"]
         with reversion.create_revision(manage_manually=True):
             if checksum != self._checksum:
                 reversion.add_to_revision(self)
@@ -106,21 +273,87 @@ class Validable(Cachable, models.Model):
                 using=using,
                 update_fields=update_fields,
             )
+            self._batch_id = self.batch_id
             if state.request:
                 reversion.set_user(state.request.user)
 
+    def set_program(self, batch: "Batch") -> None:
+        """Copy program and country office of `batch`."""
+        self.program = batch.program
+        self.country_office = batch.country_office
+
     def checker(self) -> "DataChecker":
         raise NotImplementedError
 
-    def validate_with_checker(self) -> bool:
-        errors = self.checker.validate([self.flex_fields])
-        if errors:
-            self.errors = errors[1]
+    def get_group_errors(self) -> list[Any]:
+        """Return the errors found validating the record together with its related records."""
+        return []
+
+    @classmethod
+    def get_records_group_errors(
+        cls, records: "Sequence[Validable]", program_errors: dict[int, list[Any]] | None = None
+    ) -> dict[int, list[Any]] | None:
+        """Return the group errors of `records` keyed by primary key, with a few queries.
+
+        None means that group errors must be computed record by record with `get_group_errors()`.
+        `program_errors` is the result of `get_program_group_errors()`, if already computed.
+        """
+        return None
+
+    @classmethod
+    def get_program_group_errors(cls, queryset: "QuerySet[Validable]") -> dict[int, list[Any]] | None:
+        """Return the group errors of the records of `queryset` that depend on whole programmes.
+
+        They do not change while records are validated, so validation runs compute them once
+        and pass them to `get_records_group_errors()` for each chunk.
+        """
+        return None
+
+    @classmethod
+    def filter_group_validated(cls, queryset: "QuerySet[Validable]") -> "QuerySet[Validable]":
+        """Return the records of `queryset` whose group errors depend on other records.
+
+        Their validation must be run again even when they are unchanged.
+        """
+        return queryset.none()
+
+    def set_validation_errors(
+        self,
+        errors: dict[str, Any],
+        timestamp: "datetime | None" = None,
+        checker_version: str | None = None,
+        group_errors: list[Any] | None = None,
+    ) -> bool:
+        """Store the errors returned by the checker (and by `get_group_errors()`) without saving.
+
+        The record checksum and the checker version are stored as well, so that unchanged
+        records can be skipped by the next validation, together with the validation status
+        and the number of errors. `group_errors`, if already known, replace `get_group_errors()`.
+        """
+        self.errors = errors
+        if group_errors is None:
+            group_errors = self.get_group_errors()
+        if group_errors:
+            self.errors["dct"] = group_errors
+        self.last_checked = timestamp or timezone.now()
+        self.validated_checksum = self.checksum
+        self.checker_version = checker_version or get_checker_version(self.checker)
+        self.error_count = count_errors(self.errors)
+        if self.errors:
+            self.validation_status = self.ValidationStatus.INVALID
         else:
-            self.errors = {}
-        self.last_checked = timezone.now()
-        self.save(update_fields=["last_checked", "errors"])
-        return not bool(errors)
+            self.validation_status = self.ValidationStatus.VALID
+        return not bool(self.errors)
+
+    def validate_with_checker(self) -> bool:
+        from country_workspace.models import BatchStatistics
+
+        errors = checker_registry.validate(self.checker, [self.flex_fields])
+        previous_status = self.validation_status
+        ret = self.set_validation_errors(errors.get(1, {}))
+        self.save(update_fields=self.VALIDATION_FIELDS)
+        BatchStatistics.objects.move(self, previous_status)
+        return ret
 
     def last_changes(self) -> "Any":
         from reversion.models import Version
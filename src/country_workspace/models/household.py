@@ -1,18 +1,23 @@
 from functools import cached_property
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 import reversion
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import Q
+from strategy_field.utils import fqn
 
+from ..validators.registry import NoopValidator
 from .base import BaseModel, Validable
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from django.db.models import QuerySet
 
     from hope_flex_fields.models import DataChecker
 
     from .individual import Individual
-    from .office import Office
     from .program import Program
 
 
@@ -20,29 +25,58 @@ if TYPE_CHECKING:
 class Household(Validable, BaseModel):
     system_fields = models.JSONField(default=dict, blank=True)
     members: "QuerySet[Individual]"
+    checker_path = "program__household_checker"
 
     class Meta:
         verbose_name = "Household"
+        indexes = [
+            GinIndex(fields=["flex_fields"], opclasses=["jsonb_path_ops"], name="household_flex_fields_gin"),
+            models.Index(fields=["batch", "validation_status"], name="household_status_idx"),
+            models.Index(fields=["program", "name"], name="household_program_name_idx"),
+            models.Index(fields=["program", "checksum"], name="household_program_chk_idx"),
+            models.Index(fields=["program", "last_checked"], name="household_program_lc_idx"),
+        ]
 
     @cached_property
     def checker(self) -> "DataChecker":
         return self.program.household_checker
 
-    @cached_property
-    def program(self) -> "Program":
-        return self.batch.program
-
-    @cached_property
-    def country_office(self) -> "Office":
-        return self.batch.program.country_office
-
-    def validate_with_checker(self) -> bool:
-        super().validate_with_checker()
-        errors = self.program.beneficiary_validator.validate(self)
-        if errors:
-            self.errors["dct"] = errors
-        self.save(update_fields=["errors"])
-        return not bool(self.errors)
+    def get_group_errors(self) -> list[Any]:
+        return self.program.beneficiary_validator.validate(self)
+
+    @classmethod
+    def get_records_group_errors(
+        cls, records: "Sequence[Validable]", program_errors: dict[int, list[Any]] | None = None
+    ) -> dict[int, list[Any]]:
+        """Validate `records` with one `validate_households()` call for each program."""
+        by_program: dict[int, tuple[Validable, list[int]]] = {}
+        for record in records:
+            by_program.setdefault(record.program_id, (record, []))[1].append(record.pk)
+        ret: dict[int, list[Any]] = {}
+        # the program is loaded (if not already) from the first record of each program only
+        for first, pks in by_program.values():
+            households = cast("QuerySet[Household]", cls.objects.filter(pk__in=pks))
+            ret.update(first.program.beneficiary_validator.validate_households(households, program_errors))
+        return ret
+
+    @classmethod
+    def get_program_group_errors(cls, queryset: "QuerySet[Validable]") -> dict[int, list[Any]]:
+        """Return the programme-wide errors of the households of `queryset`, with a few queries for each program."""
+        from .program import Program
+
+        ret: dict[int, list[Any]] = {}
+        for program in cast("QuerySet[Program]", Program.objects.filter(pk__in=queryset.values("program"))):
+            households = cast("QuerySet[Household]", queryset.filter(program=program))
+            ret.update(program.beneficiary_validator.get_program_errors(households) or {})
+        return ret
+
+    @classmethod
+    def filter_group_validated(cls, queryset: "QuerySet[Validable]") -> "QuerySet[Validable]":
+        """Return the households of the programs with a beneficiary validator."""
+        return queryset.exclude(
+            Q(program__beneficiary_validator__isnull=True)
+            | Q(program__beneficiary_validator__in=["", fqn(NoopValidator)])
+        )
 
     # Business methods
 
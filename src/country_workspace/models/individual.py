@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 import reversion
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.functional import cached_property
 
@@ -15,15 +16,17 @@ if TYPE_CHECKING:
 class Individual(Validable, BaseModel):
     household = models.ForeignKey(Household, on_delete=models.CASCADE, null=True, blank=True, related_name="members")
     system_fields = models.JSONField(default=dict, blank=True)
+    checker_path = "program__individual_checker"
+
+    class Meta(Validable.Meta):
+        indexes = [
+            GinIndex(fields=["flex_fields"], opclasses=["jsonb_path_ops"], name="individual_flex_fields_gin"),
+            models.Index(fields=["batch", "validation_status"], name="individual_status_idx"),
+            models.Index(fields=["program", "name"], name="individual_program_name_idx"),
+            models.Index(fields=["program", "checksum"], name="individual_program_chk_idx"),
+            models.Index(fields=["program", "last_checked"], name="individual_program_lc_idx"),
+        ]
 
     @cached_property
     def checker(self) -> "DataChecker":
         return self.program.individual_checker
-
-    @cached_property
-    def program(self) -> "DataChecker":
-        return self.household.batch.program
-
-    @cached_property
-    def country_office(self) -> "DataChecker":
-        return self.household.batch.program.country_office
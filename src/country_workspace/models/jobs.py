@@ -1,4 +1,4 @@
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 import sentry_sdk
 from django.apps import apps
@@ -6,6 +6,9 @@ from django.db import models
 from django.utils.module_loading import import_string
 from django_celery_boost.models import CeleryTaskModel
 
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+
 
 class AsyncJob(CeleryTaskModel, models.Model):
     class JobType(models.TextChoices):
@@ -37,6 +40,23 @@ class AsyncJob(CeleryTaskModel, models.Model):
     def started(self) -> str:
         return self.task_info["started_at"]
 
+    def get_queryset(self) -> "QuerySet[Model]":
+        """Return the records selected for the job.
+
+        The selection is stored in `config` as:
+            - "filters": the query string parameters of the changelist ("select all" in the admin)
+            - "pks": the list of the selected primary keys, or "__all__" for the whole program
+        """
+        from country_workspace.workspaces.utils import get_changelist_queryset
+
+        model = apps.get_model(self.config["model_name"])
+        if "filters" in self.config:
+            return get_changelist_queryset(model, self.program, self.owner, self.config["filters"])
+        qs = model.objects.all()
+        if self.config["pks"] == "__all__":
+            return qs.filter(program=self.program)
+        return qs.filter(pk__in=self.config["pks"])
+
     def execute(self) -> Any:
         sid = None
         func: Callable[..., Any]
@@ -46,11 +66,7 @@ class AsyncJob(CeleryTaskModel, models.Model):
                 case AsyncJob.JobType.FQN:
                     return func(**self.config)
                 case AsyncJob.JobType.ACTION:
-                    model = apps.get_model(self.config["model_name"])
-                    qs = model.objects.all()
-                    if self.config["pks"] != "__all__":
-                        qs = qs.filter(pk__in=self.config["pks"])
-                    return func(qs, **self.config.get("kwargs", {}))
+                    return func(self.get_queryset(), **self.config.get("kwargs", {}))
                 case AsyncJob.JobType.TASK:
                     return func(self)
         except Exception as e:
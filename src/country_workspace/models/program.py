@@ -80,8 +80,12 @@ class Program(BaseModel):
         help_text="Checker to use with Individual's records",
     )
 
-    household_search = models.TextField(default="name", help_text="Fields to use for searches")
-    individual_search = models.TextField(default="name", help_text="Fields to use for searches")
+    household_search = models.TextField(
+        default="name", help_text="Fields to use for searches, one per line (ie. 'name' or 'flex_fields__phone_no')"
+    )
+    individual_search = models.TextField(
+        default="name", help_text="Fields to use for searches, one per line (ie. 'name' or 'flex_fields__phone_no')"
+    )
     household_columns = models.TextField(default="name\nid", help_text="Columns to display ib the Admin table")
     individual_columns = models.TextField(default="name\nid", help_text="Columns to display ib the Admin table")
     extra_fields = models.JSONField(default=dict, blank=True, null=False)
@@ -98,13 +102,25 @@ class Program(BaseModel):
     def households(self) -> "QuerySet[Household]":
         from country_workspace.models import Household
 
-        return Household.objects.filter(batch__program=self)
+        return Household.objects.filter(program=self)
 
     @property
     def individuals(self) -> "QuerySet[Individual]":
         from country_workspace.models import Individual
 
-        return Individual.objects.filter(batch__program=self)
+        return Individual.objects.filter(program=self)
+
+    def get_search_fields_for(self, m: type[Validable] | Validable) -> list[str]:
+        from country_workspace.models import Household, Individual
+        from country_workspace.workspaces.models import CountryHousehold, CountryIndividual
+
+        if isinstance(m, (Household | CountryHousehold)) or m in (Household, CountryHousehold):
+            search = self.household_search
+        elif isinstance(m, (Individual | CountryIndividual)) or m in (Individual, CountryIndividual):
+            search = self.individual_search
+        else:
+            raise ValueError(m)
+        return [f for f in (c.strip() for c in search.split("\n")) if f]
 
     def get_checker_for(self, m: type[Validable] | Validable) -> DataChecker:
         from country_workspace.models import Household, Individual
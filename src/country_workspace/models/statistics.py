@@ -0,0 +1,121 @@
+from typing import Any, Iterable
+
+from django.db import models
+from django.db.models import Count, F, Sum
+from django.db.transaction import atomic
+from django.utils import timezone
+
+from .base import BaseManager, Validable
+
+
+class StatisticsManager(BaseManager):
+    def refresh(self, batches: Iterable[int]) -> None:
+        """Recompute the counters of `batches` (primary keys).
+
+        Counters are computed with one GROUP BY for each beneficiary table, which only reads
+        the (batch, validation_status) index; all the other batches are left untouched.
+        """
+        from .batch import Batch
+        from .household import Household
+        from .individual import Individual
+
+        programs = dict(Batch.objects.filter(pk__in=set(batches)).values_list("pk", "program"))
+        if not programs:
+            return
+        rows = []
+        for target, model in ((self.model.Target.HOUSEHOLD, Household), (self.model.Target.INDIVIDUAL, Individual)):
+            counts = (
+                model._base_manager.filter(batch_id__in=programs)
+                .values_list("batch", "validation_status")
+                .annotate(count=Count("pk"))
+                .order_by()
+            )
+            rows.extend(
+                self.model(
+                    batch_id=batch_id,
+                    program_id=programs[batch_id],
+                    target=target,
+                    validation_status=status,
+                    count=count,
+                )
+                for batch_id, status, count in counts
+            )
+        with atomic():
+            self.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["batch", "target", "validation_status"],
+                update_fields=["count", "last_update"],
+            )
+            # statuses no longer present in the batches
+            self.filter(batch_id__in=programs).exclude(pk__in=[row.pk for row in rows]).delete()
+
+    def move(self, record: "Validable", previous_status: str) -> None:
+        """Move `record` from the `previous_status` counter to the counter of its current status.
+
+        Counters are updated in place, so that single record changes do not recount the batch.
+        """
+        if record.validation_status == previous_status:
+            return
+        # `Target` values are the names of the beneficiary models
+        target = record._meta.concrete_model._meta.model_name
+        counters = self.filter(batch_id=record.batch_id, target=target)
+        with atomic():
+            counters.filter(validation_status=previous_status, count__gt=0).update(
+                count=F("count") - 1, last_update=timezone.now()
+            )
+            self.bulk_create(
+                [
+                    self.model(
+                        batch_id=record.batch_id,
+                        program_id=record.program_id,
+                        target=target,
+                        validation_status=record.validation_status,
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+            counters.filter(validation_status=record.validation_status).update(
+                count=F("count") + 1, last_update=timezone.now()
+            )
+
+    def get_totals(self, **filters: Any) -> dict[str, dict[str, int]]:
+        """Return the counters matching `filters` as `{target: {validation_status: count, "total": count}}`."""
+        ret: dict[str, dict[str, int]] = {
+            target: dict.fromkeys([*Validable.ValidationStatus.values, "total"], 0)
+            for target in self.model.Target.values
+        }
+        for target, status, count in (
+            self.filter(**filters).values_list("target", "validation_status").annotate(count=Sum("count")).order_by()
+        ):
+            ret[target][status] = count
+            ret[target]["total"] += count
+        return ret
+
+
+class BatchStatistics(models.Model):
+    """Number of households and individuals of each batch, by validation status.
+
+    Rows are maintained by `BatchStatistics.objects.refresh()`, called by the imports, the
+    validation and the deletion of records, so that dashboards never count beneficiaries.
+    """
+
+    class Target(models.TextChoices):
+        HOUSEHOLD = "household", "Households"
+        INDIVIDUAL = "individual", "Individuals"
+
+    batch = models.ForeignKey("Batch", on_delete=models.CASCADE, related_name="statistics")
+    program = models.ForeignKey("Program", on_delete=models.CASCADE, related_name="statistics")
+    target = models.CharField(max_length=10, choices=Target.choices)
+    validation_status = models.CharField(max_length=10, choices=Validable.ValidationStatus.choices)
+    count = models.PositiveIntegerField(default=0)
+    last_update = models.DateTimeField(auto_now=True)
+
+    objects = StatisticsManager()
+
+    class Meta:
+        verbose_name_plural = "Batch statistics"
+        unique_together = (("batch", "target", "validation_status"),)
+
+    def __str__(self) -> str:
+        return f"{self.batch_id} {self.target} {self.validation_status}: {self.count}"
@@ -39,7 +39,7 @@ class State(local):
             setattr(self, k, v)
 
     @contextlib.contextmanager
-    def set(self, **kwargs: "dict[str,Any]") -> "Iterator[None]":
+    def set(self, **kwargs: "Any") -> "Iterator[None]":
         pre = {}
         for k, v in kwargs.items():
             if hasattr(self, k):
@@ -3,9 +3,11 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 import sentry_sdk
+from django.apps import apps
 from django.core.cache import cache
 from redis_lock import Lock
 
+from country_workspace.cache.manager import cache_manager
 from country_workspace.config.celery import app
 from country_workspace.models import AsyncJob
 
@@ -49,7 +51,8 @@ def sync_job_task(pk: int, version: int) -> dict[str, Any]:
             sentry_sdk.set_tag("business_area", job.program.country_office.slug)
             sentry_sdk.set_tag("project", job.program.name)
             sentry_sdk.set_user = {"id": job.owner.pk, "email": job.owner.email}
-            return job.execute()
+            with cache_manager.deferred_invalidation():
+                return job.execute()
         except Exception:
             # error is logged in job.execute
             raise
@@ -57,6 +60,20 @@ def sync_job_task(pk: int, version: int) -> dict[str, Any]:
             scope.clear()
 
 
+@app.task()
+def validate_records_task(
+    model_name: str,
+    pks: list[int],
+    group_only: bool = False,
+    program_errors: dict[str, list[Any]] | None = None,
+) -> dict[str, Any]:
+    from country_workspace.workspaces.admin.cleaners.validate import validate_records
+
+    # JSON serialization turns the primary keys into strings
+    errors = None if program_errors is None else {int(pk): e for pk, e in program_errors.items()}
+    return validate_records(apps.get_model(model_name), pks, group_only, errors)
+
+
 @app.task()
 def removed_expired_jobs(**kwargs: Any) -> None:
     AsyncJob.objects.filter(**kwargs).delete()
@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING, Any
+
+from country_workspace.cache.manager import cache_manager
+from country_workspace.state import state
+
+if TYPE_CHECKING:
+    from country_workspace.models import Batch, Program
+
+
+def get_error_report(program: "Program", batch: "Batch | None" = None) -> dict[str, list[dict[str, Any]]]:
+    """Return the error reports of the households and individuals of `program` (or of `batch` only).
+
+    Reports are cached until any household or individual of the program changes.
+    """
+    from country_workspace.models import BatchStatistics, Household, Individual
+
+    with state.set(tenant=program.country_office, program=program):
+        key = cache_manager.build_key(
+            "errors", str(batch.pk if batch else "-"), namespaces=cache_manager.get_dependencies(Household)
+        )
+    if (report := cache_manager.retrieve(key)) is None:
+        report = {}
+        for target, model in (
+            (BatchStatistics.Target.HOUSEHOLD, Household),
+            (BatchStatistics.Target.INDIVIDUAL, Individual),
+        ):
+            queryset = model.objects.filter(program=program, validation_status=model.ValidationStatus.INVALID)
+            if batch:
+                queryset = queryset.filter(batch=batch)
+            report[str(target)] = queryset.get_error_report()
+        cache_manager.store(key, report)
+    return report
@@ -1,4 +1,8 @@
+from contextlib import suppress
 from functools import reduce
+from typing import Any, Iterable
+
+from django.db.models import Q
 
 
 def clean_field_name(v: str) -> str:
@@ -13,3 +17,32 @@ def clean_field_name(v: str) -> str:
     """
     to_remove = ("_h_c", "_h_f", "_i_c", "_i_f")
     return reduce(lambda name, substr: name.replace(substr, ""), to_remove, v.lower())
+
+
+def get_search_filter(search_fields: Iterable[str], search_term: str) -> Q:
+    """Build the filter matching `search_term` against the configured search fields.
+
+    `flex_fields__<key>` entries match the exact value of the key using JSON containment,
+    so that they can use the GIN index on `flex_fields` (numeric terms match numbers too).
+    Any other entry is a concrete field, matched with `icontains` (trigram indexed).
+
+    Args:
+        search_fields (Iterable[str]): The fields to search, ie. `Program.household_search` lines.
+        search_term (str): The term to look for.
+
+    Returns:
+        Q: The filter to apply to the queryset.
+
+    """
+    values: list[Any] = [search_term]
+    with suppress(ValueError):
+        values.append(int(search_term))
+    q = Q()
+    for field in search_fields:
+        if field.startswith("flex_fields__"):
+            key = field.removeprefix("flex_fields__")
+            for value in values:
+                q |= Q(flex_fields__contains={key: value})
+        else:
+            q |= Q(**{f"{field}__icontains": search_term})
+    return q
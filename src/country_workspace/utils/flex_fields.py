@@ -1,19 +1,137 @@
+import copy
 import hashlib
 import json
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any, Callable
 
-from hope_flex_fields.models import DataChecker
+from constance import config
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import Expression, Func, JSONField, TextField, Value
+from django.db.models.functions import Cast
+
+from hope_flex_fields.models import DataChecker, Fieldset, FlexField
+
+from country_workspace.cache.manager import cache_manager
+from country_workspace.validators.columnar import ColumnarValidator
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from hope_flex_fields.forms import FlexForm
+
     from country_workspace.models.base import Validable
 
 
-def get_checker_fields(checker: DataChecker) -> tuple[str, str]:
+class CheckerRegistry:
+    """Process-local registry of what is compiled from the `DataChecker` configuration.
+
+    Form classes, field lists and fingerprints are built once per checker and reused until
+    a DataChecker, Fieldset, FlexField or FieldDefinition is saved or deleted, which bumps
+    the "checkers" cache version (see `cache.handlers`).
+    """
+
+    namespace = "checkers"
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[int, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_version(self) -> int:
+        return cache_manager.get_cache_version(namespace=self.namespace)
+
+    def _get(self, checker: DataChecker, name: str, loader: Callable[[], Any]) -> Any:
+        version = self.get_version()
+        with self._lock:
+            cached_version, entries = self._entries.get(checker.pk, (None, {}))
+            if cached_version != version:
+                entries = {}
+                self._entries[checker.pk] = (version, entries)
+        if name not in entries:
+            entries[name] = loader()
+        return entries[name]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_checker(self, checker: DataChecker) -> DataChecker:
+        """Return a copy of `checker` that validates using the compiled form class."""
+        compiled = self._get(checker, "checker", lambda: self._compile(checker.pk))
+        return copy.copy(compiled)
+
+    def _compile(self, pk: int) -> DataChecker:
+        checker = DataChecker.objects.get(pk=pk)
+        form_class = checker.get_form_class()
+        checker.get_form_class = lambda: form_class
+        return checker
+
+    def get_form_class(self, checker: DataChecker) -> "type[FlexForm]":
+        return self.get_checker(checker).get_form_class()
+
+    def get_fields(self, checker: DataChecker) -> list[tuple[str, str]]:
+        return self._get(checker, "fields", lambda: list(_get_checker_fields(checker)))
+
+    def get_checker_version(self, checker: DataChecker) -> str:
+        return self._get(checker, "version", lambda: _get_checker_version(checker))
+
+    def get_columnar_validator(self, checker: DataChecker) -> ColumnarValidator:
+        return self._get(checker, "columnar", lambda: ColumnarValidator(self.get_form_class(checker)))
+
+    def validate(
+        self, checker: DataChecker, data: list[dict[str, Any]], fast_path: bool | None = None, **kwargs: Any
+    ) -> dict[int, Any]:
+        """Validate `data` like `checker.validate()`.
+
+        With `fast_path` (default to `config.VALIDATION_FAST_PATH`) only the records the
+        columnar validator cannot decide are validated by the checker forms.
+        """
+        if fast_path is None:
+            fast_path = config.VALIDATION_FAST_PATH
+        compiled = self.get_checker(checker)
+        if kwargs or not fast_path or compiled._primary_key_field_name or compiled._master_fieldset:
+            return compiled.validate(data, **kwargs)
+        return self.get_columnar_validator(checker).validate(data, compiled.validate)
+
+
+checker_registry = CheckerRegistry()
+
+
+def _get_checker_fields(checker: DataChecker) -> "Iterator[tuple[str, str]]":
     for fs in checker.members.select_related("fieldset").all():
         for field in fs.fieldset.get_fields():
             yield field.name, (field.attrs.get("label", field.name) or field.name)
 
 
+def get_checker_fields(checker: DataChecker) -> list[tuple[str, str]]:
+    return checker_registry.get_fields(checker)
+
+
+def get_checker_version(checker: DataChecker) -> str:
+    """Fingerprint of the checker configuration.
+
+    It changes whenever the checker, its fieldsets (including the extended ones), their fields
+    or the field definitions are added, removed or modified.
+    """
+    return checker_registry.get_checker_version(checker)
+
+
+def _get_checker_version(checker: DataChecker) -> str:
+    members = list(checker.members.order_by("pk").values_list("pk", "fieldset_id", "last_modified"))
+    fieldset_ids = {m[1] for m in members}
+    fieldsets = []
+    while to_fetch := fieldset_ids.difference(fs[0] for fs in fieldsets):
+        fieldsets.extend(Fieldset.objects.filter(pk__in=to_fetch).values_list("pk", "extends_id", "last_modified"))
+        fieldset_ids.update(fs[1] for fs in fieldsets if fs[1])
+    fields = FlexField.objects.filter(fieldset__in=fieldset_ids).order_by("pk")
+    data = [
+        checker.pk,
+        checker.last_modified,
+        members,
+        sorted(fieldsets),
+        list(fields.values_list("pk", "last_modified", "definition_id", "definition__last_modified")),
+    ]
+    return hashlib.md5(str(data).encode("utf-8")).hexdigest()  # noqa: S324
+
+
 def get_obj_checksum(obj: "Validable") -> str:
     h = hashlib.new("md5")  # noqa: S324
     data = json.dumps(obj.flex_fields, sort_keys=True).encode("utf-8")
@@ -21,3 +139,39 @@ def get_obj_checksum(obj: "Validable") -> str:
     if obj.flex_files:
         h.update(obj.flex_files[:8192])  # is this enough ?
     return h.hexdigest()
+
+
+def jsonb_value(value: Any) -> Expression:
+    """Return `value` as a `jsonb` SQL expression. `None` is stored as JSON `null`, not as SQL NULL."""
+    if value is None:
+        return Cast(Value("null"), output_field=JSONField())
+    return Value(value, output_field=JSONField())
+
+
+class JSONBSet(Func):
+    """`jsonb_set()`: set the top level `key` of a jsonb column to `new_value`.
+
+    Usage: Household.objects.update(flex_fields=JSONBSet("flex_fields", "name", jsonb_value("John")))
+    """
+
+    function = "jsonb_set"
+    output_field = JSONField()
+
+    def __init__(
+        self, expression: Any, key: str, new_value: Expression, create_missing: bool = True, **extra: Any
+    ) -> None:
+        path = Value([key], output_field=ArrayField(TextField()))
+        super().__init__(expression, path, new_value, Value(create_missing), **extra)
+
+
+class RegexpReplace(Func):
+    """`regexp_replace()`: replace the substrings of `expression` that match the POSIX regex `pattern`."""
+
+    function = "regexp_replace"
+    output_field = TextField()
+
+    def __init__(self, expression: Any, pattern: str, replacement: str, flags: str = "", **extra: Any) -> None:
+        args = [expression, Value(pattern), Value(replacement)]
+        if flags:
+            args.append(Value(flags))
+        super().__init__(*args, **extra)
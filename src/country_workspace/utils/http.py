@@ -1,15 +1,25 @@
-from typing import TYPE_CHECKING, Any, Sequence
-from urllib.parse import urljoin
+import functools
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, TypeVar
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
+import requests
 from django.conf import settings
 from django.http.request import split_domain_port
 from django.urls import reverse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..state import state
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
 
+T = TypeVar("T")
+
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
 
 def get_server_host(request: "HttpRequest | None" = None) -> str:
     req: HttpRequest | None = request or state.request
@@ -56,3 +66,51 @@ def get_client_ip() -> str:
     else:
         ip = state.request.META.get("REMOTE_ADDR")
     return ip.strip()
+
+
+@functools.cache
+def get_session(retries: int = 3, backoff_factor: float = 0.5, pool_size: int = 10) -> requests.Session:
+    """Return a process-wide `requests.Session` with keep-alive connection pooling and retry/backoff."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=("GET",),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def prefetch(iterator: Iterator[T]) -> Iterator[T]:
+    """Consume `iterator` in a background thread, always one item ahead of the caller."""
+    end = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, end)
+        while (item := future.result()) is not end:
+            future = executor.submit(next, iterator, end)
+            yield item
+
+
+def get_remaining_page_urls(next_url: str, count: int, page_size: int) -> list[str]:
+    """Return the urls of all the pages following (and including) `next_url`.
+
+    Works with both `page=` and `limit=/offset=` paginations. Returns an empty list if
+    `next_url` does not use any of them.
+    """
+    parts = urlsplit(next_url)
+    query = dict(parse_qsl(parts.query))
+    if not page_size:
+        return []
+    if "page" in query:
+        first = int(query["page"])
+        pages = [{**query, "page": str(page)} for page in range(first, math.ceil(count / page_size) + 1)]
+    elif "offset" in query:
+        limit = int(query.get("limit", page_size))
+        pages = [{**query, "offset": str(offset)} for offset in range(int(query["offset"]), count, limit)]
+    else:
+        return []
+    return [urlunsplit(parts._replace(query=urlencode(page))) for page in pages]
@@ -0,0 +1,91 @@
+import hashlib
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.db import connection
+from django.db.models import F, Index
+from django.db.models.fields.json import KeyTransform
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from country_workspace.models import AsyncJob, Program
+
+# all the indexes managed here start with this prefix
+INDEX_PREFIX = "cw_ff_"
+
+
+def get_index_name(model: "type[Model]", key: str) -> str:
+    # the columns are part of the hash, so that indexes with a different definition get a new name
+    digest = hashlib.md5(f"program,{key}".encode()).hexdigest()[:12]  # noqa: S324
+    return "%s%s_%s" % (INDEX_PREFIX, str(model._meta.model_name)[:3], digest)
+
+
+def get_program_columns(program: "Program") -> "dict[type[Model], set[str]]":
+    """Return the `flex_fields` keys configured as columns of the program changelists."""
+    from country_workspace.models import Household, Individual
+
+    ret: dict[type[Model], set[str]] = {}
+    for model, columns in ((Household, program.household_columns), (Individual, program.individual_columns)):
+        ret[model] = {
+            c.strip().removeprefix("flex_fields__")
+            for c in columns.split("\n")
+            if c.strip().startswith("flex_fields__")
+        }
+    return ret
+
+
+def get_flex_field_indexes(programs: "Iterable[Program]") -> "dict[type[Model], dict[str, Index]]":
+    """Return the expression indexes, by name, needed to sort and filter the configured columns.
+
+    Indexes are on `(program_id, (flex_fields -> 'key'))`: the expression is the one the ORM
+    uses for `order_by("flex_fields__key")` and `filter(flex_fields__key=...)`, and changelists
+    always filter by program, so each program scans only its own entries. Partial indexes
+    (one for each program) are not used, the same key is often configured by many programs.
+    """
+    ret: dict[type[Model], dict[str, Index]] = {}
+    for program in programs:
+        for model, keys in get_program_columns(program).items():
+            for key in keys:
+                name = get_index_name(model, key)
+                ret.setdefault(model, {})[name] = Index(F("program"), KeyTransform(key, "flex_fields"), name=name)
+    return ret
+
+
+def get_existing_indexes(model: "type[Model]") -> set[str]:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return {name for name, info in constraints.items() if info["index"] and name.startswith(INDEX_PREFIX)}
+
+
+def sync_flex_field_indexes(programs: "Iterable[Program]", drop_unused: bool = False) -> dict[str, list[str]]:
+    """Create the missing indexes for the columns of `programs`.
+
+    If `drop_unused`, managed indexes not needed by `programs` are dropped, so `programs`
+    must contain all the programs. Outside transactions indexes are built CONCURRENTLY.
+    """
+    from country_workspace.models import Household, Individual
+
+    concurrently = not connection.in_atomic_block
+    wanted = get_flex_field_indexes(programs)
+    ret: dict[str, list[str]] = {"created": [], "dropped": []}
+    with connection.schema_editor(atomic=False) as editor:
+        for model in (Household, Individual):
+            indexes = wanted.get(model, {})
+            existing = get_existing_indexes(model)
+            for name, index in indexes.items():
+                if name not in existing:
+                    editor.execute(index.create_sql(model, editor, concurrently=concurrently), params=None)
+                    ret["created"].append(name)
+            if drop_unused:
+                for name in existing - set(indexes):
+                    editor.execute(
+                        Index(fields=["id"], name=name).remove_sql(model, editor, concurrently=concurrently),
+                        params=None,
+                    )
+                    ret["dropped"].append(name)
+    return ret
+
+
+def sync_program_indexes(job: "AsyncJob") -> dict[str, Any]:
+    """AsyncJob entry point: create the indexes for the columns of `job.program`."""
+    return sync_flex_field_indexes([job.program])
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
     from country_workspace.models import Household, Program
 
 
@@ -8,5 +10,26 @@ class BeneficiaryGroupValidator:
     def __init__(self, program: "Program") -> None:
         self.program = program
 
-    def validate(self, hh: "Household") -> list:
+    def validate(self, hh: "Household") -> list[str]:
         return []
+
+    def get_program_errors(self, households: "QuerySet[Household] | None" = None) -> dict[int, list[str]] | None:
+        """Return the errors that depend on all the households of the programme, keyed by primary key.
+
+        Only the errors of `households` are returned, if given. None means that the validator
+        has no programme-wide rule. The result does not depend on the households validated
+        together, so a validation run can compute it once and pass it to `validate_households()`.
+        """
+        return None
+
+    def validate_households(
+        self, households: "QuerySet[Household]", program_errors: dict[int, list[str]] | None = None
+    ) -> dict[int, list[str]]:
+        """Return the errors of `households` (of `self.program`), keyed by primary key.
+
+        Households without errors are omitted. By default each household is validated by
+        `validate()`; override it with set-based queries to validate any number of households
+        with a fixed number of statements. `program_errors` is the result of `get_program_errors()`,
+        if already computed.
+        """
+        return {hh.pk: errors for hh in households if (errors := self.validate(hh))}
@@ -0,0 +1,159 @@
+import datetime
+import math
+import re
+from typing import TYPE_CHECKING, Any, Callable
+
+from django import forms
+from django.core import validators as core_validators
+from django.core.exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from hope_flex_fields.forms import FlexForm
+
+Row = dict[str, Any]
+Check = Callable[[Any], bool]
+
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class UndecidedError(Exception):
+    """The fast path cannot parse the value, the field must clean it."""
+
+
+def _parse_char(field: forms.CharField, value: Any) -> str:
+    if not isinstance(value, str):
+        raise UndecidedError
+    return value.strip() if field.strip else value
+
+
+def _parse_int(field: forms.IntegerField, value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise UndecidedError
+
+
+def _parse_float(field: forms.FloatField, value: Any) -> float:
+    if isinstance(value, int | float) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    raise UndecidedError
+
+
+def _parse_bool(field: forms.BooleanField, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    raise UndecidedError
+
+
+def _parse_choice(field: forms.ChoiceField, value: Any) -> str:
+    if value in field.empty_values:
+        return ""
+    if isinstance(value, str | int) and not isinstance(value, bool):
+        return str(value)
+    raise UndecidedError
+
+
+def _parse_date(field: forms.DateField, value: Any) -> datetime.date:
+    if isinstance(value, str) and ISO_DATE.match(value := value.strip()):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            raise UndecidedError
+    raise UndecidedError
+
+
+# parsers for the field types whose `to_python()` can be reproduced exactly on JSON values
+PARSERS: dict[type[forms.Field], Callable[[Any, Any], Any]] = {
+    forms.CharField: _parse_char,
+    forms.IntegerField: _parse_int,
+    forms.FloatField: _parse_float,
+    forms.BooleanField: _parse_bool,
+    forms.ChoiceField: _parse_choice,
+    forms.DateField: _parse_date,
+}
+
+
+def _clean(field: forms.Field, value: Any) -> bool:
+    try:
+        field.clean(value)
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+def _get_choices(field: forms.ChoiceField) -> set[str]:
+    ret = set()
+    for k, v in field.choices:
+        if isinstance(v, list | tuple):
+            ret.update(str(k2) for k2, __ in v)
+        else:
+            ret.add(str(k))
+    return ret
+
+
+def get_check(field: forms.Field) -> Check:
+    """Return a function that tells whether a value is certainly accepted by `field`.
+
+    Common field types are checked without calling `field.clean()`, all the others
+    (and the values the parser cannot handle) go through `field.clean()`.
+    """
+    # flex fields are created as `type(name, (FlexFormMixin, field_type), ...)`
+    parser = PARSERS.get(type(field).__bases__[-1])
+    if parser is None or any(type(v).__module__ != core_validators.__name__ for v in field.validators):
+        return lambda value: _clean(field, value)
+    choices = _get_choices(field) if isinstance(field, forms.ChoiceField) else None
+    is_bool = isinstance(field, forms.BooleanField)
+
+    def check(value: Any) -> bool:
+        try:
+            value = parser(field, value)
+        except UndecidedError:
+            return _clean(field, value)
+        if value in field.empty_values or (is_bool and not value):
+            return not field.required
+        if choices is not None and value not in choices:
+            return False
+        try:
+            for validator in field.validators:
+                validator(value)
+        except ValidationError:
+            return False
+        return True
+
+    return check
+
+
+class ColumnarValidator:
+    """Validate a chunk of records column by column, without instantiating one form per record.
+
+    Each column is checked with `get_check()`; only the records with at least one value that
+    is not certainly valid are validated by `fallback` (ie. `DataChecker.validate()`), so the
+    returned errors are exactly the ones `DataChecker.validate()` would return.
+    """
+
+    def __init__(self, form_class: "type[FlexForm]") -> None:
+        self.fields = form_class.base_fields
+        # parent/child fields change their choices for each record
+        self.supported = not any(
+            field.disabled
+            or (getattr(getattr(field, "flex_field", None), "master", None) and hasattr(field, "validate_with_parent"))
+            for field in self.fields.values()
+        )
+        self.checks = {name: get_check(field) for name, field in self.fields.items()} if self.supported else {}
+
+    def validate(self, data: list[Row], fallback: Callable[[list[Row]], dict[int, Any]]) -> dict[int, Any]:
+        """Return the errors of `data` keyed by record position (1 based), like `DataChecker.validate()`."""
+        rows = list(data)
+        if not self.supported:
+            return fallback(rows)
+        valid = [True] * len(rows)
+        for name, field in self.fields.items():
+            check = self.checks[name]
+            column = [field.widget.value_from_datadict(row, {}, name) for row in rows]
+            for i, value in enumerate(column):
+                if valid[i] and not check(value):
+                    valid[i] = False
+        undecided = [i for i, ok in enumerate(valid) if not ok]
+        if not undecided:
+            return {}
+        errors = fallback([rows[i] for i in undecided])
+        return {undecided[pos - 1] + 1: error for pos, error in errors.items()}
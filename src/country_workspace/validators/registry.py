@@ -1,10 +1,20 @@
+from typing import TYPE_CHECKING
+
 from strategy_field.registry import Registry
 
 from country_workspace.validators.base import BeneficiaryGroupValidator
 
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from country_workspace.models import Household
+
 
 class NoopValidator(BeneficiaryGroupValidator):
-    pass
+    def validate_households(
+        self, households: "QuerySet[Household]", program_errors: dict[int, list[str]] | None = None
+    ) -> dict[int, list[str]]:
+        return {}
 
 
 class BeneficiaryValidatorRegistry(Registry):
@@ -6,6 +6,7 @@ from django.http import HttpRequest
 from django.urls import reverse
 
 from ...state import state
+from ...utils.fields import get_search_filter
 from ..models import CountryBatch
 from ..options import WorkspaceModelAdmin
 from ..sites import workspace
@@ -24,7 +25,7 @@ class ProgramBatchFilter(CWLinkedAutoCompleteFilter):
 @register(CountryBatch, site=workspace)
 class CountryBatchAdmin(SelectedProgramMixin, WorkspaceModelAdmin):
     list_display = ["import_date", "name", "imported_by", "source"]
-    search_fields = ("label",)
+    search_fields = ("name",)
     change_list_template = "workspace/change_list.html"
     change_form_template = "workspace/change_form.html"
     ordering = ("name",)
@@ -35,6 +36,8 @@ class CountryBatchAdmin(SelectedProgramMixin, WorkspaceModelAdmin):
         self, request: HttpRequest, queryset: QuerySet[CountryBatch], search_term: str
     ) -> tuple[QuerySet[CountryBatch], bool]:
         queryset = self.model.objects.filter(program=state.program)
+        if search_term := search_term.strip():
+            queryset = queryset.filter(get_search_filter(self.search_fields, search_term))
         return queryset, False
 
     def get_queryset(self, request: HttpRequest) -> "QuerySet[CountryBatch]":
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.contrib import admin, messages
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
@@ -9,10 +9,11 @@ from strategy_field.utils import fqn
 from .bulk_update import BulkUpdateForm, bulk_update_export_template
 from .calculate_checksum import calculate_checksum_impl
 from .mass_update import MassUpdateForm, mass_update_impl
-from .regex import RegexUpdateForm, regex_update_impl
+from .regex import RegexUpdateForm, regex_update_impl, regex_update_preview
 from .validate import validate_queryset
 from country_workspace.models import AsyncJob
 from country_workspace.state import state
+from country_workspace.workspaces.utils import get_changelist_filters
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -21,26 +22,60 @@ if TYPE_CHECKING:
     from country_workspace.workspaces.admin.hh_ind import BeneficiaryBaseAdmin
 
 
-@admin.action(description="Validate selected records", permissions=["validate"])
-def validate_records(
+def get_selection_config(request: HttpRequest, queryset: "QuerySet[Beneficiary]") -> dict[str, Any]:
+    """Describe the records selected in the changelist, to be stored in `AsyncJob.config`.
+
+    When "select all" is used, the changelist filters are stored instead of the
+    (potentially huge) list of primary keys, see `AsyncJob.get_queryset()`.
+    """
+    selection: dict[str, Any] = {"model_name": queryset.model._meta.label}
+    if request.POST.get("select_across") in ("1", "True"):
+        selection["filters"] = get_changelist_filters(request)
+    else:
+        selection["pks"] = list(queryset.values_list("pk", flat=True))
+    return selection
+
+
+def _validate(
     model_admin: "BeneficiaryBaseAdmin",
     request: HttpRequest,
     queryset: "QuerySet[Beneficiary]",
-) -> None:
-    opts = queryset.model._meta
+    changed_only: bool = False,
+) -> AsyncJob:
     job = AsyncJob.objects.create(
         description="Validate Queryset records for updates",
         type=AsyncJob.JobType.ACTION,
         owner=state.request.user,
         action=fqn(validate_queryset),
         program=state.program,
-        config={"pks": list(queryset.values_list("pk", flat=True)), "model_name": opts.label},
+        config={
+            **get_selection_config(request, queryset),
+            "kwargs": {"changed_only": changed_only},
+        },
     )
     job.queue()
     model_admin.message_user(request, "Task scheduled", messages.SUCCESS)
     return job
 
 
+@admin.action(description="Validate selected records", permissions=["validate"])
+def validate_records(
+    model_admin: "BeneficiaryBaseAdmin",
+    request: HttpRequest,
+    queryset: "QuerySet[Beneficiary]",
+) -> None:
+    _validate(model_admin, request, queryset)
+
+
+@admin.action(description="Validate selected records (changed only)", permissions=["validate"])
+def validate_changed_records(
+    model_admin: "BeneficiaryBaseAdmin",
+    request: HttpRequest,
+    queryset: "QuerySet[Beneficiary]",
+) -> None:
+    _validate(model_admin, request, queryset, changed_only=True)
+
+
 @admin.action(description="Mass update record fields", permissions=["mass_update"])
 def mass_update(
     model_admin: "BeneficiaryBaseAdmin",
@@ -54,8 +89,6 @@ def mass_update(
     ctx["form"] = form
 
     if "_apply" in request.POST and form.is_valid():
-        opts = queryset.model._meta
-
         job = AsyncJob.objects.create(
             description="Mass update record fields",
             type=AsyncJob.JobType.ACTION,
@@ -63,8 +96,7 @@ def mass_update(
             action=fqn(mass_update_impl),
             program=state.program,
             config={
-                "pks": list(queryset.values_list("pk", flat=True)),
-                "model_name": opts.label,
+                **get_selection_config(request, queryset),
                 "kwargs": {
                     "config": form.get_selected(),
                     "create_missing_fields": form.cleaned_data["_create_missing_fields"],
@@ -90,13 +122,11 @@ def regex_update(
     if "_preview" in request.POST:
         form = RegexUpdateForm(request.POST, checker=checker)
         if form.is_valid():
-            changes = regex_update_impl(queryset.all()[:10], form.cleaned_data, save=False)
+            changes = regex_update_preview(queryset, form.cleaned_data)
             ctx["changes"] = changes
     elif "_apply" in request.POST:
         form = RegexUpdateForm(request.POST, checker=checker)
         if form.is_valid():
-            opts = queryset.model._meta
-
             job = AsyncJob.objects.create(
                 description="Mass update record fields",
                 type=AsyncJob.JobType.ACTION,
@@ -104,8 +134,7 @@ def regex_update(
                 action=fqn(regex_update_impl),
                 program=state.program,
                 config={
-                    "pks": list(queryset.values_list("pk", flat=True)),
-                    "model_name": opts.label,
+                    **get_selection_config(request, queryset),
                     "kwargs": {"config": form.cleaned_data},
                 },
             )
@@ -138,7 +167,6 @@ def bulk_update_export(
     ctx["form"] = form
     if "_export" in request.POST and form.is_valid():
         columns = {"fields": ["id"] + sorted(form.cleaned_data["fields"])}
-        opts = queryset.model._meta
         job = AsyncJob.objects.create(
             description="Mass update record fields",
             type=AsyncJob.JobType.TASK,
@@ -146,9 +174,9 @@ def bulk_update_export(
             action=fqn(bulk_update_export_template),
             program=state.program,
             config={
-                "pks": list(queryset.values_list("pk", flat=True)),
-                "model_name": opts.label,
+                **get_selection_config(request, queryset),
                 "columns": columns,
+                "format": form.cleaned_data["format"] or "xlsx",
             },
         )
         job.queue()
@@ -164,17 +192,13 @@ def calculate_checksum(
     request: HttpRequest,
     queryset: "QuerySet[Beneficiary]",
 ) -> HttpResponse:
-    opts = queryset.model._meta
     job = AsyncJob.objects.create(
         description="Calculate record checksum",
         type=AsyncJob.JobType.ACTION,
         owner=state.request.user,
         action=fqn(calculate_checksum_impl),
         program=state.program,
-        config={
-            "pks": list(queryset.values_list("pk", flat=True)),
-            "model_name": opts.label,
-        },
+        config=get_selection_config(request, queryset),
     )
     job.queue()
     model_admin.message_user(request, "Task scheduled", messages.SUCCESS)
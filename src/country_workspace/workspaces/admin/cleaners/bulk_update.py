@@ -1,33 +1,61 @@
+import csv
 import io
-from io import BytesIO
-from typing import TYPE_CHECKING, Any
+import json
+import tempfile
+from importlib.util import find_spec
+from itertools import batched
+from typing import IO, TYPE_CHECKING, Any, cast
 
+import dictdiffer
 from django import forms
-from django.apps import apps
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
 from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.transaction import atomic
+from django.utils import timezone
 from xlsxwriter import Workbook
 
 from hope_flex_fields.models import DataChecker, FlexField
 from hope_flex_fields.xlsx import get_format_for_field
 from hope_smart_import.readers import open_xls
 
-from country_workspace.models import AsyncJob, Program
+from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
+from country_workspace.models import AsyncJob, BatchStatistics, Program
+from country_workspace.models.base import Validable
+from country_workspace.utils.flex_fields import checker_registry, get_checker_version, get_obj_checksum
 from country_workspace.workspaces.admin.cleaners.base import BaseActionForm
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
     from django.db.models import QuerySet
 
     from country_workspace.types import Beneficiary
 
 
+def get_export_formats() -> list[tuple[str, str]]:
+    """Return the available export formats. Parquet requires the optional `pyarrow` ("parquet" extra)."""
+    formats = [("xlsx", "XLSX"), ("csv", "CSV")]
+    if find_spec("pyarrow"):
+        formats.append(("parquet", "Parquet"))
+    return formats
+
+
 class BulkUpdateForm(BaseActionForm):
     fields = forms.MultipleChoiceField(choices=[], widget=forms.CheckboxSelectMultiple())
+    format = forms.ChoiceField(
+        choices=get_export_formats,
+        initial="xlsx",
+        required=False,
+        help_text="Only XLSX files can be used to import the updates. CSV and Parquet are meant for large exports",
+    )
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         checker: "DataChecker" = kwargs.pop("checker")
         super().__init__(*args, **kwargs)
-        self.fields["fields"].choices = [(name, name) for name, fld in checker.get_form()().fields.items()]
+        self.fields["fields"].choices = [(name, name) for name in checker_registry.get_form_class(checker).base_fields]
 
 
 """
@@ -118,23 +146,46 @@ def get_validation_for_field(fld: "FlexField") -> dict[str, Any]:
     return validate()
 
 
-def dc_get_field(dc: "DataChecker", name: str) -> "FlexField | None":
-    for fs in dc.members.all():
-        for field in fs.fieldset.fields.filter():
-            if field.name == name:
-                return field
-    return None
+def get_field_map(dc: "DataChecker") -> dict[str, "FlexField"]:
+    """Return all the checker fields by name; the first fieldset member (by pk) defining a name wins."""
+    fieldset_ids = list(dc.members.order_by("pk").values_list("fieldset_id", flat=True))
+    by_fieldset: dict[int, list[FlexField]] = {}
+    for field in FlexField.objects.filter(fieldset__in=fieldset_ids).select_related("definition").order_by("pk"):
+        by_fieldset.setdefault(field.fieldset_id, []).append(field)
+    ret: dict[str, FlexField] = {}
+    for fieldset_id in fieldset_ids:
+        for field in by_fieldset.get(fieldset_id, []):
+            ret.setdefault(field.name, field)
+    return ret
+
+
+def iter_rows(
+    queryset: "QuerySet[Beneficiary]", columns: list[str], chunk_size: int = CHUNK_SIZE_DEFAULT
+) -> "Iterator[list[Any]]":
+    """Stream the values of `columns`, either model fields or `flex_fields` keys, without building model instances."""
+    model_fields = {f.attname for f in queryset.model._meta.concrete_fields} - {"flex_fields"}
+    attrs = [c for c in columns if c in model_fields]
+    positions = {c: i for i, c in enumerate(attrs, 1)}
+    for values in queryset.values_list("flex_fields", *attrs).iterator(chunk_size=chunk_size):
+        yield [values[positions[c]] if c in positions else values[0].get(c) for c in columns]
 
 
 def create_xls_importer(
     queryset: "QuerySet[Beneficiary]",
     program: Program,
     columns: list[str],
-) -> [io.BytesIO, Workbook]:
-    out = BytesIO()
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+) -> "tuple[IO[bytes], Workbook]":
+    """Create the XLSX template used for bulk updates.
+
+    The workbook is written row by row (`constant_memory`) to a temporary file,
+    that is returned rewound and must be closed by the caller.
+    """
+    out = tempfile.TemporaryFile()  # noqa: SIM115 - returned to the caller
     dc: DataChecker = program.get_checker_for(queryset.model)
+    fields = get_field_map(dc)
 
-    workbook = Workbook(out, {"in_memory": True, "default_date_format": "yyyy/mm/dd"})
+    workbook = Workbook(out, {"constant_memory": True, "default_date_format": "yyyy/mm/dd"})
 
     header_format = workbook.add_format(
         {
@@ -157,8 +208,7 @@ def create_xls_importer(
     worksheet.unprotect_range("B1:ZZ999", None)
 
     for i, fld_name in enumerate(columns):
-        fld = dc_get_field(dc, fld_name)
-        if fld:
+        if fld := fields.get(fld_name):
             worksheet.write(0, i, fld.name, header_format)
             f = None
             if fmt := get_format_for_field(fld):
@@ -170,48 +220,158 @@ def create_xls_importer(
             worksheet.write(0, i, fld_name, header_format)
     worksheet.freeze_panes(1, 0)
 
-    for row, record in enumerate(queryset, 1):
-        for col, fld in enumerate(columns):
-            worksheet.write(row, col, getattr(record, fld, record.flex_fields.get(fld)))
+    for row, values in enumerate(iter_rows(queryset, columns, chunk_size), 1):
+        worksheet.write_row(row, 0, values)
 
     workbook.close()
     out.seek(0)
     return out, workbook
 
 
+def create_csv_export(
+    queryset: "QuerySet[Beneficiary]", columns: list[str], chunk_size: int = CHUNK_SIZE_DEFAULT
+) -> "IO[bytes]":
+    """Stream `columns` to a CSV temporary file, that is returned rewound and must be closed by the caller."""
+    out = tempfile.TemporaryFile()  # noqa: SIM115 - returned to the caller
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    writer.writerows(iter_rows(queryset, columns, chunk_size))
+    text.flush()
+    text.detach()
+    out.seek(0)
+    return out
+
+
+def create_parquet_export(
+    queryset: "QuerySet[Beneficiary]", columns: list[str], chunk_size: int = CHUNK_SIZE_DEFAULT
+) -> "IO[bytes]":
+    """Stream `columns` to a Parquet temporary file, one row group per chunk. Values are stored as strings.
+
+    Requires `pyarrow`, installed with the "parquet" extra.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImproperlyConfigured("Parquet export requires 'pyarrow' to be installed")
+
+    def to_str(value: Any) -> str | None:
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value, cls=DjangoJSONEncoder)
+
+    schema = pa.schema([(c, pa.string()) for c in columns])
+    out = tempfile.TemporaryFile()  # noqa: SIM115 - returned to the caller
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in batched(iter_rows(queryset, columns, chunk_size), chunk_size):
+            data = {c: [to_str(row[i]) for row in rows] for i, c in enumerate(columns)}
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+    out.seek(0)
+    return out
+
+
 # def bulk_update_export_template(queryset, program_pk: str, columns: list[str], filename: str) -> bytes:
-def bulk_update_export_template(job: AsyncJob) -> bytes:
-    model = apps.get_model(job.config["model_name"])
-    queryset = model.objects.filter(pk__in=job.config["pks"])
-    filename = "bulk_update_export_template/%s/%s/%s.xlsx" % (job.program.pk, job.owner.pk, job.config["model_name"])
-    out, __ = create_xls_importer(queryset.all(), job.program, job.config["columns"])
-    path = default_storage.save(filename, out)
+def bulk_update_export_template(job: AsyncJob) -> str:
+    queryset = cast("QuerySet[Beneficiary]", job.get_queryset())
+    columns = job.config["columns"]
+    if isinstance(columns, dict):
+        columns = columns["fields"]
+    export_format = job.config.get("format", "xlsx")
+    filename = "bulk_update_export_template/%s/%s/%s.%s" % (
+        job.program.pk,
+        job.owner.pk,
+        job.config["model_name"],
+        export_format,
+    )
+    match export_format:
+        case "csv":
+            out = create_csv_export(queryset, columns)
+        case "parquet":
+            out = create_parquet_export(queryset, columns)
+        case _:
+            out, __ = create_xls_importer(queryset, job.program, columns)
+    with out:
+        # storages read (and upload) File objects in chunks
+        path = default_storage.save(filename, File(out))
     job.file = path
     job.save()
     return path
 
 
-def bulk_update_individual(job: AsyncJob) -> dict[str, Any]:
-    ret = {"not_found": []}
-    for e in open_xls(io.BytesIO(job.file.read()), start_at=0):
+def _merge_chunk(
+    job: AsyncJob, queryset: "QuerySet[Beneficiary]", rows: "Iterable[tuple[int, dict[str, Any]]]", ret: dict[str, Any]
+) -> "list[Beneficiary]":
+    """Apply the changes of a chunk of rows to the records they refer to (fetched with one query).
+
+    Changed records are validated with one checker call and one group errors call for the whole chunk.
+
+    Rows that do not match any record are added to `ret["not_found"]`, validation errors to `ret["invalid"]`.
+    """
+    changes: dict[int, tuple[int, dict[str, Any]]] = {}
+    for line, row in rows:
+        _id = row.pop("id", "")
         try:
-            _id = e.pop("id")
-            ind = job.program.individuals.get(id=_id)
-            ind.flex_fields.update(**e)
-            ind.save()
-        except ObjectDoesNotExist:
+            changes[int(_id)] = (line, row)
+        except ValueError:
             ret["not_found"].append(_id)
+    # flex_files are needed to compute the checksums
+    records = queryset.defer(None).in_bulk(list(changes))
+    ret["not_found"].extend(str(pk) for pk in changes if pk not in records)
+    objs = list(records.values())
+    if not objs:
+        return []
+    original = {obj.pk: dict(obj.flex_fields) for obj in objs}
+    for obj in objs:
+        obj.flex_fields.update(**changes[obj.pk][1])
+    checker = job.program.get_checker_for(queryset.model)
+    checker_version = get_checker_version(checker)
+    errors = checker_registry.validate(checker, [obj.flex_fields for obj in objs])
+    group_errors = queryset.model.get_records_group_errors(objs)
+    timestamp = timezone.now()
+    for i, obj in enumerate(objs, 1):
+        obj.checksum = get_obj_checksum(obj)
+        record_group_errors = None if group_errors is None else group_errors.get(obj.pk, [])
+        if not obj.set_validation_errors(errors.get(i, {}), timestamp, checker_version, record_group_errors):
+            ret["invalid"][changes[obj.pk][0]] = obj.errors
+        if job.config.get("dry_run"):
+            ret["diff"][changes[obj.pk][0]] = list(dictdiffer.diff(original[obj.pk], obj.flex_fields))
+    return objs
+
+
+@cache_manager.deferred_invalidation()
+def bulk_update_records(job: AsyncJob, queryset: "QuerySet[Beneficiary]") -> dict[str, Any]:
+    """Update the records listed in the uploaded file, identified by the "id" column.
+
+    Rows are processed in chunks of `job.config["chunk_size"]`: the records of each chunk are fetched
+    with one query, validated and written with one `bulk_update`.
+    With `job.config["dry_run"]` nothing is written and the changes of each row are returned in "diff".
+    Both "invalid" and "diff" are keyed by file row number.
+    """
+    dry_run = job.config.get("dry_run", False)
+    chunk_size = job.config.get("chunk_size", CHUNK_SIZE_DEFAULT)
+    ret: dict[str, Any] = {"updated": 0, "not_found": [], "invalid": {}}
+    if dry_run:
+        ret["diff"] = {}
+    batches: set[int] = set()
+    # line 1 is the header
+    for rows in batched(enumerate(open_xls(job.file, start_at=0), 2), chunk_size):
+        objs = _merge_chunk(job, queryset, rows, ret)
+        if objs and not dry_run:
+            with atomic():
+                ret["updated"] += queryset.model.objects.bulk_update(
+                    objs, ["flex_fields", *Validable.VALIDATION_FIELDS]
+                )
+            batches.update(obj.batch_id for obj in objs)
+    if ret["updated"]:
+        BatchStatistics.objects.refresh(batches)
+        queryset.incr_cache_version()
     return ret
 
 
+def bulk_update_individual(job: AsyncJob) -> dict[str, Any]:
+    return bulk_update_records(job, job.program.individuals.all())
+
+
 def bulk_update_household(job: AsyncJob) -> dict[str, Any]:
-    ret = {"not_found": []}
-    for e in open_xls(io.BytesIO(job.file.read()), start_at=0):
-        try:
-            _id = e.pop("id")
-            ind = job.program.households.get(id=_id)
-            ind.flex_fields.update(**e)
-            ind.save()
-        except ObjectDoesNotExist:
-            ret["not_found"].append(_id)
-    return ret
+    return bulk_update_records(job, job.program.households.all())
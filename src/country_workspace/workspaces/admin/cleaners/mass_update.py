@@ -1,3 +1,4 @@
+from itertools import batched
 from typing import TYPE_CHECKING, Any, Callable
 
 from django import forms
@@ -9,17 +10,21 @@ from strategy_field.utils import fqn
 from hope_flex_fields.fields import FlexFormMixin
 
 from .base import BaseActionForm
+from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
+from country_workspace.utils.flex_fields import JSONBSet, checker_registry, jsonb_value
 
 if TYPE_CHECKING:
-    from django.db.models import QuerySet
+    from django.db.models import Expression, QuerySet
 
     from hope_flex_fields.models import DataChecker
 
     from country_workspace.types import Beneficiary
 
     MassUpdateFunc = Callable[[Any, Any], Any]
+    MassUpdateExpression = Callable[[str, Any], Expression]
     FormOperations = dict[str, tuple[str, str]]
-    Operation = tuple[type[forms.Field], str, MassUpdateFunc]
+    Operation = tuple[type[forms.Field], str, MassUpdateFunc, MassUpdateExpression | None]
     Operations = dict[str, Operation]
 
 
@@ -28,12 +33,29 @@ class OperationManager:
         self._dict: Operations = {}
         self._cache: dict[forms.Form, list[tuple[str, str]]] = {}
 
-    def register(self, target: Any, name: str, func: "MassUpdateFunc") -> None:
+    def register(
+        self, target: Any, name: str, func: "MassUpdateFunc", expression: "MassUpdateExpression | None" = None
+    ) -> None:
+        """Register a mass update operation.
+
+        `func(old_value, new_value)` computes the new value in Python. The optional
+        `expression(field_name, new_value)` returns the equivalent jsonb SQL expression,
+        that allows to run the operation with one single UPDATE statement.
+        """
         unique = slugify(f"{fqn(target)}_{name}_{func.__name__}")
-        self._dict[unique] = (target, name, func)
+        self._dict[unique] = (target, name, func, expression)
+
+    def get_operation_by_id(self, id_: str) -> "Operation":
+        try:
+            return self._dict[id_]
+        except KeyError:
+            raise KeyError(f"Unknown mass update operation '{id_}'") from None
 
     def get_function_by_id(self, id_: str) -> "MassUpdateFunc":
-        return self._dict.get(id_)[2]
+        return self.get_operation_by_id(id_)[2]
+
+    def get_expression_by_id(self, id_: str) -> "MassUpdateExpression | None":
+        return self.get_operation_by_id(id_)[3]
 
     def get_choices_for_target(self, target: type[forms.Field]) -> list[tuple[str, str]]:
         ret: list[tuple[str, str]] = []
@@ -46,8 +68,18 @@ class OperationManager:
 
 
 operations = OperationManager()
-operations.register(forms.Field, "set", lambda old_value, new_value: new_value)
-operations.register(forms.Field, "set null", lambda old_value, new_value: None)
+operations.register(
+    forms.Field,
+    "set",
+    lambda old_value, new_value: new_value,
+    lambda field_name, new_value: jsonb_value(new_value),
+)
+operations.register(
+    forms.Field,
+    "set null",
+    lambda old_value, new_value: None,
+    lambda field_name, new_value: jsonb_value(None),
+)
 operations.register(forms.CharField, "upper", lambda old_value, new_value: old_value.upper())
 operations.register(forms.CharField, "lower", lambda old_value, new_value: old_value.lower())
 operations.register(forms.BooleanField, "toggle", lambda old_value, new_value: not old_value)
@@ -91,7 +123,7 @@ class MassUpdateForm(BaseActionForm):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         checker: "DataChecker" = kwargs.pop("checker")
         super().__init__(*args, **kwargs)
-        for name, fld in checker.get_form()().fields.items():
+        for name, fld in checker_registry.get_form_class(checker)().fields.items():
             self.fields[f"flex_fields__{name}"] = MassUpdateField(label=fld.label, field=fld)
 
     def get_selected(self) -> "dict[str, Any]":
@@ -102,19 +134,44 @@ class MassUpdateForm(BaseActionForm):
         return ret
 
 
+@cache_manager.deferred_invalidation()
 def mass_update_impl(
     queryset: "QuerySet[Beneficiary]",
     config: "FormOperations",
     create_missing_fields: bool = False,
-) -> None:
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+) -> dict[str, int]:
+    """Apply the selected operations to all the records of `queryset`.
+
+    When all the operations have a SQL expression they are executed with one UPDATE for
+    each chunk of `chunk_size` records, followed by the recompute of their checksums.
+    Otherwise records are streamed in chunks and all the operations are computed in Python.
+    Changed records are stored in one revision per chunk.
+    """
+    sql_ops: dict[str, Expression] = {}
+    py_ops: dict[str, tuple[MassUpdateFunc, Any]] = {}
+    for field_name, (op, new_value) in config.items():
+        py_ops[field_name] = (operations.get_function_by_id(op), new_value)
+        if expression := operations.get_expression_by_id(op):
+            sql_ops[field_name] = expression(field_name, new_value)
+
+    updated = 0
     with transaction.atomic():
-        for record in queryset.all():
-            for field_name, attrs in config.items():
-                op, new_value = attrs
-                if field_name in record.flex_fields:
-                    old_value = record.flex_fields[field_name]
-                    func = operations.get_function_by_id(op)
-                    record.flex_fields[field_name] = func(old_value, new_value)
-                elif create_missing_fields:
-                    record.flex_fields[field_name] = func("", new_value)
-            record.save()
+        # collected upfront, the updated records may not match the filters of `queryset` anymore
+        programs = queryset.get_program_ids()
+        if sql_ops and len(sql_ops) == len(py_ops):
+            flex_fields: Any = "flex_fields"
+            for field_name, value in sql_ops.items():
+                flex_fields = JSONBSet(flex_fields, field_name, value, create_missing=create_missing_fields)
+            updated = queryset.update_flex_fields(flex_fields, chunk_size)
+        else:
+            for chunk in batched(queryset.order_by("pk").iterator(chunk_size=chunk_size), chunk_size):
+                for record in chunk:
+                    for field_name, (func, new_value) in py_ops.items():
+                        if field_name in record.flex_fields:
+                            record.flex_fields[field_name] = func(record.flex_fields[field_name], new_value)
+                        elif create_missing_fields:
+                            record.flex_fields[field_name] = func("", new_value)
+                updated += queryset.model.objects.bulk_update(chunk, ["flex_fields"])
+        queryset.incr_cache_version(programs)
+    return {"updated": updated}
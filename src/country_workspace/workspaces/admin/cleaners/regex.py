@@ -1,14 +1,19 @@
 import re
+from itertools import batched
 from typing import TYPE_CHECKING, Any
 
 from django import forms
-from django.db import transaction
+from django.db import DataError, transaction
+from django.db.models import CharField, Func, JSONField
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
 
 from .base import BaseActionForm
-from country_workspace.utils.flex_fields import get_checker_fields
+from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
+from country_workspace.utils.flex_fields import JSONBSet, RegexpReplace, get_checker_fields
 
 if TYPE_CHECKING:
-    from django.db.models import QuerySet
+    from django.db.models import Expression, QuerySet
 
     from hope_flex_fields.models import DataChecker
 
@@ -17,6 +22,11 @@ if TYPE_CHECKING:
     RegexRule = tuple[str, str]
     RegexRules = list[RegexRule]
 
+# Python only syntax: (?P<name>...), (?<...), inline flags, \b \B \N{...}, {,n}, possessive quantifiers
+PYTHON_ONLY_PATTERN = re.compile(r"\(\?[^:=!]|\\[bBN]|\{,|[*+?}]\+")
+# Python only replacement syntax: any escape other than group references \1..\9, \g<1>..\g<9>, \g<0>
+PYTHON_ONLY_SUBST = re.compile(r"\\(?![1-9](?!\d)|g<\d>)")
+
 
 class RegexFormField(forms.CharField):
     def clean(self, value: Any) -> Any:
@@ -32,6 +42,7 @@ class RegexUpdateForm(BaseActionForm):
     field = forms.ChoiceField(choices=[])
     regex = RegexFormField()
     subst = forms.CharField()
+    replace_all = forms.BooleanField(required=False, help_text="Replace all occurrences, not only the first one")
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         checker: "DataChecker" = kwargs.pop("checker")
@@ -39,23 +50,123 @@ class RegexUpdateForm(BaseActionForm):
         self.fields["field"].choices = list(get_checker_fields(checker))
 
 
+def to_posix(pattern: str, subst: str) -> tuple[str, str] | None:
+    """Translate a Python regex substitution into PostgreSQL syntax.
+
+    Returns None if `pattern` or `subst` use features that PostgreSQL does not support
+    (or that behave differently), in which case the substitution must run in Python.
+    """
+    if PYTHON_ONLY_PATTERN.search(pattern) or PYTHON_ONLY_SUBST.search(subst):
+        return None
+    return pattern, re.sub(r"\\g<0>", r"\\&", re.sub(r"\\g<([1-9])>", r"\\\1", subst))
+
+
+def _get_pattern(config: dict[str, Any]) -> tuple[str, int]:
+    regex = config["regex"]
+    if isinstance(regex, re.Pattern):
+        return regex.pattern, regex.flags & ~re.UNICODE
+    return regex, 0
+
+
+def _sql_update(
+    records: "QuerySet[Beneficiary]", field_name: str, pattern: str, subst: str, count: int
+) -> "tuple[QuerySet[Beneficiary], Expression]":
+    """Return the records that match `pattern` and the expression of their new value."""
+    old_value = KeyTextTransform(field_name, "flex_fields")
+    new_value = RegexpReplace(old_value, pattern, subst, flags="" if count else "g")
+    matching = records.alias(
+        _type=Func(KeyTransform(field_name, "flex_fields"), function="jsonb_typeof", output_field=CharField())
+    ).filter(_type="string", **{f"flex_fields__{field_name}__regex": pattern})
+    return matching, new_value
+
+
+def _python_update(value: Any, regex: re.Pattern[str], subst: str, count: int) -> Any:
+    if isinstance(value, str):
+        return regex.sub(subst, value, count)
+    return value
+
+
+@cache_manager.deferred_invalidation()
 def regex_update_impl(
     records: "QuerySet[Beneficiary]",
     config: dict[str, Any],
-    save: bool = True,
-) -> list[tuple[str, str, str]]:
-    if isinstance(config["regex"], str):
-        config["regex"] = re.compile(config["regex"])
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+) -> dict[str, int]:
+    """Apply the regex substitution to `config["field"]` of all the `records`.
 
+    The substitution runs in PostgreSQL (`regexp_replace`) when the pattern can be translated,
+    otherwise values are streamed and substituted in Python in chunks of `chunk_size` records.
+    Only string values are processed.
+    """
     field_name = config["field"]
-    ret = []
+    pattern, flags = _get_pattern(config)
+    count = 0 if config.get("replace_all") else 1
+    model = records.model
     with transaction.atomic():
-        for record in records:
-            old_value = record.flex_fields.get(field_name, "")
-            new_value = config["regex"].sub(config["subst"], old_value, 1)
-            record.flex_fields[field_name] = new_value
-            if save:
-                record.save()
-            else:
-                ret.append((record.pk, old_value, new_value))
+        # collected upfront, the updated records may not match the filters of `records` anymore
+        programs = records.get_program_ids()
+        updated = None
+        if not flags and (posix := to_posix(pattern, config["subst"])):
+            try:
+                with transaction.atomic():
+                    matching, new_expression = _sql_update(records, field_name, *posix, count)
+                    updated = matching.update_flex_fields(
+                        JSONBSet(
+                            "flex_fields",
+                            field_name,
+                            Func(new_expression, function="to_jsonb", output_field=JSONField()),
+                        ),
+                        chunk_size,
+                    )
+            except DataError:  # the pattern is not valid for PostgreSQL
+                updated = None
+
+        if updated is None:
+            regex = re.compile(pattern, flags)
+            updated = 0
+            for chunk in batched(
+                records.order_by("pk").values_list("pk", "flex_fields").iterator(chunk_size), chunk_size
+            ):
+                changes = {}
+                for pk, flex_fields in chunk:
+                    old_value = flex_fields.get(field_name, None)
+                    if (new_value := _python_update(old_value, regex, config["subst"], count)) != old_value:
+                        changes[pk] = new_value
+                to_update = list(model.objects.filter(pk__in=changes))
+                for record in to_update:
+                    record.flex_fields[field_name] = changes[record.pk]
+                updated += model.objects.bulk_update(to_update, ["flex_fields"])
+
+        records.incr_cache_version(programs)
+    return {"updated": updated}
+
+
+def regex_update_preview(
+    records: "QuerySet[Beneficiary]",
+    config: dict[str, Any],
+    limit: int = 10,
+) -> list[tuple[int, str, str]]:
+    """Return `(pk, old value, new value)` of the first `limit` records that `regex_update_impl` would change."""
+    field_name = config["field"]
+    pattern, flags = _get_pattern(config)
+    count = 0 if config.get("replace_all") else 1
+    if not flags and (posix := to_posix(pattern, config["subst"])):
+        matching, new_expression = _sql_update(records, field_name, *posix, count)
+        try:
+            with transaction.atomic():
+                return list(
+                    matching.order_by("pk")
+                    .annotate(_old=KeyTextTransform(field_name, "flex_fields"), _new=new_expression)
+                    .values_list("pk", "_old", "_new")[:limit]
+                )
+        except DataError:
+            pass
+    regex = re.compile(pattern, flags)
+    ret: list[tuple[int, str, str]] = []
+    for pk, flex_fields in records.order_by("pk").values_list("pk", "flex_fields").iterator():
+        old_value = flex_fields.get(field_name, None)
+        if (new_value := _python_update(old_value, regex, config["subst"], count)) != old_value:
+            ret.append((pk, old_value, new_value))
+            if len(ret) == limit:
+                break
     return ret
@@ -1,20 +1,141 @@
 import logging
-from typing import Any
+from itertools import batched
+from typing import TYPE_CHECKING, Any
 
-from django.db.models import Model, QuerySet
+from celery import group
+from celery.result import allow_join_result
+from constance import config
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from hope_flex_fields.models import DataChecker
+
+from country_workspace.cache.manager import cache_manager
+from country_workspace.constants import CHUNK_SIZE_DEFAULT
+from country_workspace.utils.flex_fields import checker_registry, get_checker_version
+
+if TYPE_CHECKING:
+    from country_workspace.models.base import Validable
 
 logger = logging.getLogger(__name__)
 
 
-def validate_queryset(queryset: QuerySet[Model], **kwargs: Any) -> dict[str, int]:
-    valid = invalid = num = 0
-    try:
-        for __, entry in enumerate(queryset, 1):
-            if entry.validate_with_checker():
+def validate_records(
+    model: type["Validable"],
+    pks: "list[int]",
+    group_only: bool = False,
+    program_errors: dict[int, list[Any]] | None = None,
+) -> dict[str, Any]:
+    """Validate the records with primary key in `pks`.
+
+    Records are validated with one `DataChecker.validate()` call for each checker, group
+    errors with one set-based call for each program, and the results are stored with one
+    single `bulk_update`. If `group_only`, the records are unchanged since their last
+    validation: the errors of the checker are kept and only group errors are computed again.
+    `program_errors` are the programme-wide group errors computed once for the whole run.
+    Return the number of valid and invalid records and the programs and batches they belong to.
+    """
+    records = list(model.objects.filter(pk__in=pks).order_by("pk").select_related(model.checker_path))
+    group_errors = model.get_records_group_errors(records, program_errors)
+    by_checker: dict[int, list[Validable]] = {}
+    for record in records:
+        if record.checker:
+            by_checker.setdefault(record.checker.pk, []).append(record)
+
+    now = timezone.now()
+    valid = invalid = 0
+    for group_records in by_checker.values():
+        checker = group_records[0].checker
+        version = get_checker_version(checker)
+        if group_only:
+            errors = {
+                i: {k: v for k, v in record.errors.items() if k != "dct"} for i, record in enumerate(group_records, 1)
+            }
+        else:
+            errors = checker_registry.validate(checker, [record.flex_fields for record in group_records])
+        for i, record in enumerate(group_records, 1):
+            record_group_errors = None if group_errors is None else group_errors.get(record.pk, [])
+            if record.set_validation_errors(errors.get(i, {}), now, version, record_group_errors):
                 valid += 1
             else:
                 invalid += 1
+    model.objects.bulk_update([r for records in by_checker.values() for r in records], model.VALIDATION_FIELDS)
+    return {
+        "valid": valid,
+        "invalid": invalid,
+        "programs": sorted({r.program_id for r in records}),
+        "batches": sorted({r.batch_id for r in records}),
+    }
+
+
+def get_unchanged(queryset: "QuerySet[Validable]") -> Q:
+    """Return the condition of the records already validated with their current checksum and checker configuration."""
+    model = queryset.model
+    checkers = DataChecker.objects.filter(pk__in=queryset.values(model.checker_path))
+    same_checker = Q(pk__in=[])
+    for checker in checkers:
+        same_checker |= Q(**{model.checker_path: checker, "checker_version": get_checker_version(checker)})
+    return Q(validated_checksum=F("checksum")) & same_checker
+
+
+@cache_manager.deferred_invalidation()
+def validate_queryset(
+    queryset: "QuerySet[Validable]",
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+    parallel: bool | None = None,
+    changed_only: bool = False,
+    **kwargs: Any,
+) -> dict[str, int]:
+    """Validate all the records of `queryset` in chunks of `chunk_size` records.
+
+    If `parallel` (default to `config.VALIDATION_PARALLEL`) chunks are validated by
+    concurrent Celery subtasks, otherwise sequentially in the current process.
+    If `changed_only`, records unchanged since their last validation are skipped, unless
+    their group errors depend on other records: only these are computed again.
+    """
+    from country_workspace.models import BatchStatistics
+    from country_workspace.tasks import validate_records_task
+
+    if parallel is None:
+        parallel = config.VALIDATION_PARALLEL
+    model = queryset.model
+    if changed_only:
+        unchanged = get_unchanged(queryset)
+        selections = [
+            (queryset.exclude(unchanged), False),
+            (model.filter_group_validated(queryset.filter(unchanged)), True),
+        ]
+    else:
+        selections = [(queryset, False)]
+    # selections are evaluated upfront, validated records would otherwise move between them
+    chunks = [
+        (chunk, group_only)
+        for records, group_only in selections
+        for chunk in batched(records.order_by("pk").values_list("pk", flat=True), chunk_size)
+    ]
+    valid = invalid = 0
+    # collected from the validated records, they may not match the filters of `queryset` anymore
+    programs: set[int] = set()
+    batches: set[int] = set()
+    try:
+        # programme-wide rules are checked once for the run, not by each chunk
+        program_errors = model.get_program_group_errors(queryset) if chunks else None
+        if parallel:
+            job = group(
+                validate_records_task.s(model._meta.label, list(chunk), group_only, program_errors)
+                for chunk, group_only in chunks
+            ).apply_async()
+            with allow_join_result():
+                results = job.get()
+        else:
+            results = (validate_records(model, list(chunk), group_only, program_errors) for chunk, group_only in chunks)
+        for result in results:
+            valid += result["valid"]
+            invalid += result["invalid"]
+            programs.update(result["programs"])
+            batches.update(result["batches"])
     except Exception as e:
         logger.exception(e)
-
-    return {"valid": valid, "invalid": invalid, "total": num}
+    BatchStatistics.objects.refresh(batches)
+    queryset.incr_cache_version(programs)
+    return {"valid": valid, "invalid": invalid, "total": valid + invalid}
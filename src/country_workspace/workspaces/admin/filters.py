@@ -75,7 +75,7 @@ class HouseholdFilter(CWLinkedAutoCompleteFilter):
     def queryset(self, request: HttpRequest, queryset: "QuerySet[Beneficiary]") -> "QuerySet[Beneficiary]":
         qs = super().queryset(request, queryset)
         if oid := state.program:
-            qs = qs.filter(batch__program__exact=oid)
+            qs = qs.filter(program__exact=oid)
         else:
             qs = qs.none()
         return qs
@@ -14,9 +14,12 @@ from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
-from ...models import AsyncJob
+from ...models import AsyncJob, BatchStatistics
 from ...state import state
+from ...utils.fields import get_search_filter
+from ...utils.flex_fields import checker_registry
 from ..options import WorkspaceModelAdmin
+from ..paginator import WorkspacePaginator
 from .cleaners import actions
 from .cleaners.validate import validate_queryset
 
@@ -54,6 +57,7 @@ class SelectedProgramMixin(WorkspaceModelAdmin):
 class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, WorkspaceModelAdmin):
     actions = [
         actions.validate_records,
+        actions.validate_changed_records,
         actions.mass_update,
         actions.regex_update,
         actions.bulk_update_export,
@@ -62,6 +66,16 @@ class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, W
     title = None
     title_plural = None
     list_per_page = 20
+    paginator = WorkspacePaginator
+
+    def delete_queryset(self, request: HttpRequest, queryset: "QuerySet[Beneficiary]") -> None:
+        batches = list(queryset.order_by().values_list("batch", flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        BatchStatistics.objects.refresh(batches)
+
+    def delete_model(self, request: HttpRequest, obj: "Beneficiary") -> None:
+        super().delete_model(request, obj)
+        BatchStatistics.objects.refresh([obj.batch_id])
 
     def has_validate_permission(self, request: HttpRequest) -> bool:
         return request.user.has_perm("country_workspace.validate_beneficiary")
@@ -78,9 +92,22 @@ class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, W
     def get_queryset(self, request: HttpRequest) -> "QuerySet[Beneficiary]":
         qs = super().get_queryset(request)
         if prg := self.get_selected_program(request):
-            return qs.filter(batch__program=prg)
+            return qs.filter(program=prg)
         return qs
 
+    def get_search_fields(self, request: HttpRequest) -> list[str]:
+        if program := self.get_selected_program(request):
+            return program.get_search_fields_for(self.model)
+        return super().get_search_fields(request)
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: "QuerySet[Beneficiary]", search_term: str
+    ) -> "tuple[QuerySet[Beneficiary], bool]":
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, "")
+        if search_term := search_term.strip():
+            queryset = queryset.filter(get_search_filter(self.get_search_fields(request), search_term))
+        return queryset, may_have_duplicates
+
     def get_common_context(self, request: HttpRequest, pk: str | None = None, **kwargs: Any) -> dict[str, Any]:
         ret = super().get_common_context(request, pk, **kwargs)
         ret["datachecker"] = self.get_checker(request, ret.get("original"))
@@ -97,8 +124,7 @@ class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, W
         else:
             self.message_user(request, _("Validation failed!"), messages.ERROR)
 
-    @button(label=_("Validate Programme"))
-    def validate_program(self, request: HttpRequest) -> "HttpResponse":
+    def _validate_program(self, request: HttpRequest, changed_only: bool) -> AsyncJob:
         opts = self.model._meta
         job = AsyncJob.objects.create(
             description="Validate Program %s" % opts.proxy_for_model._meta.verbose_name_plural,
@@ -106,21 +132,29 @@ class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, W
             owner=state.request.user,
             action=fqn(validate_queryset),
             program=state.program,
-            config={"pks": "__all__", "model_name": opts.label},
+            config={"pks": "__all__", "model_name": opts.label, "kwargs": {"changed_only": changed_only}},
         )
         job.queue()
         self.message_user(request, "Task scheduled", messages.SUCCESS)
         return job
 
+    @button(label=_("Validate Programme"))
+    def validate_program(self, request: HttpRequest) -> "HttpResponse":
+        return self._validate_program(request, changed_only=False)
+
+    @button(label=_("Validate changes"))
+    def validate_program_changes(self, request: HttpRequest) -> "HttpResponse":
+        return self._validate_program(request, changed_only=True)
+
     @button()
     def view_raw_data(self, request: HttpRequest, pk: str) -> "HttpResponse":
         context = self.get_common_context(request, pk, title="Raw Data")
         return render(request, f"workspace/{self.model._meta.proxy_for_model._meta.model_name}/raw_data.html", context)
 
     def is_valid(self, obj: "Validable") -> bool | None:
-        if not obj.last_checked:
+        if obj.validation_status == obj.ValidationStatus.UNCHECKED:
             return None
-        return not bool(obj.errors)
+        return obj.validation_status == obj.ValidationStatus.VALID
 
     is_valid.boolean = True
 
@@ -155,7 +189,7 @@ class BeneficiaryBaseAdmin(AdminAutoCompleteSearchMixin, SelectedProgramMixin, W
         obj = self.get_object(request, unquote(object_id))
         dc: "DataChecker" = self.get_checker(request, obj)
         try:
-            form_class = dc.get_form()
+            form_class = checker_registry.get_form_class(dc)
         except AttributeError:
             self.message_user(
                 request,
@@ -46,8 +46,8 @@ class CountryHouseholdAdmin(BeneficiaryBaseAdmin):
         return (
             super()
             .get_queryset(request)
-            .select_related("batch__program", "batch__program__household_checker", "batch__country_office")
-            .filter(batch__country_office=state.tenant, batch__program=state.program)
+            .select_related("batch", "program__household_checker", "country_office")
+            .filter(country_office=state.tenant, program=state.program)
         )
 
     @link(change_list=False)
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any
+import csv
+from typing import TYPE_CHECKING, Any, cast
 
 from admin_extra_buttons.api import button
 from django import forms
@@ -7,7 +8,7 @@ from django.contrib import messages
 from django.contrib.admin import register
 from django.db.models import QuerySet
 from django.forms import Media
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.translation import gettext as _
@@ -15,8 +16,10 @@ from strategy_field.utils import fqn
 
 from ...contrib.aurora.forms import ImportAuroraForm
 from ...datasources.rdi import import_from_rdi
-from ...models import AsyncJob
+from ...models import AsyncJob, Batch, BatchStatistics
+from ...utils.errors import get_error_report
 from ...utils.flex_fields import get_checker_fields
+from ...utils.indexes import sync_program_indexes
 from ..models import CountryProgram
 from ..options import WorkspaceModelAdmin
 from ..sites import workspace
@@ -73,6 +76,7 @@ class BulkUpdateImportForm(forms.Form):
     description = forms.CharField(widget=forms.Textarea)
     target = forms.ChoiceField(choices=(("hh", "Household"), ("ind", "Individual")))
     file = forms.FileField()
+    dry_run = forms.BooleanField(required=False, help_text=_("Only report the changes, without updating the records"))
 
 
 @register(CountryProgram, site=workspace)
@@ -120,6 +124,20 @@ class CountryProgramAdmin(WorkspaceModelAdmin):
         ),
     )
 
+    def render_change_form(  # noqa: PLR0913
+        self,
+        request: HttpRequest,
+        context: dict[str, Any],
+        add: bool = False,
+        change: bool = False,
+        form_url: str = "",
+        obj: CountryProgram | None = None,
+    ) -> HttpResponse:
+        if obj:
+            context["statistics"] = BatchStatistics.objects.get_totals(program=obj)
+            context["error_report"] = get_error_report(obj)
+        return super().render_change_form(request, context, add, change, form_url, obj)
+
     @property
     def media(self) -> forms.Media:
         extra = "" if settings.DEBUG else ".min"
@@ -188,6 +206,50 @@ class CountryProgramAdmin(WorkspaceModelAdmin):
         context["storage_field"] = "individual_columns"
         return self._configure_columns(request, SelectIndividualColumnsForm, context)
 
+    @button(label=_("Index Columns"), permission="workspaces.change_countryprogram")
+    def index_columns(self, request: HttpRequest, pk: str) -> "HttpResponseRedirect":
+        if (program := self.get_object(request, pk)) is None:
+            raise Http404
+        job = AsyncJob.objects.create(
+            description="Create indexes for the configured columns",
+            program=program,
+            owner=request.user,
+            type=AsyncJob.JobType.TASK,
+            action=fqn(sync_program_indexes),
+            config={},
+        )
+        job.queue()
+        self.message_user(request, _("Indexes creation scheduled. Job #{0}.").format(job.id), messages.SUCCESS)
+        return HttpResponseRedirect(reverse("workspace:workspaces_countryprogram_change", args=[program.pk]))
+
+    @button(label=_("Error Report"), permission="workspaces.view_countryprogram")
+    def error_report(self, request: HttpRequest, pk: str) -> "HttpResponse":
+        context = self.get_common_context(request, pk, title="Validation errors")
+        program: "CountryProgram" = context["original"]
+        batches = Batch.objects.filter(program=program).order_by("-pk")
+        batch = None
+        if (batch_id := request.GET.get("batch", "")).isdigit():
+            batch = cast("Batch | None", batches.filter(pk=batch_id).first())
+        report = get_error_report(program, batch)
+        if request.GET.get("format") == "csv":
+            response = HttpResponse(content_type="text/csv")
+            response["Content-Disposition"] = 'attachment; filename="errors-%s-%s.csv"' % (
+                program.pk,
+                batch.pk if batch else "all",
+            )
+            writer = csv.writer(response)
+            writer.writerow(["target", "field", "message", "count", "samples"])
+            for target, rows in report.items():
+                for row in rows:
+                    writer.writerow(
+                        [target, row["field"], row["message"], row["count"], " ".join(map(str, row["samples"]))]
+                    )
+            return response
+        context["batches"] = batches
+        context["batch"] = batch
+        context["error_report"] = report
+        return render(request, "workspace/program/error_report.html", context)
+
     @button(label=_("Update Records"), permission="country_workspace.import_program_data")
     def import_file_updates(self, request: HttpRequest, pk: str) -> "HttpResponse":
         context = self.get_common_context(request, pk, title="Import updates from file")
@@ -206,7 +268,7 @@ class CountryProgramAdmin(WorkspaceModelAdmin):
                     action=function_map[form.cleaned_data["target"]],
                     batch=None,
                     file=request.FILES["file"],
-                    config={},
+                    config={"dry_run": form.cleaned_data["dry_run"]},
                 )
                 job.queue()
                 self.message_user(request, _("Import scheduled").format(updated))
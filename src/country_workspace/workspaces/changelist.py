@@ -1,19 +1,36 @@
+import json
 from typing import TYPE_CHECKING, Any
 
+from django.contrib.admin.options import IncorrectLookupParameters
 from django.contrib.admin.utils import quote
 from django.contrib.admin.views.main import ChangeList as DjangoChangeList
-from django.db.models import Model, QuerySet
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+from django.db.models.fields.json import KeyTransform
 from django.http import HttpRequest
 from django.urls import reverse
+from django.utils.functional import cached_property
 
 from ..cache.manager import cache_manager
+from .paginator import WorkspacePaginator
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from hope_flex_fields.models import DataChecker
 
     from .templatetags.workspace_list import ResultList
 
 
+# keyset pagination cursor
+CURSOR_VAR = "_cursor"
+# count the records even if the count could be estimated
+EXACT_COUNT_VAR = "_exact"
+
+
 class WorkspaceChangeList(DjangoChangeList):
     selected_program_filter: str = ""
 
@@ -39,24 +56,187 @@ class WorkspaceChangeList(DjangoChangeList):
             current_app=self.model_admin.admin_site.name,
         )
 
+    @property
+    def cache_namespaces(self) -> tuple[str, ...]:
+        return cache_manager.get_dependencies(self.model)
+
     def get_queryset(self, request: HttpRequest, exclude_parameters: dict[str, Any] | None = None) -> QuerySet[Model]:
-        (
-            self.filter_specs,
-            self.has_filters,
-            remaining_lookup_params,
-            filters_may_have_duplicates,
-            self.has_active_filters,
-        ) = self.get_filters(request)
-        key = cache_manager.build_key_from_request(request, "qs")
-        if not (qs := cache_manager.retrieve(key)):
-            qs = super().get_queryset(request, exclude_parameters)
-            cache_manager.store(key, qs)
-        self.clear_all_filters_qs = self.get_query_string(
-            new_params=remaining_lookup_params,
-            remove=self.get_filters_params(),
-        )
+        qs = super().get_queryset(request, exclude_parameters)
+        if exclude_parameters is None:
+            for index, spec in enumerate(self.filter_specs):
+                if hasattr(spec, "get_facet_queryset"):
+                    spec.get_facet_queryset = self._cached_facets(request, index, spec.get_facet_queryset)
         return qs
 
+    def _cached_facets(
+        self, request: HttpRequest, index: int, func: "Callable[[DjangoChangeList], dict[str, int]]"
+    ) -> "Callable[[DjangoChangeList], dict[str, int]]":
+        def wrapper(changelist: DjangoChangeList) -> dict[str, int]:
+            key = cache_manager.build_key_from_request(
+                request, "facets", request.user.pk, index, namespaces=self.cache_namespaces
+            )
+            if (counts := cache_manager.retrieve(key)) is None:
+                counts = func(changelist)
+                cache_manager.store(key, counts)
+            return counts
+
+        return wrapper
+
+    def get_filters_params(self, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        lookup_params = super().get_filters_params(params)
+        for var in (CURSOR_VAR, EXACT_COUNT_VAR):
+            lookup_params.pop(var, None)
+        return lookup_params
+
+    @cached_property
+    def keyset_fields(self) -> list[tuple[str, bool]]:
+        """Return the (attname, descending) pairs of the ordering, if it allows keyset pagination.
+
+        It requires an ordering on concrete, not nullable, model fields only.
+        """
+        fields = []
+        for item in self.queryset.query.order_by:
+            if not isinstance(item, str):
+                return []
+            name = item.removeprefix("-")
+            try:
+                field = self.opts.pk if name == "pk" else self.opts.get_field(name)
+            except FieldDoesNotExist:
+                return []
+            if not field.concrete or field.null:
+                return []
+            fields.append((field.attname, item.startswith("-")))
+        return fields
+
+    def get_cursor(self) -> "tuple[bool, list[Any]] | None":
+        """Return direction (True: forward) and ordering values of the `_cursor` parameter."""
+        if not (value := self.params.get(CURSOR_VAR)) or not self.keyset_fields:
+            return None
+        try:
+            cursor = signing.loads(value, salt=CURSOR_VAR)
+        except signing.BadSignature:
+            raise IncorrectLookupParameters
+        if cursor["o"] != [name for name, __ in self.keyset_fields]:
+            # the ordering changed after the cursor was created
+            return None
+        return cursor["f"], cursor["v"]
+
+    def get_cursor_url(self, obj: Model, forward: bool) -> str:
+        values = [getattr(obj, name) for name, __ in self.keyset_fields]
+        cursor = {
+            "o": [name for name, __ in self.keyset_fields],
+            "f": forward,
+            "v": json.loads(json.dumps(values, cls=DjangoJSONEncoder)),
+        }
+        return self.get_query_string({CURSOR_VAR: signing.dumps(cursor, salt=CURSOR_VAR)})
+
+    def get_keyset_page(self, queryset: QuerySet[Model], forward: bool, values: list[Any]) -> list[Model]:
+        """Return the page of records that follow (or precede) `values`, without OFFSET."""
+        condition = Q()
+        equal: dict[str, Any] = {}
+        for (name, descending), value in zip(self.keyset_fields, values, strict=True):
+            lookup = "gt" if forward != descending else "lt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        qs = queryset.filter(condition)
+        if not forward:
+            qs = qs.reverse()
+        records = list(qs[: self.list_per_page])
+        if not forward:
+            records.reverse()
+        return records
+
+    def _get_page(self, queryset: QuerySet[Model], paginator: "Paginator[Model]", result_count: int) -> list[Model]:
+        if (cursor := self.get_cursor()) is not None:
+            return self.get_keyset_page(queryset, *cursor)
+        if (self.show_all and result_count <= self.list_max_show_all) or result_count <= self.list_per_page:
+            return list(queryset._clone())
+        try:
+            return list(paginator.page(self.page_num).object_list)
+        except InvalidPage:
+            raise IncorrectLookupParameters
+
+    def get_results_queryset(self) -> QuerySet[Model]:
+        """Return the queryset used to load the records of the page."""
+        return self.queryset
+
+    def get_results(self, request: HttpRequest) -> None:
+        """Load the current page, by offset or by keyset (`_cursor`), and cache its primary keys and the count.
+
+        On cache hit the page is loaded by primary key, without COUNT(*) and OFFSET queries.
+        Without active filters the count can be estimated, see `WorkspacePaginator`.
+        """
+        if self.list_editable:
+            return super().get_results(request)
+        key = cache_manager.build_key_from_request(
+            request, "results", request.user.pk, namespaces=self.cache_namespaces
+        )
+        queryset = self.get_results_queryset()
+        paginator = self.model_admin.get_paginator(request, queryset, self.list_per_page)
+        if cached := cache_manager.retrieve(key):
+            # Paginator.count is a cached_property
+            paginator.__dict__["count"] = cached["result_count"]
+            records = queryset.in_bulk(cached["pks"]) if cached["pks"] else {}
+            result_list = [records[pk] for pk in cached["pks"] if pk in records]
+        else:
+            if isinstance(paginator, WorkspacePaginator):
+                paginator.estimate = not (self.has_active_filters or self.query or EXACT_COUNT_VAR in self.params)
+            cached = {
+                "result_count": paginator.count,
+                "count_estimated": getattr(paginator, "estimated", False),
+                "full_result_count": self.root_queryset.count() if self.model_admin.show_full_result_count else None,
+            }
+            result_list = self._get_page(queryset, paginator, cached["result_count"])
+            cached["pks"] = [obj.pk for obj in result_list]
+            cache_manager.store(key, cached)
+
+        self.result_count = cached["result_count"]
+        self.count_estimated = cached["count_estimated"]
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(cached["full_result_count"])
+        self.full_result_count = cached["full_result_count"]
+        self.result_list = result_list
+        self.can_show_all = self.result_count <= self.list_max_show_all and not self.count_estimated
+        self.multi_page = self.result_count > self.list_per_page
+        self.paginator = paginator
+        self._set_keyset_urls()
+        return None
+
+    def _set_keyset_urls(self) -> None:
+        self.cursor_pagination = CURSOR_VAR in self.params and bool(self.keyset_fields)
+        self.previous_url = self.next_url = None
+        if self.keyset_fields and self.multi_page and self.result_list:
+            if self.cursor_pagination or self.page_num > 1:
+                self.previous_url = self.get_cursor_url(self.result_list[0], forward=False)
+            if len(self.result_list) == self.list_per_page:
+                self.next_url = self.get_cursor_url(self.result_list[-1], forward=True)
+        self.exact_count_url = self.get_query_string({EXACT_COUNT_VAR: 1})
+
+
+class SelectionChangeListMixin:
+    """Build only the queryset of the changelist, used to rebuild the records selected for a job."""
+
+    def get_results(self, request: HttpRequest) -> None:
+        pass
+
 
 class FlexFieldsChangeList(WorkspaceChangeList):
     checker: "DataChecker"
+
+    @cached_property
+    def flex_columns(self) -> dict[str, str]:
+        """Map the `flex_fields__<key>` columns to the name of the annotation that loads them."""
+        return {
+            name: f"_flex_column_{i}" for i, name in enumerate(self.list_display) if name.startswith("flex_fields__")
+        }
+
+    def get_results_queryset(self) -> QuerySet[Model]:
+        """Load only the displayed `flex_fields` keys, not the whole document."""
+        if not self.flex_columns:
+            return super().get_results_queryset()
+        return self.queryset.annotate(
+            **{
+                alias: KeyTransform(name.removeprefix("flex_fields__"), "flex_fields")
+                for name, alias in self.flex_columns.items()
+            }
+        ).defer("flex_fields")
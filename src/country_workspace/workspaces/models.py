@@ -1,8 +1,5 @@
-from typing import cast
-
 import reversion
 from django.db import models
-from django.utils.functional import cached_property
 
 from hope_flex_fields.models import DataChecker
 
@@ -25,14 +22,6 @@ class CountryHousehold(Household):
         verbose_name = "Country Household"
         verbose_name_plural = "Country Households"
 
-    @cached_property
-    def program(self) -> "CountryProgram":
-        return cast(CountryProgram, self.batch.program)
-
-    @cached_property
-    def country_office(self) -> "DataChecker":
-        return self.batch.program.country_office
-
 
 @reversion.register()
 class CountryIndividual(Individual):
@@ -0,0 +1,44 @@
+import json
+from typing import Any
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def get_estimated_count(queryset: QuerySet[Any]) -> int:
+    """Return the number of rows of `queryset` as estimated by the PostgreSQL planner."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class WorkspacePaginator(Paginator):  # type: ignore[type-arg]
+    """Paginator that can use the planner estimate instead of an exact COUNT(*).
+
+    The estimate is used only when `estimate` is set and it is above `estimate_threshold`,
+    smaller results are always counted. `estimated` tells whether `count` is an estimate.
+    """
+
+    estimate_threshold = 10000
+
+    def __init__(self, *args: Any, estimate: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.estimate = estimate
+        self.estimated = False
+
+    @cached_property
+    def count(self) -> int:
+        if (
+            self.estimate
+            and isinstance(self.object_list, QuerySet)
+            and (rows := get_estimated_count(self.object_list)) > self.estimate_threshold
+        ):
+            self.estimated = True
+            return rows
+        return super().count
@@ -244,6 +244,11 @@ class TenantAdminSite(admin.AdminSite):
         extra_context: "dict[str,Any]|None" = None,
         **kwargs: "Any",
     ) -> "HttpResponse":
+        from country_workspace.models import BatchStatistics
+
+        extra_context = extra_context or {}
+        if program := get_selected_program():
+            extra_context["statistics"] = BatchStatistics.objects.get_totals(program=program)
         return super().index(request, extra_context, **kwargs)
 
     # @method_decorator(never_cache)
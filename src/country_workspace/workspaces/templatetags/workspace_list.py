@@ -83,8 +83,11 @@ def flex_field_label_for_field(column_name: str, model: "Model", model_admin: "M
 
 
 def flex_field_lookup_field(
-    field_name: str, result: "CountryIndividual", model_admin: "ModelAdmin"
-) -> tuple[Field, str, str]:
+    field_name: str, result: "CountryIndividual", model_admin: "ModelAdmin", columns: dict[str, str] | None = None
+) -> tuple[Field | None, str | None, Any]:
+    if columns and (alias := columns.get(field_name)) and alias in result.__dict__:
+        # value loaded by FlexFieldsChangeList.get_results_queryset()
+        return lookup_field(lambda o: getattr(o, alias), result, model_admin)
     dict_key = field_name.replace("flex_fields__", "")
     f, attr, value = lookup_field(lambda o: o.flex_fields.get(dict_key), result, model_admin)
     return f, attr, value
@@ -202,7 +205,9 @@ def items_for_result(cl, result, form):  # noqa
         row_classes = ["field field-%s" % _coerce_field_name(field_name, field_index)]
         try:
             if field_name.startswith("flex_fields__"):
-                f, attr, value = flex_field_lookup_field(field_name, result, cl.model_admin)
+                f, attr, value = flex_field_lookup_field(
+                    field_name, result, cl.model_admin, getattr(cl, "flex_columns", None)
+                )
             else:
                 f, attr, value = lookup_field(field_name, result, cl.model_admin)
         except ObjectDoesNotExist:
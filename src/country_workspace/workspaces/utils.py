@@ -1,14 +1,17 @@
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
 
 from django.conf import settings
 from django.core.signing import get_cookie_signer
+from django.http import HttpRequest, QueryDict
 
 from ..state import State, state
 from .config import conf
 
 if TYPE_CHECKING:
-    from django.http import HttpRequest, HttpResponse
+    from django.db.models import Model, QuerySet
+    from django.http import HttpResponse
 
     from ..models import Office, Program, User
 
@@ -74,6 +77,63 @@ def get_program_cookie_from_request(request: "HttpRequest") -> str | None:
     return None
 
 
+def get_changelist_filters(request: "HttpRequest") -> dict[str, Any]:
+    """Return the query string parameters that select the records of the changelist of `request`.
+
+    Pagination parameters are dropped, as `ChangeList` does, since the selection spans all the pages.
+    """
+    from django.contrib.admin.views.main import ERROR_FLAG, PAGE_VAR
+
+    from .changelist import CURSOR_VAR, EXACT_COUNT_VAR
+
+    return {
+        "params": {
+            key: values
+            for key, values in request.GET.lists()
+            if key not in (PAGE_VAR, ERROR_FLAG, CURSOR_VAR, EXACT_COUNT_VAR)
+        },
+    }
+
+
+def get_changelist_queryset(
+    model: "type[Model]", program: "Program", user: "User", filters: dict[str, Any]
+) -> "QuerySet[Model]":
+    """Rebuild the queryset of the workspace changelist of `model`.
+
+    `filters` is returned by `get_changelist_filters()`. The changelist of the model admin is
+    built for a request with the same parameters, so that list filters, search and ordering
+    are applied as in the admin, but its results (counts, page) are not loaded.
+    """
+    from .changelist import SelectionChangeListMixin
+    from .sites import workspace
+
+    model_admin = workspace._registry[model]
+    request = HttpRequest()
+    request.user = user
+    request.GET = QueryDict(urlencode(filters["params"], doseq=True))
+    with state.set(request=request, tenant=program.country_office, program=program):
+        changelist_class = model_admin.get_changelist(request)
+        changelist_class = type(changelist_class.__name__, (SelectionChangeListMixin, changelist_class), {})
+        list_display = model_admin.get_list_display(request)
+        changelist = changelist_class(
+            request,
+            model,
+            list_display,
+            model_admin.get_list_display_links(request, list_display),
+            model_admin.get_list_filter(request),
+            model_admin.date_hierarchy,
+            model_admin.get_search_fields(request),
+            model_admin.get_list_select_related(request),
+            model_admin.list_per_page,
+            model_admin.list_max_show_all,
+            model_admin.list_editable,
+            model_admin,
+            model_admin.get_sortable_by(request),  # type: ignore[arg-type]
+            model_admin.search_help_text,  # type: ignore[arg-type]
+        )
+        return changelist.queryset
+
+
 class RequestHandler:
     def process_request(self, request: "HttpRequest") -> State:
         state.reset()
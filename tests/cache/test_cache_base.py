@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
 from django.urls import reverse
@@ -6,6 +7,7 @@ from testutils.perms import user_grant_permissions
 from testutils.utils import select_office
 
 from country_workspace.cache.manager import CacheManager
+from country_workspace.state import state
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -81,3 +83,33 @@ def test_cache_changelist(app: "DjangoTestApp", individual: "CountryIndividual")
             res = app.get(url, headers={"etag": etag})
             assert res.status_code == 200, res.location
             assert res.headers["Etag"] != etag
+
+
+def test_cache_changelist_results(rf, user: "User", individual: "CountryIndividual") -> None:
+    from country_workspace.workspaces.changelist import WorkspaceChangeList
+
+    from country_workspace.cache.manager import cache_manager
+    from country_workspace.workspaces.models import CountryIndividual
+    from country_workspace.workspaces.sites import workspace
+
+    model_admin = workspace._registry[CountryIndividual]
+    request = rf.get(model_admin.get_changelist_url())
+    request.user = user
+    active = cache_manager.active
+    cache_manager.active = True
+    try:
+        with state.set(request=request, tenant=individual.country_office, program=individual.program):
+            cl = model_admin.get_changelist_instance(request)
+            expected = (cl.result_count, list(cl.result_list))
+            with mock.patch.object(
+                WorkspaceChangeList, "_get_page", autospec=True, side_effect=WorkspaceChangeList._get_page
+            ) as m:
+                cl = model_admin.get_changelist_instance(request)
+                assert not m.called
+                assert (cl.result_count, cl.result_list) == expected
+
+                individual.save()
+                model_admin.get_changelist_instance(request)
+                assert m.called
+    finally:
+        cache_manager.active = active
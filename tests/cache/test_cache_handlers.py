@@ -40,7 +40,8 @@ def test_handlers(manager, model):
     obj = fc()
     with mock.patch("country_workspace.cache.handlers.cache_manager", manager):
         program = getattr(obj, "program", obj)
-        v1 = manager.get_cache_version(program=program)
+        namespace = manager.get_namespace(model)
+        v1 = manager.get_cache_version(program=program, namespace=namespace)
         obj.save()
-        v2 = manager.get_cache_version(program=program)
+        v2 = manager.get_cache_version(program=program, namespace=namespace)
         assert v2 > v1
@@ -1,4 +1,6 @@
+import time
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
 from testutils.perms import user_grant_permissions
@@ -83,3 +85,58 @@ def test_invalidate(manager, program):
     manager.incr_cache_version(program=program)
     v = manager.get_cache_version(program=program)
     assert v == 3
+
+
+def test_local_cache(manager, program):
+    manager.local_ttl = 60
+    manager.reset_cache_version(program=program)
+    assert manager.get_cache_version(program=program) == 1
+    with mock.patch.object(manager, "_load_version") as m:
+        assert manager.get_cache_version(program=program) == 1
+        assert not m.called
+
+    manager.incr_cache_version(program=program)
+    assert manager.get_cache_version(program=program) == 2
+
+
+def test_local_cache_pubsub(manager, program, worker_id):
+    manager.local_ttl = 60
+    other = CacheManager(f"cache{worker_id}")
+    other.local_ttl = 60
+    other.reset_cache_version(program=program)
+    assert other.get_cache_version(program=program) == 1
+
+    manager.incr_cache_version(program=program)
+    for __ in range(50):
+        if other.get_cache_version(program=program) == 2:
+            break
+        time.sleep(0.1)
+    assert other.get_cache_version(program=program) == 2
+
+
+def test_namespaces(manager, program):
+    from country_workspace.models import AsyncJob, Household
+
+    with state.set(tenant=program.country_office, program=program):
+        hh_key = manager.build_key("list", namespaces=manager.get_dependencies(Household))
+        job_key = manager.build_key("list", namespaces=manager.get_dependencies(AsyncJob))
+
+        manager.incr_cache_version(program=program, namespace=manager.get_namespace(AsyncJob))
+        assert manager.build_key("list", namespaces=manager.get_dependencies(Household)) == hh_key
+        assert manager.build_key("list", namespaces=manager.get_dependencies(AsyncJob)) != job_key
+
+        manager.incr_cache_version(program=program)
+        assert manager.build_key("list", namespaces=manager.get_dependencies(Household)) != hh_key
+
+
+def test_deferred_invalidation(manager, program):
+    manager.reset_cache_version(program=program, namespace="households")
+    with mock.patch.object(manager, "_incr_version", wraps=manager._incr_version) as m:
+        with manager.deferred_invalidation():
+            for __ in range(10):
+                manager.incr_cache_version(program=program, namespace="households")
+            with manager.deferred_invalidation():
+                manager.incr_cache_version(program=program, namespace="households")
+            assert manager.get_cache_version(program=program, namespace="households") == 1
+        assert manager.get_cache_version(program=program, namespace="households") == 2
+        assert m.call_count == 1
@@ -6,17 +6,19 @@ import pytest
 from constance.test.unittest import override_config
 
 from country_workspace.contrib.aurora.sync import (
-    _create_household,
-    _create_individuals,
+    _build_household,
+    _build_individuals,
+    _save_progress,
     _update_household_name_from_individual,
     sync_aurora_job,
 )
+from country_workspace.exceptions import RemoteError
 from country_workspace.models import Household
 
 
-def test_create_household_success(mock_aurora_data, batch):
+def test_build_household_success(mock_aurora_data, batch):
     fields = mock_aurora_data["results"][0]["fields"]["household"][0]
-    household = _create_household(batch, fields)
+    household = _build_household(batch, fields)
 
     assert isinstance(household, Household)
     assert household.program == batch.program
@@ -58,7 +60,6 @@ def test_update_household_name_from_individual(mock_aurora_data, household, data
     individual_data = mock_aurora_data["results"][0]["fields"]["individuals"][0].copy()
     individual_data.update(data)
     _update_household_name_from_individual(household, individual_data, household_name_column="family_name")
-    household.refresh_from_db()
 
     if expected_name_update:
         assert household.name == expected_name_update
@@ -83,13 +84,13 @@ def test_update_household_name_from_individual(mock_aurora_data, household, data
     ],
     ids=["filled_fields", "empty_fields"],
 )
-def test_create_individuals(mock_aurora_data, household, data, expected_count):
+def test_build_individuals(mock_aurora_data, household, data, expected_count):
     with (
         patch(
             "country_workspace.contrib.aurora.sync.clean_field_name", side_effect=lambda x: f"cleaned_{x}"
         ) as mock_clean_field_name,
     ):
-        individuals = _create_individuals(household, data, household_name_column="family_name")
+        individuals = _build_individuals(household, data, household_name_column="family_name")
 
         assert len(individuals) == expected_count
 
@@ -113,3 +114,52 @@ def test_sync_aurora_job_success_new(mocked_responses, job):
 
     result = sync_aurora_job(job)
     assert result == {"households": 2, "individuals": 3}
+
+
+@override_config(AURORA_API_URL="https://api.aurora.io")
+def test_sync_aurora_job_resume(mocked_responses, job):
+    page = json.loads((Path(__file__).parent / "aurora.json").read_text())
+    mocked_responses.add(
+        mocked_responses.GET,
+        "https://api.aurora.io/record/",
+        json={**page, "next": "https://api.aurora.io/record/?page=2"},
+        status=200,
+    )
+    mocked_responses.add(mocked_responses.GET, "https://api.aurora.io/record/?page=2", status=500)
+    with pytest.raises(RemoteError):
+        sync_aurora_job(job)
+    job.refresh_from_db()
+    assert job.config["cursor"] == "https://api.aurora.io/record/?page=2"
+    assert job.batch.household_set.count() == 2
+
+    mocked_responses.replace(mocked_responses.GET, "https://api.aurora.io/record/?page=2", json=page, status=200)
+    result = sync_aurora_job(job)
+    assert result == {"households": 4, "individuals": 6}
+    assert "cursor" not in job.config
+    assert job.batch.household_set.count() == 4
+
+
+@override_config(AURORA_API_URL="https://api.aurora.io")
+def test_sync_aurora_job_resume_after_last_page(mocked_responses, job):
+    page = json.loads((Path(__file__).parent / "aurora.json").read_text())
+    mocked_responses.add(mocked_responses.GET, "https://api.aurora.io/record/", json=page, status=200)
+    saved = []
+
+    def save_progress(job):
+        # the job dies after the last page, before the cursor is removed
+        if len(saved) == 2:
+            raise RuntimeError
+        saved.append(job.config.get("cursor"))
+        _save_progress(job)
+
+    with patch("country_workspace.contrib.aurora.sync._save_progress", side_effect=save_progress):
+        with pytest.raises(RuntimeError):
+            sync_aurora_job(job)
+    job.refresh_from_db()
+    assert job.config["cursor"] is None
+
+    mocked_responses.replace(mocked_responses.GET, "https://api.aurora.io/record/", status=500)
+    result = sync_aurora_job(job)
+    assert result == {"households": 2, "individuals": 3}
+    assert "cursor" not in job.config
+    assert job.batch.household_set.count() == 2
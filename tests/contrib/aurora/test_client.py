@@ -30,17 +30,17 @@ def test_aurora_client_exceptions(response):
     aurora_client = AuroraClient()
     if isinstance(response, Exception):
         if isinstance(response, JSONDecodeError):
-            with patch("requests.get") as mock_get:
+            with patch("requests.Session.get") as mock_get:
                 mock_get.return_value = Mock(status_code=200)
                 mock_get.return_value.json.side_effect = response
                 with pytest.raises(RemoteError):
                     list(aurora_client.get("record"))
         else:
-            with patch("requests.get", side_effect=response):
+            with patch("requests.Session.get", side_effect=response):
                 with pytest.raises(RemoteError):
                     list(aurora_client.get("record"))
     else:
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_get.return_value = Mock(**response)
             with pytest.raises(RemoteError):
                 list(aurora_client.get("record"))
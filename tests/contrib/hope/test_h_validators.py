@@ -85,3 +85,60 @@ def test_head(household: "Household"):
         "This Household has multiple Primary Collectors",
         "This Household has multiple Alternate Collectors",
     ]
+
+
+def test_validate_households(household: "Household", django_assert_num_queries):
+    from testutils.factories import HouseholdFactory, IndividualFactory
+
+    from country_workspace.models import Household
+
+    complete = HouseholdFactory(batch=household.batch, individuals=[])
+    hh_id = complete.flex_fields["household_id"]
+    IndividualFactory(household=complete, flex_fields={"relationship": "HEAD", "primary_collector_id": hh_id})
+    IndividualFactory(household=complete, flex_fields={"alternate_collector_id": hh_id})
+    IndividualFactory(household=complete, flex_fields={"alternate_collector_id": hh_id})
+
+    v = FullHouseholdValidator(household.program)
+    with django_assert_num_queries(1):
+        errors = v.validate_households(Household.objects.filter(pk__in=[household.pk, complete.pk]))
+    assert errors == {
+        household.pk: v.validate(household),
+        complete.pk: ["This Household has multiple Alternate Collectors"],
+    }
+    assert errors[complete.pk] == v.validate(complete)
+
+
+def test_program_household_validator(household: "Household", django_assert_num_queries):
+    from testutils.factories import HouseholdFactory, IndividualFactory
+
+    from country_workspace.contrib.hope.validators import ProgramHouseholdValidator
+    from country_workspace.models import Household
+
+    other = HouseholdFactory(batch=household.batch, individuals=[])
+    hh_id = household.flex_fields["household_id"]
+    IndividualFactory(household=household, flex_fields={"relationship": "HEAD", "primary_collector_id": hh_id})
+    IndividualFactory(household=household, flex_fields={"national_id_no": "A1", "alternate_collector_id": "missing"})
+    IndividualFactory(household=other, flex_fields={"national_id_no": "A1", "primary_collector_id": hh_id})
+    IndividualFactory(household=other, flex_fields={"relationship": "HEAD", "national_id_no": "B2"})
+
+    v = ProgramHouseholdValidator(household.program)
+    with django_assert_num_queries(4):
+        errors = v.validate_households(Household.objects.filter(pk__in=[household.pk, other.pk]))
+    assert errors == {
+        household.pk: [
+            "National ID A1 is not unique in the Programme",
+            "Alternate Collector for unknown Household missing",
+        ],
+        other.pk: [
+            "This Household does not have Primary Collector",
+            "National ID A1 is not unique in the Programme",
+        ],
+    }
+    assert v.validate(household) == errors[household.pk]
+
+    # programme-wide errors computed once by the validation run: one GROUP BY and the pks for each chunk
+    program_errors = v.get_program_errors()
+    with django_assert_num_queries(2):
+        assert v.validate_households(Household.objects.filter(pk=other.pk), program_errors) == {
+            other.pk: errors[other.pk]
+        }
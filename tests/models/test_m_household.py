@@ -16,3 +16,36 @@ def household() -> "CountryHousehold":
 def test_properties(household: "CountryHousehold"):
     assert household.program == household.batch.program
     assert household.country_office == household.batch.country_office
+
+
+def test_set_validation_errors(household: "CountryHousehold"):
+    assert household.validation_status == household.ValidationStatus.UNCHECKED
+    assert household.set_validation_errors({}, checker_version="1")
+    assert household.validation_status == household.ValidationStatus.VALID
+    assert household.error_count == 0
+    assert not household.set_validation_errors({"size": ["required"], "name": "invalid"}, checker_version="1")
+    assert household.validation_status == household.ValidationStatus.INVALID
+    assert household.error_count == 2
+
+
+def test_program(household: "CountryHousehold", django_assert_num_queries):
+    from testutils.factories import CountryBatchFactory
+
+    from country_workspace.models import Household, Individual
+
+    other = CountryBatchFactory()
+    household.batch = other
+    household.save(update_fields=["batch"])
+    household.refresh_from_db()
+    assert (household.program_id, household.country_office_id) == (other.program_id, other.country_office_id)
+
+    individuals = Individual.objects.bulk_create(
+        [Individual(batch=household.batch, household=household, name=f"ind {i}") for i in range(2)]
+    )
+    assert {(i.program_id, i.country_office_id) for i in individuals} == {(other.program_id, other.country_office_id)}
+
+    hh = Household.objects.get(pk=household.pk)
+    with django_assert_num_queries(1):
+        assert hh.program == other.program
+    assert hh.program.households.filter(pk=hh.pk).exists()
+    assert set(hh.program.individuals.values_list("pk", flat=True)) == {i.pk for i in individuals}
@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from country_workspace.workspaces.models import CountryBatch
+
+
+@pytest.fixture
+def batch() -> "CountryBatch":
+    from testutils.factories import CountryBatchFactory
+
+    return CountryBatchFactory()
+
+
+def test_refresh(batch: "CountryBatch"):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import BatchStatistics, Household
+
+    CountryHouseholdFactory.create_batch(2, batch=batch, flex_fields={"size": 1})
+    CountryHouseholdFactory(batch=batch, flex_fields={"size": 0}, validation_status=Household.ValidationStatus.VALID)
+
+    BatchStatistics.objects.refresh([batch.pk])
+    totals = BatchStatistics.objects.get_totals(program=batch.program)
+    assert totals["household"] == {"UNCHECKED": 2, "VALID": 1, "INVALID": 0, "total": 3}
+    assert totals["individual"] == {"UNCHECKED": 2, "VALID": 0, "INVALID": 0, "total": 2}
+
+    Household.objects.filter(batch=batch).update(validation_status=Household.ValidationStatus.INVALID)
+    BatchStatistics.objects.refresh([batch.pk])
+    totals = BatchStatistics.objects.get_totals(batch__source=batch.source)
+    assert totals["household"] == {"UNCHECKED": 0, "VALID": 0, "INVALID": 3, "total": 3}
+    assert not BatchStatistics.objects.filter(
+        batch=batch, target="household", validation_status=Household.ValidationStatus.VALID
+    ).exists()
+
+
+def test_move(batch: "CountryBatch", django_assert_num_queries):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import BatchStatistics, Household
+
+    hh = CountryHouseholdFactory(batch=batch, flex_fields={"size": 1})
+    BatchStatistics.objects.refresh([batch.pk])
+
+    hh.validation_status = Household.ValidationStatus.VALID
+    # the two counter updates and the insert of the missing counter, in a savepoint
+    with django_assert_num_queries(5):
+        BatchStatistics.objects.move(hh, Household.ValidationStatus.UNCHECKED)
+    assert BatchStatistics.objects.get_totals(batch=batch)["household"] == {
+        "UNCHECKED": 0,
+        "VALID": 1,
+        "INVALID": 0,
+        "total": 1,
+    }
+    with django_assert_num_queries(0):
+        BatchStatistics.objects.move(hh, Household.ValidationStatus.VALID)
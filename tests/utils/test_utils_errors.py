@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from country_workspace.workspaces.models import CountryBatch
+
+
+@pytest.fixture
+def batch() -> "CountryBatch":
+    from testutils.factories import CountryBatchFactory
+
+    return CountryBatchFactory()
+
+
+def test_get_error_report(batch: "CountryBatch", django_assert_num_queries):
+    from testutils.factories import CountryBatchFactory, CountryHouseholdFactory
+
+    from country_workspace.models import Household
+    from country_workspace.utils.errors import get_error_report
+
+    invalid = Household.ValidationStatus.INVALID
+    h1, h2 = CountryHouseholdFactory.create_batch(2, batch=batch, flex_fields={"size": 0}, validation_status=invalid)
+    h1.set_validation_errors({"size": ["required", "too small"], "dct": ["no head"]})
+    h2.set_validation_errors({"size": ["required"]})
+    Household.objects.bulk_update([h1, h2], Household.VALIDATION_FIELDS)
+    other = CountryBatchFactory(program=batch.program, country_office=batch.country_office)
+    CountryHouseholdFactory(batch=other, flex_fields={"size": 0}, validation_status=invalid, errors={"name": "error"})
+
+    with django_assert_num_queries(1):
+        report = Household.objects.filter(batch=batch).get_error_report(samples=1)
+    assert report == [
+        {"field": "size", "message": "required", "count": 2, "samples": [h1.pk]},
+        {"field": "dct", "message": "no head", "count": 1, "samples": [h1.pk]},
+        {"field": "size", "message": "too small", "count": 1, "samples": [h1.pk]},
+    ]
+
+    assert get_error_report(batch.program, batch)["household"][0]["samples"] == [h1.pk, h2.pk]
+    report = get_error_report(batch.program)
+    assert [(r["field"], r["count"]) for r in report["household"]] == [
+        ("size", 2),
+        ("dct", 1),
+        ("name", 1),
+        ("size", 1),
+    ]
+    assert report["individual"] == []
+
+
+def test_get_error_report_cache(batch: "CountryBatch", django_assert_num_queries):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.cache.manager import cache_manager
+    from country_workspace.models import Household
+    from country_workspace.utils.errors import get_error_report
+
+    hh = CountryHouseholdFactory(batch=batch, flex_fields={"size": 0})
+    hh.set_validation_errors({"size": ["required"]})
+    hh.save()
+    active = cache_manager.active
+    cache_manager.active = True
+    try:
+        report = get_error_report(batch.program)
+        with django_assert_num_queries(0):
+            assert get_error_report(batch.program) == report
+        cache_manager.incr_cache_version(program=batch.program, namespace="individuals")
+        with django_assert_num_queries(2):
+            assert get_error_report(batch.program) == report
+
+        hh.set_validation_errors({})
+        hh.save()
+        assert get_error_report(batch.program) == {"household": [], "individual": []}
+        assert Household.objects.get(pk=hh.pk).validation_status == Household.ValidationStatus.VALID
+    finally:
+        cache_manager.active = active
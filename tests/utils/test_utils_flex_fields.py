@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+if TYPE_CHECKING:
+    from hope_flex_fields.models import DataChecker
+
+
+@pytest.fixture
+def checker() -> "DataChecker":
+    from testutils.factories import DataCheckerFactory
+
+    return DataCheckerFactory(fields=["name", "size"])
+
+
+def test_checker_registry(checker: "DataChecker", django_assert_num_queries):
+    from testutils.factories import FlexFieldFactory
+
+    from country_workspace.utils.flex_fields import checker_registry
+
+    form_class = checker_registry.get_form_class(checker)
+    fields = checker_registry.get_fields(checker)
+    version = checker_registry.get_checker_version(checker)
+    # fields have random types, the result itself does not matter
+    errors = checker_registry.validate(checker, [{"name": "a"}], fast_path=True)
+    with django_assert_num_queries(0):
+        assert checker_registry.get_form_class(checker) is form_class
+        assert checker_registry.get_fields(checker) == fields
+        assert checker_registry.get_checker_version(checker) == version
+        assert checker_registry.validate(checker, [{"name": "a"}], fast_path=True) == errors
+
+    FlexFieldFactory(fieldset=checker.fieldsets.first(), name="other")
+    assert checker_registry.get_form_class(checker) is not form_class
+    assert "other" in checker_registry.get_form_class(checker).base_fields
+    assert checker_registry.get_checker_version(checker) != version
+
+
+def test_checker_registry_copy(checker: "DataChecker"):
+    from country_workspace.utils.flex_fields import checker_registry
+
+    with mock.patch.object(checker.__class__, "validate", return_value={1: {"size": ["error"]}}) as m:
+        assert checker_registry.validate(checker, [{}], fast_path=False) == {1: {"size": ["error"]}}
+    assert m.call_count == 1
+    assert checker_registry.get_checker(checker) is not checker_registry.get_checker(checker)
@@ -4,7 +4,15 @@ from unittest import mock
 import pytest
 
 from country_workspace.state import state
-from country_workspace.utils.http import absolute_reverse, absolute_uri, get_client_ip, get_server_host, get_server_url
+from country_workspace.utils.http import (
+    absolute_reverse,
+    absolute_uri,
+    get_client_ip,
+    get_remaining_page_urls,
+    get_server_host,
+    get_server_url,
+    prefetch,
+)
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
@@ -54,3 +62,20 @@ def test_get_client_ip(rf: "RequestFactory", key: str) -> None:
     req = rf.get("/", **{key: "1.1.1.1   "})  # type: ignore
     with state.configure(request=req):
         assert get_client_ip() == "1.1.1.1"
+
+
+@pytest.mark.parametrize(
+    ("next_url", "expected"),
+    [
+        ("http://h/api/?limit=50&offset=50", ["http://h/api/?limit=50&offset=50", "http://h/api/?limit=50&offset=100"]),
+        ("http://h/api/?page=2", ["http://h/api/?page=2", "http://h/api/?page=3"]),
+        ("http://h/api/?cursor=abc", []),
+    ],
+)
+def test_get_remaining_page_urls(next_url: str, expected: list[str]) -> None:
+    assert get_remaining_page_urls(next_url, 120, 50) == expected
+
+
+def test_prefetch() -> None:
+    assert list(prefetch(iter(range(5)))) == [0, 1, 2, 3, 4]
+    assert list(prefetch(iter([]))) == []
@@ -1,6 +1,6 @@
 import pytest
 
-from country_workspace.utils.fields import clean_field_name
+from country_workspace.utils.fields import clean_field_name, get_search_filter
 
 TO_REMOVE = ("_h_c", "_h_f", "_i_c", "_i_f")
 
@@ -15,3 +15,13 @@ TO_REMOVE = ("_h_c", "_h_f", "_i_c", "_i_f")
 )
 def test_clean_field_name(input_value, expected_output):
     assert clean_field_name(input_value) == expected_output
+
+
+def test_get_search_filter():
+    q = get_search_filter(["name", "flex_fields__national_id"], "42")
+    assert q.connector == "OR"
+    assert q.children == [
+        ("name__icontains", "42"),
+        ("flex_fields__contains", {"national_id": "42"}),
+        ("flex_fields__contains", {"national_id": 42}),
+    ]
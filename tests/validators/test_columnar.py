@@ -0,0 +1,72 @@
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+from django import forms
+
+if TYPE_CHECKING:
+    from hope_flex_fields.models import DataChecker
+
+VALID = {
+    "name": "John",
+    "age": 3,
+    "gender": "M",
+    "dob": "2000-01-01",
+    "alive": True,
+    "score": 1.5,
+    "email": "john@example.com",
+}
+
+
+@pytest.fixture
+def checker() -> "DataChecker":
+    from testutils.factories import DataCheckerFactory, FieldDefinitionFactory, FieldsetFactory, FlexFieldFactory
+
+    fs = FieldsetFactory()
+    for name, field_type, attrs in (
+        ("name", forms.CharField, {"required": True, "max_length": 5}),
+        ("age", forms.IntegerField, {"required": False, "min_value": 0}),
+        ("gender", forms.ChoiceField, {"required": False, "choices": [["M", "Male"], ["F", "Female"]]}),
+        ("dob", forms.DateField, {"required": False}),
+        ("alive", forms.BooleanField, {"required": False}),
+        ("score", forms.FloatField, {"required": False, "max_value": 10}),
+        ("email", forms.EmailField, {"required": False}),
+    ):
+        definition = FieldDefinitionFactory(field_type=field_type, attrs=attrs)
+        FlexFieldFactory(fieldset=fs, name=name, definition=definition)
+    dc = DataCheckerFactory()
+    dc.fieldsets.add(fs)
+    return dc
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        {"age": "12", "alive": "false", "gender": ""},
+        {"name": ""},
+        {"name": "Too long"},
+        {"age": -1},
+        {"age": "a"},
+        {"gender": "X"},
+        {"dob": "2000-02-30"},
+        {"score": 11},
+        {"email": "invalid"},
+    ],
+)
+def test_columnar_validator(checker: "DataChecker", changes):
+    from hope_flex_fields.models import DataChecker
+
+    from country_workspace.validators.columnar import ColumnarValidator
+
+    rows = [VALID, {**VALID, **changes}, {"name": "Ann"}]
+    validator = ColumnarValidator(checker.get_form_class())
+    # `DataChecker.get_fields()` memoizes a generator, so each checker instance builds one form only
+    fallback_checker = DataChecker.objects.get(pk=checker.pk)
+    with mock.patch.object(fallback_checker, "validate", wraps=fallback_checker.validate) as fallback:
+        errors = validator.validate(rows, fallback)
+    assert errors == DataChecker.objects.get(pk=checker.pk).validate(rows)
+    if errors:
+        fallback.assert_called_once_with([rows[1]])
+    else:
+        fallback.assert_not_called()
@@ -1,6 +1,8 @@
+import csv
 import io
 import os
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import openpyxl
 import pytest
@@ -11,7 +13,12 @@ from testutils.utils import select_office
 from webtest import Checkbox, Upload
 
 from country_workspace.state import state
-from country_workspace.workspaces.admin.cleaners.bulk_update import TYPES, create_xls_importer
+from country_workspace.workspaces.admin.cleaners.bulk_update import (
+    TYPES,
+    create_csv_export,
+    create_xls_importer,
+    get_export_formats,
+)
 
 if TYPE_CHECKING:
     from django_webtest import DjangoTestApp
@@ -105,10 +112,27 @@ def test_create_xls_importer(household: "CountryHousehold", force_migrated_recor
         household.program,
         selected_fields,
     )
-    workbook = openpyxl.load_workbook(io.BytesIO(ret.getvalue()))
+    workbook = openpyxl.load_workbook(ret)
     sheet = workbook.worksheets[0]
     headers = [cell.value for cell in next(sheet.iter_rows(min_row=1, max_row=1))]
     assert headers == selected_fields
+    assert sheet.max_row == household.members.count() + 1
+
+
+def test_create_csv_export(household: "CountryHousehold", force_migrated_records):
+    member = household.members.first()
+    with create_csv_export(household.members.all(), ["id", "name", "gender"]) as ret:
+        rows = list(csv.reader(io.TextIOWrapper(ret, encoding="utf-8")))
+    assert rows[0] == ["id", "name", "gender"]
+    assert len(rows) == household.members.count() + 1
+    assert [str(member.pk), member.name, member.flex_fields.get("gender", "")] in rows
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_get_export_formats(installed):
+    with mock.patch("country_workspace.workspaces.admin.cleaners.bulk_update.find_spec", return_value=installed):
+        formats = [value for value, __ in get_export_formats()]
+    assert formats == (["xlsx", "csv", "parquet"] if installed else ["xlsx", "csv"])
 
 
 def test_bulk_update_export(
@@ -179,3 +203,63 @@ def test_bulk_update_import(app: "DjangoTestApp", force_migrated_records, settin
         job: AsyncJob = household.program.jobs.first()
         assert job
         assert household.members.filter(flex_fields__given_name="given_name_2").exists()
+
+
+def test_bulk_update_records_dry_run(force_migrated_records, data) -> None:
+    from django.core.files.base import ContentFile
+    from testutils.factories import AsyncJobFactory
+
+    from country_workspace.workspaces.admin.cleaners.bulk_update import bulk_update_individual
+
+    xls, household = data
+    job = AsyncJobFactory(program=household.program, config={"dry_run": True, "chunk_size": 1})
+    job.file.save("file.xlsx", ContentFile(xls.read()))
+    ret = bulk_update_individual(job)
+
+    assert ret["updated"] == 0
+    assert ret["not_found"] == []
+    assert len(ret["diff"]) == household.members.count()
+    assert all("given_name_2" in str(diff) for diff in ret["diff"].values())
+    assert not household.members.filter(flex_fields__given_name="given_name_2").exists()
+
+
+def test_bulk_update_records_queries(force_migrated_records, data, django_assert_num_queries) -> None:
+    from django.core.files.base import ContentFile
+    from testutils.factories import AsyncJobFactory
+
+    from country_workspace.workspaces.admin.cleaners.bulk_update import bulk_update_individual
+
+    xls, household = data
+    assert household.members.count() > 1
+    job = AsyncJobFactory(program=household.program, config={"dry_run": True, "chunk_size": 100})
+    job.file.save("file.xlsx", ContentFile(xls.read()))
+    bulk_update_individual(job)  # compile the checker
+    # the records of the chunk and the fast path flag, whatever the number of rows
+    with django_assert_num_queries(2):
+        bulk_update_individual(job)
+
+
+def test_bulk_update_household_group_errors(force_migrated_records, household) -> None:
+    from django.core.files.base import ContentFile
+    from testutils.factories import AsyncJobFactory
+
+    from country_workspace.workspaces.admin.cleaners.bulk_update import bulk_update_household
+
+    program = household.program
+    program.beneficiary_validator = "country_workspace.contrib.hope.validators.FullHouseholdValidator"
+    program.save()
+    household.members.all().delete()
+    buff = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buff)
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, ["id", "size"])
+    worksheet.write_row(1, 0, [household.id, 2])
+    workbook.close()
+    job = AsyncJobFactory(program=program, config={"dry_run": False, "chunk_size": 100})
+    job.file.save("file.xlsx", ContentFile(buff.getvalue()))
+    with mock.patch(
+        "country_workspace.contrib.hope.validators.FullHouseholdValidator.validate", side_effect=AssertionError
+    ):
+        assert bulk_update_household(job)["updated"] == 1
+    household.refresh_from_db()
+    assert "This Household does not have Head" in household.errors["dct"]
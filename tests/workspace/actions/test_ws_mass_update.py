@@ -5,7 +5,9 @@ from django.urls import reverse
 from pytest_django.fixtures import SettingsWrapper
 from testutils.utils import select_office
 
+from country_workspace.cache.manager import cache_manager
 from country_workspace.state import state
+from country_workspace.utils.flex_fields import get_obj_checksum
 from country_workspace.workspaces.admin.cleaners.mass_update import mass_update_impl
 
 if TYPE_CHECKING:
@@ -69,6 +71,75 @@ def test_mass_update_impl(household):
     assert household.flex_fields["address"] == "__NEW VALUE__"
 
 
+def test_mass_update_impl_operations(program):
+    from reversion.models import Version
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+
+    h1, h2 = CountryHouseholdFactory.create_batch(
+        2,
+        batch__program=program,
+        batch__country_office=program.country_office,
+        flex_fields={"address": "Street", "name": "Joe", "head": True, "size": 0},
+    )
+    h2.flex_fields.pop("head")
+    h2.save()
+    versions = Version.objects.count()
+    config = {
+        "address": ("djangoformsfieldsfield_set-null_lambda", ""),
+        "name": ("djangoformsfieldscharfield_upper_lambda", ""),
+        "head": ("djangoformsfieldsbooleanfield_toggle_lambda", ""),
+    }
+    assert mass_update_impl(Household.objects.all(), config, chunk_size=1) == {"updated": 2}
+
+    h1.refresh_from_db()
+    h2.refresh_from_db()
+    assert (h1.flex_fields["address"], h1.flex_fields["name"], h1.flex_fields["head"]) == (None, "JOE", False)
+    assert (h2.flex_fields["address"], h2.flex_fields["name"], "head" in h2.flex_fields) == (None, "JOE", False)
+    assert h1.checksum == get_obj_checksum(h1)
+    assert Version.objects.count() == versions + 2
+
+    mass_update_impl(Household.objects.all(), {"head": config["head"]}, create_missing_fields=True)
+    h2.refresh_from_db()
+    assert h2.flex_fields["head"] is True
+
+
+def test_mass_update_impl_set_based(program, django_assert_max_num_queries):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+
+    h1, h2 = CountryHouseholdFactory.create_batch(
+        2, batch__program=program, batch__country_office=program.country_office, flex_fields={"name": "Joe", "size": 0}
+    )
+    config = {
+        "name": ("djangoformsfieldsfield_set_lambda", "Mary"),
+        "address": ("djangoformsfieldsfield_set-null_lambda", ""),
+    }
+    # records of other operations are left to them
+    Household.objects.filter(pk=h2.pk).update(checksum=None)
+    version = cache_manager.get_cache_version(program=program, namespace="households")
+    with django_assert_max_num_queries(14):
+        assert mass_update_impl(Household.objects.filter(pk=h1.pk, flex_fields__name="Joe"), config) == {"updated": 1}
+
+    h1.refresh_from_db()
+    h2.refresh_from_db()
+    assert (h1.flex_fields["name"], "address" in h1.flex_fields) == ("Mary", False)
+    assert h1.checksum == get_obj_checksum(h1)
+    assert h2.flex_fields["name"] == "Joe"
+    assert h2.checksum is None
+    # the records do not match the filter anymore, but their program is invalidated
+    assert cache_manager.get_cache_version(program=program, namespace="households") > version
+
+
+def test_mass_update_impl_unknown_operation(household):
+    from country_workspace.models import Household
+
+    with pytest.raises(KeyError, match="Unknown mass update operation 'missing'"):
+        mass_update_impl(Household.objects.all(), {"name": ("missing", "")})
+
+
 def test_mass_update(app: "DjangoTestApp", household: "CountryHousehold") -> None:
     url = reverse("workspace:workspaces_countryhousehold_changelist")
     with select_office(app, household.country_office, household.program):
@@ -88,3 +159,61 @@ def test_mass_update(app: "DjangoTestApp", household: "CountryHousehold") -> Non
 
         household.refresh_from_db()
         assert household.flex_fields["address"] == "__NEW VALUE__"
+
+
+def test_mass_update_select_across(app: "DjangoTestApp", household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    other = CountryHouseholdFactory(batch=household.batch, name="other", flex_fields={"size": 0, "address": "other"})
+    url = reverse("workspace:workspaces_countryhousehold_changelist")
+    with select_office(app, household.country_office, household.program):
+        res = app.get(url, {"q": household.name})
+        form = res.forms["changelist-form"]
+        form["action"] = "mass_update"
+        form["select_across"] = "1"
+        form.set("_selected_action", True)
+        res = form.submit()
+
+        form = res.forms["mass-update-form"]
+        form["flex_fields__address_0"].select(text="set")
+        form["flex_fields__address_1"] = "__NEW VALUE__"
+        res = form.submit("_apply")
+
+        job: "AsyncJob" = household.program.jobs.first()
+        assert "pks" not in job.config
+        assert job.config["filters"] == {"params": {"q": [household.name]}}
+
+        household.refresh_from_db()
+        other.refresh_from_db()
+        assert household.flex_fields["address"] == "__NEW VALUE__"
+        assert other.flex_fields["address"] == "other"
+
+
+def test_get_changelist_queryset(household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+    from country_workspace.workspaces.models import CountryHousehold
+    from country_workspace.workspaces.utils import get_changelist_queryset
+
+    invalid = CountryHouseholdFactory(
+        batch=household.batch, name="invalid", validation_status=Household.ValidationStatus.INVALID
+    )
+    CountryHouseholdFactory(name="other program", validation_status=Household.ValidationStatus.INVALID)
+    owner = household.batch.imported_by
+
+    filters = {"params": {"valid": ["i"], "o": ["1"]}}
+    assert list(get_changelist_queryset(CountryHousehold, household.program, owner, filters)) == [invalid]
+    filters = {"params": {"q": [household.name]}}
+    assert list(get_changelist_queryset(CountryHousehold, household.program, owner, filters)) == [household]
+
+
+def test_get_changelist_filters_ignore_page(rf, household: "CountryHousehold") -> None:
+    from country_workspace.workspaces.models import CountryHousehold
+    from country_workspace.workspaces.utils import get_changelist_filters, get_changelist_queryset
+
+    request = rf.get("/", {"p": "2", "e": "1", "q": household.name})
+    filters = get_changelist_filters(request)
+    assert filters == {"params": {"q": [household.name]}}
+    owner = household.batch.imported_by
+    assert list(get_changelist_queryset(CountryHousehold, household.program, owner, filters)) == [household]
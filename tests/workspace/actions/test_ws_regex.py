@@ -4,8 +4,10 @@ import pytest
 from django.urls import reverse
 from testutils.utils import select_office
 
+from country_workspace.cache.manager import cache_manager
 from country_workspace.state import state
-from country_workspace.workspaces.admin.cleaners.regex import regex_update_impl
+from country_workspace.utils.flex_fields import get_obj_checksum
+from country_workspace.workspaces.admin.cleaners.regex import regex_update_impl, regex_update_preview, to_posix
 
 if TYPE_CHECKING:
     from django_webtest import DjangoTestApp
@@ -66,6 +68,61 @@ def test_regex_update_impl(household):
     assert household.flex_fields["address"] == "__NEW VALUE__"
 
 
+@pytest.mark.parametrize(
+    ("pattern", "subst", "expected"),
+    [
+        (r"(\d+)-(\d+)", r"\2-\1", (r"(\d+)-(\d+)", r"\2-\1")),
+        (r"(\w+)", r"<\g<1>> \g<0>", (r"(\w+)", r"<\1> \&")),
+        (r"(?P<num>\d+)", "x", None),
+        (r"\bword\b", "x", None),
+        (r"a", r"\n", None),
+    ],
+)
+def test_to_posix(pattern, subst, expected):
+    assert to_posix(pattern, subst) == expected
+
+
+@pytest.mark.parametrize("regex", [r"(\w+) (\w+)", r"(?P<first>\w+) (?P<second>\w+)"], ids=["sql", "python"])
+def test_regex_update_engines(program, regex):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+
+    h1, h2, h3 = CountryHouseholdFactory.create_batch(
+        3, batch__program=program, batch__country_office=program.country_office
+    )
+    for hh, value in ((h1, "aa bb cc dd"), (h2, "123"), (h3, 123)):
+        hh.flex_fields["address"] = value
+        hh.save()
+    config = {"field": "address", "regex": regex, "subst": r"\2 \1", "replace_all": True}
+
+    assert regex_update_preview(Household.objects.all(), config) == [(h1.pk, "aa bb cc dd", "bb aa dd cc")]
+    assert regex_update_impl(Household.objects.all(), config) == {"updated": 1}
+
+    for hh in (h1, h2, h3):
+        hh.refresh_from_db()
+    assert h1.flex_fields["address"] == "bb aa dd cc"
+    assert h1.checksum == get_obj_checksum(h1)
+    assert h2.flex_fields["address"] == "123"
+    assert h3.flex_fields["address"] == 123
+
+
+@pytest.mark.parametrize("regex", [r"(\w+) (\w+)", r"(?P<first>\w+) (?P<second>\w+)"], ids=["sql", "python"])
+def test_regex_update_impl_filtered_on_field(program, regex):
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+
+    hh = CountryHouseholdFactory(batch__program=program, batch__country_office=program.country_office)
+    hh.flex_fields["address"] = "aa bb"
+    hh.save()
+    version = cache_manager.get_cache_version(program=program, namespace="households")
+    config = {"field": "address", "regex": regex, "subst": r"\2 \1"}
+    assert regex_update_impl(Household.objects.filter(flex_fields__address="aa bb"), config) == {"updated": 1}
+    # the record does not match the filter anymore, but its program is invalidated
+    assert cache_manager.get_cache_version(program=program, namespace="households") > version
+
+
 def test_regex_update(app: "DjangoTestApp", force_migrated_records, household: "CountryHousehold") -> None:
     url = reverse("workspace:workspaces_countryhousehold_changelist")
     with select_office(app, household.country_office, household.program):
@@ -1,8 +1,10 @@
 import datetime
+from unittest import mock
 from typing import TYPE_CHECKING
 
 import freezegun
 import pytest
+from constance.test.unittest import override_config
 from django.urls import reverse
 from testutils.utils import select_office
 
@@ -78,3 +80,130 @@ def test_ws_validate(
             household.refresh_from_db()
             assert household.last_checked.date() == datetime.date(2020, 1, 1)
             assert household.errors
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "parallel"])
+def test_validate_queryset(settings: "SettingsWrapper", program, household: "CountryHousehold", parallel) -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import BatchStatistics, Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_queryset
+
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    CountryHouseholdFactory.create_batch(2, batch=household.batch, flex_fields={"size": 0})
+    with (
+        override_config(VALIDATION_FAST_PATH=False),
+        mock.patch.object(program.household_checker.__class__, "validate", return_value={2: {"size": ["error"]}}),
+    ):
+        result = validate_queryset(Household.objects.all(), chunk_size=2, parallel=parallel)
+
+    assert result == {"valid": 2, "invalid": 1, "total": 3}
+    assert Household.objects.filter(last_checked__isnull=False).count() == 3
+    assert list(Household.objects.order_by("pk").values_list("errors", flat=True)) == [{}, {"size": ["error"]}, {}]
+    assert list(Household.objects.order_by("pk").values_list("validation_status", "error_count")) == [
+        (Household.ValidationStatus.VALID, 0),
+        (Household.ValidationStatus.INVALID, 1),
+        (Household.ValidationStatus.VALID, 0),
+    ]
+    totals = BatchStatistics.objects.get_totals(program=program)
+    assert totals["household"] == {"UNCHECKED": 0, "VALID": 2, "INVALID": 1, "total": 3}
+
+
+def test_validate_queryset_changed_only(program, household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory, FlexFieldFactory
+
+    from country_workspace.models import Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_queryset
+
+    h2 = CountryHouseholdFactory(batch=household.batch, flex_fields={"size": 0})
+    assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 2
+    assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 0
+
+    h2.flex_fields["size"] = 1
+    h2.save()
+    assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 1
+
+    FlexFieldFactory(fieldset=program.household_checker.members.first().fieldset)
+    assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 2
+
+
+def test_validate_queryset_changed_member(program, household: "CountryHousehold") -> None:
+    from testutils.factories import IndividualFactory
+
+    from country_workspace.models import Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_queryset
+
+    program.beneficiary_validator = "country_workspace.contrib.hope.validators.FullHouseholdValidator"
+    program.save()
+    household.members.all().delete()
+    assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 1
+    household.refresh_from_db()
+    assert "This Household does not have Head" in household.errors["dct"]
+
+    IndividualFactory(household=household, flex_fields={"relationship": "HEAD"})
+    with mock.patch.object(program.household_checker.__class__, "validate", side_effect=AssertionError):
+        assert validate_queryset(Household.objects.all(), changed_only=True)["total"] == 1
+    household.refresh_from_db()
+    assert "This Household does not have Head" not in household.errors["dct"]
+
+
+def test_validate_records_group_errors(program, household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    from country_workspace.models import Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_records
+
+    program.beneficiary_validator = "country_workspace.contrib.hope.validators.FullHouseholdValidator"
+    program.save()
+    pks = [household.pk, *(h.pk for h in CountryHouseholdFactory.create_batch(2, batch=household.batch))]
+    with mock.patch(
+        "country_workspace.contrib.hope.validators.FullHouseholdValidator.validate", side_effect=AssertionError
+    ):
+        validate_records(Household, pks)
+    for hh in Household.objects.filter(pk__in=pks):
+        assert hh.errors["dct"] == hh.program.beneficiary_validator.validate(hh)
+
+
+@pytest.mark.parametrize("parallel", [False, True], ids=["sequential", "parallel"])
+def test_validate_queryset_program_errors(
+    settings: "SettingsWrapper", program, household: "CountryHousehold", parallel
+) -> None:
+    from testutils.factories import CountryHouseholdFactory, IndividualFactory
+
+    from country_workspace.contrib.hope.validators import ProgramHouseholdValidator
+    from country_workspace.models import Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_queryset
+
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    program.beneficiary_validator = "country_workspace.contrib.hope.validators.ProgramHouseholdValidator"
+    program.save()
+    other = CountryHouseholdFactory(batch=household.batch, individuals=[])
+    IndividualFactory(household=household, flex_fields={"national_id_no": "A1"})
+    IndividualFactory(household=other, flex_fields={"national_id_no": "A1"})
+
+    get_program_errors = ProgramHouseholdValidator.get_program_errors
+    with mock.patch.object(
+        ProgramHouseholdValidator, "get_program_errors", autospec=True, side_effect=get_program_errors
+    ) as m:
+        assert validate_queryset(Household.objects.all(), chunk_size=1, parallel=parallel)["total"] == 2
+    assert m.call_count == 1
+    for hh in Household.objects.all():
+        assert "National ID A1 is not unique in the Programme" in hh.errors["dct"]
+
+
+def test_validate_queryset_filtered_on_status(program, household: "CountryHousehold") -> None:
+    from country_workspace.cache.manager import cache_manager
+    from country_workspace.models import BatchStatistics, Household
+    from country_workspace.workspaces.admin.cleaners.validate import validate_queryset
+
+    Household.objects.filter(pk=household.pk).update(validation_status=Household.ValidationStatus.INVALID)
+    BatchStatistics.objects.refresh([household.batch_id])
+    version = cache_manager.get_cache_version(program=program, namespace="households")
+    queryset = Household.objects.filter(validation_status=Household.ValidationStatus.INVALID)
+    with mock.patch.object(program.household_checker.__class__, "validate", return_value={}):
+        assert validate_queryset(queryset, parallel=False)["valid"] == 1
+    # the record does not match the filter anymore, but its program is invalidated
+    assert cache_manager.get_cache_version(program=program, namespace="households") > version
+    # the statistics of its batch as well
+    totals = BatchStatistics.objects.get_totals(batch=household.batch)
+    assert totals["household"] == {"UNCHECKED": 0, "VALID": 1, "INVALID": 0, "total": 1}
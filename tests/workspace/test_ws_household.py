@@ -1,4 +1,5 @@
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
 from django.urls import reverse
@@ -104,3 +105,67 @@ def test_hh_update_single(app: "CWTestApp", household: "CountryHousehold") -> No
             url = reverse("workspace:workspaces_countryhousehold_change", args=[household.pk])
             res = app.get(url)
             assert res.status_code == 200
+
+
+def test_hh_changelist_keyset(app: "CWTestApp", household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    CountryHouseholdFactory.create_batch(24, batch=household.batch)
+    url = reverse("workspace:workspaces_countryhousehold_changelist")
+    program: "CountryProgram" = household.program
+    with select_office(app, program.country_office, program):
+        res = app.get(url)
+        first_page = res.pyquery("#result_list tbody tr").length
+        assert first_page == 20
+        assert res.context["cl"].previous_url is None
+        res = res.click(href="_cursor", description="Next")
+        assert res.status_code == 200, res.location
+        assert res.pyquery("#result_list tbody tr").length == 5
+        res = res.click(href="_cursor", description="Previous")
+        assert res.pyquery("#result_list tbody tr").length == 20
+        res = app.get(url, {"p": 2})
+        assert res.context["cl"].previous_url
+
+
+def test_hh_changelist_estimated_count(app: "CWTestApp", household: "CountryHousehold") -> None:
+    from country_workspace.workspaces.paginator import WorkspacePaginator
+
+    url = reverse("workspace:workspaces_countryhousehold_changelist")
+    program: "CountryProgram" = household.program
+    with select_office(app, program.country_office, program):
+        with mock.patch.object(WorkspacePaginator, "estimate_threshold", -1):
+            res = app.get(url)
+            assert res.pyquery("a.exact-count")
+            res = res.click(description="Exact count")
+            assert not res.pyquery("a.exact-count")
+
+
+def test_hh_changelist_flex_columns(app: "CWTestApp", household: "CountryHousehold") -> None:
+    program: "CountryProgram" = household.program
+    program.household_columns = "name\nflex_fields__size"
+    program.save()
+    household.flex_fields = {"size": 98765, "note": "not displayed"}
+    household.save()
+    url = reverse("workspace:workspaces_countryhousehold_changelist")
+    with select_office(app, program.country_office, program):
+        res = app.get(url)
+        assert "98765" in res.pyquery("td.field-flex_fields__size").text()
+        assert "flex_fields" in res.context["cl"].result_list[0].get_deferred_fields()
+
+
+def test_hh_search(app: "CWTestApp", household: "CountryHousehold") -> None:
+    from testutils.factories import CountryHouseholdFactory
+
+    program: "CountryProgram" = household.program
+    program.household_search = "name\nflex_fields__phone_no"
+    program.save()
+    CountryHouseholdFactory(batch=household.batch, name="John Doe", flex_fields={"size": 0, "phone_no": "+39123456"})
+    CountryHouseholdFactory(batch=household.batch, name="Jane Doe", flex_fields={"size": 0, "phone_no": 123})
+    url = reverse("workspace:workspaces_countryhousehold_changelist")
+    with select_office(app, program.country_office, program):
+        res = app.get(url, {"q": "+39123456"})
+        assert res.pyquery("#result_list tbody tr").length == 1
+        res = app.get(url, {"q": "123"})
+        assert res.pyquery("#result_list tbody tr").length == 1
+        res = app.get(url, {"q": "doe"})
+        assert res.pyquery("#result_list tbody tr").length == 2
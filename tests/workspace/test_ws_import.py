@@ -96,3 +96,34 @@ def test_import_data_aurora(force_migrated_records, app, program, mocked_respons
 
     hh = program.households.first()
     assert hh.members.count() == 2
+
+
+def test_import_from_rdi_chunked(force_migrated_records, program, user):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from reversion.models import Revision
+    from testutils.factories import AsyncJobFactory
+
+    from country_workspace.datasources.rdi import import_from_rdi
+    from country_workspace.models import AsyncJob
+
+    data = (Path(__file__).parent.parent / "data/rdi_one.xlsx").read_bytes()
+    job = AsyncJobFactory(
+        type=AsyncJob.JobType.TASK,
+        program=program,
+        owner=user,
+        file=SimpleUploadedFile("rdi_one.xlsx", data),
+        config={
+            "batch_name": "chunked",
+            "household_pk_col": "household_id",
+            "master_column_label": "household_id",
+            "detail_column_label": "full_name",
+            "chunk_size": 2,
+        },
+    )
+    revisions = Revision.objects.count()
+    assert import_from_rdi(job) == {"household": 1, "individual": 5}
+    assert program.individuals.filter(checksum__isnull=True).count() == 0
+    # 1 chunk of households + 3 chunks of individuals
+    assert Revision.objects.count() == revisions + 4
+    hh = program.households.get()
+    assert hh.members.count() == 5
@@ -92,3 +92,53 @@ def test_configure_ind_columns(app, household: "CountryHousehold"):
         hh_list = reverse("workspace:workspaces_countryindividual_changelist")
         res = app.get(hh_list)
         assert "gender" in res.text
+
+
+def test_statistics(app, household: "CountryHousehold"):
+    from country_workspace.models import BatchStatistics
+
+    program: "CountryProgram" = household.program
+    BatchStatistics.objects.refresh([household.batch_id])
+    with select_office(app, program.country_office, program):
+        res = app.get(program.get_change_url())
+        assert res.pyquery("table.statistics")
+        res = app.get(reverse("workspace:index"))
+        assert res.pyquery("table.statistics td").eq(0).text() == "1"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_index_columns(app, household: "CountryHousehold"):
+    from country_workspace.models import Household
+    from country_workspace.utils.indexes import get_existing_indexes, get_index_name, sync_flex_field_indexes
+
+    program: "CountryProgram" = household.program
+    program.household_columns = "name\nflex_fields__collect_individual_data"
+    program.save()
+    try:
+        with select_office(app, program.country_office, program):
+            res = app.get(program.get_change_url())
+            res.click("Index Columns").follow()
+            assert get_existing_indexes(Household) == {get_index_name(Household, "collect_individual_data")}
+            res = app.get(reverse("workspace:workspaces_countryhousehold_changelist"), {"o": "2"})
+            assert res.status_code == 200
+    finally:
+        assert sync_flex_field_indexes([], drop_unused=True)["dropped"]
+
+
+def test_error_report(app, household: "CountryHousehold"):
+    from country_workspace.models import Household
+
+    program: "CountryProgram" = household.program
+    household.set_validation_errors({"collect_individual_data": ["invalid"]})
+    Household.objects.bulk_update([household], Household.VALIDATION_FIELDS)
+    with select_office(app, program.country_office, program):
+        res = app.get(program.get_change_url())
+        assert res.pyquery("table.error-report.household td").eq(0).text() == "collect_individual_data"
+        res = res.click("Error Report")
+        form = res.forms["error-report"]
+        form["batch"] = str(household.batch.pk)
+        res = form.submit()
+        assert res.pyquery("table.error-report.household td").eq(2).text() == "1"
+        res = res.click("Export CSV")
+        assert res.content_type == "text/csv"
+        assert res.text.splitlines()[1] == f"household,collect_individual_data,invalid,1,{household.pk}"
@@ -35,6 +35,8 @@ def test_autocomplete_view(app, user: "User", batch: "CountryBatch"):
         with select_office(app, batch.country_office, batch.program):
             res = app.get(f"{url}?app_label=country_workspace&model_name=individual&field_name=batch&term={batch.name}")
             assert res.json == {"pagination": {"more": False}, "results": [{"id": str(batch.id), "text": batch.name}]}
+            res = app.get(f"{url}?app_label=country_workspace&model_name=individual&field_name=batch&term=not-found")
+            assert res.json == {"pagination": {"more": False}, "results": []}
 
         with select_office(app, batch.country_office, batch.program):
             res = app.get(f"{url}?&term={batch.name}", expect_errors=True)